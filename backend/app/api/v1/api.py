@@ -1,8 +1,12 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import user, wallet_info, mint
+from app.api.v1.endpoints import user, wallet_info, mint, transfer, token, events, search
 
 api_router = APIRouter()
 
 api_router.include_router(user.router, prefix="/user", tags=["user"])
 api_router.include_router(wallet_info.router, prefix="/chk_wallet_info", tags=["wallet_info"])
-api_router.include_router(mint.router, prefix="/mint", tags=["mint"]) 
\ No newline at end of file
+api_router.include_router(mint.router, prefix="/mint", tags=["mint"])
+api_router.include_router(transfer.router, prefix="/transfers", tags=["transfers"]) 
+api_router.include_router(token.router, prefix="/tokens", tags=["tokens"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
\ No newline at end of file
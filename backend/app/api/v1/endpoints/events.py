@@ -0,0 +1,139 @@
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, FrozenSet, List, Optional
+from app.config import settings
+from app.models.address import normalize_wallet_address
+from app.services.events import EVENT_TYPES, Subscription, broadcaster
+import asyncio
+import orjson
+
+router = APIRouter()
+
+
+def parse_filters(types: Optional[str], wallet_address: Optional[str]):
+    """구독 필터 검증 (types: 쉼표로 구분한 이벤트 종류, wallet_address: 해당 지갑 이벤트만)"""
+    selected: Optional[FrozenSet[str]] = None
+    if types:
+        selected = frozenset(name.strip() for name in types.split(",") if name.strip())
+        unknown = selected - set(EVENT_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown event types: {', '.join(sorted(unknown))}")
+    if wallet_address:
+        wallet_address = normalize_wallet_address(wallet_address)
+    return selected, wallet_address or None
+
+
+def format_sse(events: List[Dict[str, Any]]) -> bytes:
+    """이벤트 목록 -> SSE 메시지 바이트 (event: 종류 / data: JSON)"""
+    return b"".join(
+        b"event: " + event["type"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+        for event in events
+    )
+
+
+@router.get(
+    "/stream",
+    summary="이벤트 스트림 (SSE)",
+    description="민팅 상태, 새 무덤(NFT), 리더보드 변경을 Server-Sent Events 로 전송합니다",
+    tags=["events"]
+)
+async def stream_events(
+    types: Optional[str] = Query(None, description="받을 이벤트 종류 (쉼표 구분: mint,grave,leaderboard, 기본값: 전체)"),
+    wallet_address: Optional[str] = Query(None, description="특정 지갑 이벤트만 받기 (공용 이벤트는 항상 포함)")
+):
+    """
+    이벤트 스트림 (SSE)
+
+    - **types**: 받을 이벤트 종류 (선택사항)
+    - **wallet_address**: 특정 지갑 이벤트만 받기 (선택사항)
+
+    같은 대상의 갱신이 연달아 오면 마지막 값만 전송됩니다.
+    resync 이벤트를 받으면 놓친 이벤트가 있을 수 있으므로 REST API 로 현재 상태를 다시 조회해야 합니다.
+    이벤트가 없을 때는 주석 하트비트(": ping")가 전송됩니다.
+    """
+    try:
+        selected, wallet_address = parse_filters(types, wallet_address)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+
+    subscription = broadcaster.subscribe(selected, wallet_address)
+    if subscription is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many event subscribers",
+            headers={"Retry-After": "5"}
+        )
+
+    async def body():
+        try:
+            # 연결이 끊기면 3초 뒤 재연결
+            yield b"retry: 3000\n\n"
+            while True:
+                events = await subscription.next_batch(settings.events_heartbeat_seconds)
+                yield format_sse(events) if events else b": ping\n\n"
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _send_events(websocket: WebSocket, subscription: Subscription):
+    while True:
+        events = await subscription.next_batch(settings.events_heartbeat_seconds)
+        if events:
+            await websocket.send_bytes(orjson.dumps(events))
+        else:
+            await websocket.send_bytes(b'[{"type":"ping"}]')
+
+
+async def _wait_for_close(websocket: WebSocket):
+    # 클라이언트가 보내는 메시지는 무시하고 연결 종료만 감지
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/ws")
+async def events_websocket(
+    websocket: WebSocket,
+    types: Optional[str] = None,
+    wallet_address: Optional[str] = None
+):
+    """
+    이벤트 스트림 (WebSocket)
+
+    SSE 와 같은 이벤트를 메시지 하나에 JSON 배열로 묶어서 전송합니다 (필터 파라미터도 동일).
+    """
+    try:
+        selected, wallet_address = parse_filters(types, wallet_address)
+    except ValueError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    subscription = broadcaster.subscribe(selected, wallet_address)
+    if subscription is None:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    await websocket.accept()
+    sender = asyncio.create_task(_send_events(websocket, subscription))
+    closer = asyncio.create_task(_wait_for_close(websocket))
+    try:
+        await asyncio.wait({sender, closer}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        broadcaster.unsubscribe(subscription)
+        for task in (sender, closer):
+            task.cancel()
+        for task in (sender, closer):
+            try:
+                await task
+            except (asyncio.CancelledError, WebSocketDisconnect, RuntimeError):
+                pass
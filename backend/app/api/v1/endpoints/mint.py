@@ -3,13 +3,23 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
 from app.database import get_db
+from app.models.address import normalize_wallet_address
+from app.models.money import parse_amount
 from app.models.user import UserModel
 from app.models.wallet_info import WalletInfoModel
+from app.middleware.admission import check_wallet_rate
+from app.services.events import publish_event
+from app.services.pnl import loss_from_totals, pnl_from_totals
+from app.services.metrics import MINT_STAGE_SECONDS, StageTimer
+from app.services.write_behind import wallet_info_buffer
 import uuid
 from datetime import datetime
+from decimal import Decimal
 import json
+import logging
 import os
-from decimal import Decimal
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -97,21 +107,27 @@ async def mint_nft(
     
     지갑 정보를 먼저 저장하고, 해당 정보를 기반으로 NFT를 민팅합니다.
     """
+    timer = StageTimer(MINT_STAGE_SECONDS, operation="nft")
     try:
-        # 지갑 주소 형식 검증
-        if not mint_request.wallet_address.startswith('0x') or len(mint_request.wallet_address) != 42:
+        # 지갑 주소 형식 검증 (체크섬 표기로 정규화해서 대소문자만 다른 주소를 같은 지갑으로 처리)
+        try:
+            mint_request.wallet_address = normalize_wallet_address(mint_request.wallet_address)
+        except ValueError:
             raise HTTPException(
                 status_code=400, 
                 detail="Invalid wallet address format"
             )
         
-        # String 값을 float로 변환하고 검증
+        # 지갑별 민팅 요청 속도 제한 (DB 사용 전에 확인)
+        check_wallet_rate(mint_request.wallet_address)
+        
+        # String 값을 소수점 8자리 Decimal 로 변환하고 검증 (float 를 거치지 않아 입력값 그대로 저장)
         try:
-            avg_buyprice = float(mint_request.avg_buyprice)
-            avg_sellprice = float(mint_request.avg_sellprice)
-            current_price = float(mint_request.current_price)
-            total_buyprice = float(mint_request.total_buyprice)
-            total_sellprice = float(mint_request.total_sellprice)
+            avg_buyprice = parse_amount(mint_request.avg_buyprice)
+            avg_sellprice = parse_amount(mint_request.avg_sellprice)
+            current_price = parse_amount(mint_request.current_price)
+            total_buyprice = parse_amount(mint_request.total_buyprice)
+            total_sellprice = parse_amount(mint_request.total_sellprice)
         except ValueError:
             raise HTTPException(
                 status_code=400,
@@ -131,6 +147,18 @@ async def mint_nft(
                 detail="Total amounts must be non-negative"
             )
         
+        # 손실/수익 금액은 전체 포트폴리오 저장과 같은 방식으로 계산 (이동평균법 기준)
+        loss_amount, loss_rate = loss_from_totals(
+            avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice
+        )
+        pnl = pnl_from_totals(avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice)
+        gain_amount = max(pnl, Decimal(0)).quantize(Decimal("0.00000001"))
+        
+        timer.mark("validate")
+        
+        # 쓰기 지연 버퍼에 남은 이 지갑의 값을 먼저 저장 (민팅은 최신 wallet_info 기준)
+        await wallet_info_buffer.flush_wallet(mint_request.wallet_address)
+        
         # 기존 사용자 확인 또는 생성
         user = db.query(UserModel).filter(
             UserModel.wallet_address == mint_request.wallet_address
@@ -146,19 +174,25 @@ async def mint_nft(
             db.commit()
             db.refresh(user)
         
-        # 지갑 정보 저장 또는 업데이트
+        timer.mark("user")
+        
+        # 지갑 정보 저장 또는 업데이트 (수동 입력 행만, 분석으로 만든 토큰 행은 token_id 로 따로 관리)
         existing_wallet_info = db.query(WalletInfoModel).filter(
             WalletInfoModel.wallet_address == mint_request.wallet_address,
-            WalletInfoModel.ticker == mint_request.ticker
+            WalletInfoModel.ticker == mint_request.ticker,
+            WalletInfoModel.token_id.is_(None)
         ).first()
         
         if existing_wallet_info:
             # 기존 데이터 업데이트
-            existing_wallet_info.avg_buyprice = Decimal(str(avg_buyprice))  # type: ignore
-            existing_wallet_info.avg_sellprice = Decimal(str(avg_sellprice))  # type: ignore
-            existing_wallet_info.current_price = Decimal(str(current_price))  # type: ignore
-            existing_wallet_info.total_buyprice = Decimal(str(total_buyprice))  # type: ignore
-            existing_wallet_info.total_sellprice = Decimal(str(total_sellprice))  # type: ignore
+            existing_wallet_info.avg_buyprice = avg_buyprice  # type: ignore
+            existing_wallet_info.avg_sellprice = avg_sellprice  # type: ignore
+            existing_wallet_info.current_price = current_price  # type: ignore
+            existing_wallet_info.total_buyprice = total_buyprice  # type: ignore
+            existing_wallet_info.total_sellprice = total_sellprice  # type: ignore
+            existing_wallet_info.loss_rate = loss_rate  # type: ignore
+            existing_wallet_info.loss_amount = loss_amount  # type: ignore
+            existing_wallet_info.gain_amount = gain_amount  # type: ignore
             db.commit()
             db.refresh(existing_wallet_info)
             wallet_info = existing_wallet_info
@@ -170,23 +204,52 @@ async def mint_nft(
                 user_uuid=user.uuid,
                 wallet_address=mint_request.wallet_address,  # type: ignore
                 ticker=mint_request.ticker,  # type: ignore
-                avg_buyprice=Decimal(str(avg_buyprice)),  # type: ignore
-                avg_sellprice=Decimal(str(avg_sellprice)),  # type: ignore
-                current_price=Decimal(str(current_price)),  # type: ignore
-                total_buyprice=Decimal(str(total_buyprice)),  # type: ignore
-                total_sellprice=Decimal(str(total_sellprice))  # type: ignore
+                avg_buyprice=avg_buyprice,  # type: ignore
+                avg_sellprice=avg_sellprice,  # type: ignore
+                current_price=current_price,  # type: ignore
+                total_buyprice=total_buyprice,  # type: ignore
+                total_sellprice=total_sellprice,  # type: ignore
+                loss_rate=loss_rate,  # type: ignore
+                loss_amount=loss_amount,  # type: ignore
+                gain_amount=gain_amount  # type: ignore
             )
             db.add(new_wallet_info)
             db.commit()
             db.refresh(new_wallet_info)
             wallet_info = new_wallet_info
         
+        timer.mark("wallet_info")
+        
         # 컨트랙트 주소 로드
         contract_addresses = load_contract_addresses()
         nft_address = contract_addresses.get("nft") or "0x0000000000000000000000000000000000000000"
         
         # NFT 민팅
         result = await mint_nft_asset(wallet_info, nft_address)
+        timer.mark("asset")
+        
+        # 민팅 완료 이벤트 (새 무덤은 공용 피드로도 전송)
+        # 자산은 이미 발행됐으므로 이벤트 전송/커밋이 실패해도 로그만 남기고 민팅 결과를 응답
+        try:
+            publish_event(db, "mint", f"{mint_request.wallet_address}:{mint_request.ticker}", {
+                "wallet_address": mint_request.wallet_address,
+                "ticker": mint_request.ticker,
+                "asset": "nft",
+                "status": "minted",
+                "token_id": result.get("token_id"),
+                "transaction_hash": result.get("transaction_hash")
+            })
+            publish_event(db, "grave", None, {
+                "owner": mint_request.wallet_address,
+                "ticker": mint_request.ticker,
+                "token_id": result.get("token_id"),
+                "loss_rate": float(wallet_info.loss_rate),
+                "loss_amount": str(wallet_info.loss_amount)
+            })
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Mint event publish failed for {mint_request.wallet_address}:{mint_request.ticker}: {e}")
         
         return NFTMintResponse(
             wallet_address=mint_request.wallet_address,
@@ -235,14 +298,20 @@ async def create_meme_token(
     
     지갑 정보를 먼저 저장하고, 해당 정보를 기반으로 밈토큰을 생성합니다.
     """
+    timer = StageTimer(MINT_STAGE_SECONDS, operation="token")
     try:
-        # 지갑 주소 형식 검증
-        if not mint_request.wallet_address.startswith('0x') or len(mint_request.wallet_address) != 42:
+        # 지갑 주소 형식 검증 (체크섬 표기로 정규화해서 대소문자만 다른 주소를 같은 지갑으로 처리)
+        try:
+            mint_request.wallet_address = normalize_wallet_address(mint_request.wallet_address)
+        except ValueError:
             raise HTTPException(
                 status_code=400, 
                 detail="Invalid wallet address format"
             )
         
+        # 지갑별 민팅 요청 속도 제한 (DB 사용 전에 확인)
+        check_wallet_rate(mint_request.wallet_address)
+        
         # 입력값 검증
         if not mint_request.token_name or not mint_request.token_symbol:
             raise HTTPException(
@@ -256,13 +325,13 @@ async def create_meme_token(
                 detail="total_supply must be greater than 0"
             )
         
-        # String 값을 float로 변환하고 검증
+        # String 값을 소수점 8자리 Decimal 로 변환하고 검증 (float 를 거치지 않아 입력값 그대로 저장)
         try:
-            avg_buyprice = float(mint_request.avg_buyprice)
-            avg_sellprice = float(mint_request.avg_sellprice)
-            current_price = float(mint_request.current_price)
-            total_buyprice = float(mint_request.total_buyprice)
-            total_sellprice = float(mint_request.total_sellprice)
+            avg_buyprice = parse_amount(mint_request.avg_buyprice)
+            avg_sellprice = parse_amount(mint_request.avg_sellprice)
+            current_price = parse_amount(mint_request.current_price)
+            total_buyprice = parse_amount(mint_request.total_buyprice)
+            total_sellprice = parse_amount(mint_request.total_sellprice)
         except ValueError:
             raise HTTPException(
                 status_code=400,
@@ -282,6 +351,18 @@ async def create_meme_token(
                 detail="Total amounts must be non-negative"
             )
         
+        # 손실/수익 금액은 전체 포트폴리오 저장과 같은 방식으로 계산 (이동평균법 기준)
+        loss_amount, loss_rate = loss_from_totals(
+            avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice
+        )
+        pnl = pnl_from_totals(avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice)
+        gain_amount = max(pnl, Decimal(0)).quantize(Decimal("0.00000001"))
+        
+        timer.mark("validate")
+        
+        # 쓰기 지연 버퍼에 남은 이 지갑의 값을 먼저 저장 (민팅은 최신 wallet_info 기준)
+        await wallet_info_buffer.flush_wallet(mint_request.wallet_address)
+        
         # 기존 사용자 확인 또는 생성
         user = db.query(UserModel).filter(
             UserModel.wallet_address == mint_request.wallet_address
@@ -297,19 +378,25 @@ async def create_meme_token(
             db.commit()
             db.refresh(user)
         
-        # 지갑 정보 저장 또는 업데이트
+        timer.mark("user")
+        
+        # 지갑 정보 저장 또는 업데이트 (수동 입력 행만, 분석으로 만든 토큰 행은 token_id 로 따로 관리)
         existing_wallet_info = db.query(WalletInfoModel).filter(
             WalletInfoModel.wallet_address == mint_request.wallet_address,
-            WalletInfoModel.ticker == mint_request.ticker
+            WalletInfoModel.ticker == mint_request.ticker,
+            WalletInfoModel.token_id.is_(None)
         ).first()
         
         if existing_wallet_info:
             # 기존 데이터 업데이트
-            existing_wallet_info.avg_buyprice = Decimal(str(avg_buyprice))  # type: ignore
-            existing_wallet_info.avg_sellprice = Decimal(str(avg_sellprice))  # type: ignore
-            existing_wallet_info.current_price = Decimal(str(current_price))  # type: ignore
-            existing_wallet_info.total_buyprice = Decimal(str(total_buyprice))  # type: ignore
-            existing_wallet_info.total_sellprice = Decimal(str(total_sellprice))  # type: ignore
+            existing_wallet_info.avg_buyprice = avg_buyprice  # type: ignore
+            existing_wallet_info.avg_sellprice = avg_sellprice  # type: ignore
+            existing_wallet_info.current_price = current_price  # type: ignore
+            existing_wallet_info.total_buyprice = total_buyprice  # type: ignore
+            existing_wallet_info.total_sellprice = total_sellprice  # type: ignore
+            existing_wallet_info.loss_rate = loss_rate  # type: ignore
+            existing_wallet_info.loss_amount = loss_amount  # type: ignore
+            existing_wallet_info.gain_amount = gain_amount  # type: ignore
             db.commit()
             db.refresh(existing_wallet_info)
             wallet_info = existing_wallet_info
@@ -321,17 +408,22 @@ async def create_meme_token(
                 user_uuid=user.uuid,
                 wallet_address=mint_request.wallet_address,  # type: ignore
                 ticker=mint_request.ticker,  # type: ignore
-                avg_buyprice=Decimal(str(avg_buyprice)),  # type: ignore
-                avg_sellprice=Decimal(str(avg_sellprice)),  # type: ignore
-                current_price=Decimal(str(current_price)),  # type: ignore
-                total_buyprice=Decimal(str(total_buyprice)),  # type: ignore
-                total_sellprice=Decimal(str(total_sellprice))  # type: ignore
+                avg_buyprice=avg_buyprice,  # type: ignore
+                avg_sellprice=avg_sellprice,  # type: ignore
+                current_price=current_price,  # type: ignore
+                total_buyprice=total_buyprice,  # type: ignore
+                total_sellprice=total_sellprice,  # type: ignore
+                loss_rate=loss_rate,  # type: ignore
+                loss_amount=loss_amount,  # type: ignore
+                gain_amount=gain_amount  # type: ignore
             )
             db.add(new_wallet_info)
             db.commit()
             db.refresh(new_wallet_info)
             wallet_info = new_wallet_info
         
+        timer.mark("wallet_info")
+        
         # 컨트랙트 주소 로드
         contract_addresses = load_contract_addresses()
         token_address = contract_addresses.get("token") or "0x0000000000000000000000000000000000000000"
@@ -344,6 +436,22 @@ async def create_meme_token(
             mint_request.total_supply,
             token_address
         )
+        timer.mark("asset")
+        
+        # 민팅 완료 이벤트 (토큰은 이미 생성됐으므로 실패해도 로그만 남김)
+        try:
+            publish_event(db, "mint", f"{mint_request.wallet_address}:{mint_request.ticker}", {
+                "wallet_address": mint_request.wallet_address,
+                "ticker": mint_request.ticker,
+                "asset": "token",
+                "status": "minted",
+                "token_id": result.get("token_id"),
+                "transaction_hash": result.get("transaction_hash")
+            })
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Mint event publish failed for {mint_request.wallet_address}:{mint_request.ticker}: {e}")
         
         return TokenMintResponse(
             wallet_address=mint_request.wallet_address,
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import List, Optional
+from app.config import settings
+from app.database import get_db
+from app.services.search import SEARCH_KINDS, normalize_query, search
+
+router = APIRouter()
+
+
+class UserSearchResult(BaseModel):
+    """사용자 검색 결과 모델"""
+    wallet_address: str
+    user_id: int
+    user_uuid: str
+    username: Optional[str]
+    total_loss: float
+    total_gain: float
+    score: float
+
+
+class TickerSearchResult(BaseModel):
+    """티커 검색 결과 모델"""
+    ticker: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    """검색 응답 모델"""
+    query: str
+    users: List[UserSearchResult]
+    tickers: List[TickerSearchResult]
+
+
+@router.get(
+    "/",
+    response_model=SearchResponse,
+    summary="사용자/티커 검색",
+    description="사용자명 접두사, 지갑 주소 일부, 티커로 검색합니다 (점수순)",
+    tags=["search"]
+)
+async def search_all(
+    q: str = Query(..., description="검색어 (사용자명, 지갑 주소 일부, 티커)", min_length=1, max_length=100),
+    type: str = Query("all", description="검색 종류 (all/users/tickers)", pattern="^(all|users|tickers)$"),
+    limit: int = Query(20, description="종류별 조회할 개수", ge=1, le=50),
+    offset: int = Query(0, description="건너뛸 개수", ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    사용자/티커 검색
+
+    - **q**: 검색어 (대소문자 무시, 지갑 주소는 0x 없이 일부만 입력해도 검색)
+    - **type**: 검색 종류 (기본값: all)
+    - **limit**: 종류별 조회할 개수 (기본값: 20, 최대 50)
+    - **offset**: 건너뛸 개수 (offset + limit 은 SEARCH_MAX_RESULTS 이하)
+
+    사용자는 사용자명 정확히 일치 > 접두사 일치 > 유사도 순, 티커도 같은 기준으로 정렬합니다.
+    """
+    if not normalize_query(q):
+        raise HTTPException(
+            status_code=400,
+            detail="Search query is empty"
+        )
+    if offset + limit > settings.search_max_results:
+        raise HTTPException(
+            status_code=400,
+            detail=f"offset + limit must be at most {settings.search_max_results}"
+        )
+
+    try:
+        kinds = SEARCH_KINDS if type == "all" else (type,)
+        results = search(db, q, kinds, limit, offset)
+        return SearchResponse(
+            query=normalize_query(q),
+            users=[UserSearchResult(**result) for result in results.get("users", [])],
+            tickers=[TickerSearchResult(**result) for result in results.get("tickers", [])]
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error searching: {str(e)}"
+        )
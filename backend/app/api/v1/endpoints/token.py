@@ -0,0 +1,66 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field
+from typing import List
+from app.database import get_db
+from app.models.token import Token
+from app.services.token_registry import TokenRegistry, get_token_registry
+
+router = APIRouter()
+
+# 한 번에 조회할 수 있는 최대 토큰 수
+MAX_RESOLVE_ADDRESSES = 500
+
+
+class TokenResolveRequest(BaseModel):
+    """토큰 일괄 조회 요청 모델"""
+    chain: str = "eth-mainnet"
+    addresses: List[str] = Field(..., description="조회할 토큰 컨트랙트 주소 목록")
+
+
+@router.post(
+    "/resolve",
+    response_model=List[Token],
+    summary="토큰 메타데이터 일괄 조회",
+    description="컨트랙트 주소 목록의 심볼/이름/decimals 를 한 번에 조회합니다",
+    tags=["tokens"]
+)
+async def resolve_tokens(
+    resolve_request: TokenResolveRequest,
+    db: Session = Depends(get_db),
+    token_registry: TokenRegistry = Depends(get_token_registry)
+):
+    """
+    토큰 메타데이터 일괄 조회
+
+    - **chain**: 체인 이름 (기본값: eth-mainnet)
+    - **addresses**: 토큰 컨트랙트 주소 목록 (최대 500개)
+
+    처음 보는 토큰은 체인에서 읽어 저장하고, 이후에는 캐시에서 바로 반환합니다.
+    조회에 실패한 토큰은 source 가 default 인 기본값(UNKNOWN, 18)으로 반환됩니다.
+    """
+    try:
+        if len(resolve_request.addresses) > MAX_RESOLVE_ADDRESSES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many addresses (max {MAX_RESOLVE_ADDRESSES})"
+            )
+
+        # 주소 형식 검증
+        for address in resolve_request.addresses:
+            if not address.startswith('0x') or len(address) != 42:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid token address format: {address}"
+                )
+
+        tokens = await token_registry.resolve_many(db, resolve_request.chain, resolve_request.addresses)
+        return [tokens[address.lower()] for address in resolve_request.addresses]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error resolving tokens: {str(e)}"
+        )
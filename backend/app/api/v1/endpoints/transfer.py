@@ -0,0 +1,152 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from app.config import settings
+from app.database import get_db
+from app.models.address import normalize_wallet_address
+from app.models.transfer import WalletSyncStateModel
+from app.services.aggregates import load_positions, positions_to_results
+from app.services.ingestion import (
+    IngestResult, TransactionProvider, get_transaction_provider, ingest_wallet
+)
+from app.services.pnl import CostBasisMethod, save_pnl_results
+from app.services.price import PriceService, get_price_service
+from app.services.write_behind import wallet_info_buffer
+
+router = APIRouter()
+
+
+class TransferSyncRequest(BaseModel):
+    """전송 내역 수집 요청 모델"""
+    wallet_address: str
+    chain: str = "eth-mainnet"
+    method: CostBasisMethod = CostBasisMethod.AVERAGE
+
+
+class TransferSyncStateResponse(BaseModel):
+    """전송 내역 수집 상태 응답 모델"""
+    wallet_address: str
+    chain: str
+    last_block: int
+    updated_at: str
+
+
+@router.post(
+    "/sync",
+    response_model=IngestResult,
+    summary="전송 내역 수집",
+    description="마지막 체크포인트 이후의 새 트랜잭션만 받아서 transfers 테이블에 저장합니다",
+    tags=["transfers"]
+)
+async def sync_transfers(
+    sync_request: TransferSyncRequest,
+    db: Session = Depends(get_db),
+    provider: TransactionProvider = Depends(get_transaction_provider),
+    price_service: PriceService = Depends(get_price_service)
+):
+    """
+    전송 내역 수집
+
+    - **wallet_address**: 지갑 주소
+    - **chain**: 체인 이름 (기본값: eth-mainnet)
+    - **method**: wallet_info 갱신에 사용할 원가 계산 방식 (average/fifo)
+
+    처음 수집하는 지갑은 전체 내역을, 이후에는 새 블록의 내역만 가져옵니다.
+    새 전송은 손익 집계에 바로 반영되고, wallet_info 는 집계값으로 갱신됩니다.
+    """
+    try:
+        # 지갑 주소 형식 검증 (체크섬 표기로 정규화)
+        try:
+            sync_request.wallet_address = normalize_wallet_address(sync_request.wallet_address)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid wallet address format"
+            )
+
+        result = await ingest_wallet(
+            db,
+            provider,
+            sync_request.wallet_address,
+            sync_request.chain,
+            settings.ingestion_batch_size,
+            price_service
+        )
+
+        if result.transfers_inserted:
+            positions = load_positions(db, sync_request.wallet_address, sync_request.chain)
+            await wallet_info_buffer.flush_wallet(sync_request.wallet_address)
+            save_pnl_results(
+                db,
+                sync_request.wallet_address,
+                positions_to_results(positions, sync_request.method)
+            )
+
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error syncing transfers: {str(e)}"
+        )
+
+
+@router.get(
+    "/sync",
+    response_model=TransferSyncStateResponse,
+    summary="전송 내역 수집 상태 조회",
+    description="지갑의 마지막 수집 블록을 조회합니다",
+    tags=["transfers"]
+)
+async def get_sync_state(
+    wallet_address: str = Query(
+        ...,
+        description="조회할 지갑 주소",
+        example="0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b6"
+    ),
+    chain: str = Query("eth-mainnet", description="체인 이름"),
+    db: Session = Depends(get_db)
+):
+    """
+    전송 내역 수집 상태 조회
+
+    - **wallet_address**: 조회할 지갑 주소
+    - **chain**: 체인 이름 (기본값: eth-mainnet)
+    """
+    try:
+        try:
+            wallet_address = normalize_wallet_address(wallet_address)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid wallet address format"
+            )
+
+        state = db.query(WalletSyncStateModel).filter(
+            WalletSyncStateModel.wallet_address == wallet_address,
+            WalletSyncStateModel.chain == chain
+        ).first()
+
+        if not state:
+            raise HTTPException(
+                status_code=404,
+                detail="Sync state not found"
+            )
+
+        return TransferSyncStateResponse(
+            wallet_address=state.wallet_address,
+            chain=state.chain,
+            last_block=state.last_block,
+            updated_at=state.updated_at.isoformat() if state.updated_at else ""
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching sync state: {str(e)}"
+        )
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from app.database import get_db
+from app.models.address import normalize_wallet_address
 from app.models.user import UserModel
 import uuid
 
@@ -26,6 +27,8 @@ class UserInfoResponse(BaseModel):
     wallet_address: str
     user_id: int
     user_uuid: str
+    total_loss: float
+    total_gain: float
     created_at: str
 
 
@@ -48,8 +51,10 @@ async def create_user(
     지갑 주소가 이미 존재하면 기존 사용자 정보를 반환합니다.
     """
     try:
-        # 지갑 주소 형식 검증
-        if not user_data.wallet_address.startswith('0x') or len(user_data.wallet_address) != 42:
+        # 지갑 주소 형식 검증 (체크섬 표기로 정규화해서 대소문자만 다른 주소를 같은 지갑으로 처리)
+        try:
+            user_data.wallet_address = normalize_wallet_address(user_data.wallet_address)
+        except ValueError:
             raise HTTPException(
                 status_code=400, 
                 detail="Invalid wallet address format"
@@ -118,6 +123,15 @@ async def get_user_info(
     해당 지갑 주소의 사용자 정보를 반환합니다.
     """
     try:
+        # 어떤 대소문자 표기로 조회해도 같은 사용자를 찾도록 정규화
+        try:
+            wallet_address = normalize_wallet_address(wallet_address)
+        except ValueError:
+            raise HTTPException(
+                status_code=400, 
+                detail="Invalid wallet address format"
+            )
+        
         user = db.query(UserModel).filter(
             UserModel.wallet_address == wallet_address
         ).first()
@@ -132,6 +146,8 @@ async def get_user_info(
             wallet_address=user.__dict__["wallet_address"],
             user_id=user.__dict__["id"],
             user_uuid=str(user.uuid),
+            total_loss=float(user.total_loss or 0),
+            total_gain=float(user.total_gain or 0),
             created_at=user.__dict__["created_at"].isoformat() if user.__dict__["created_at"] else ""
         )
         
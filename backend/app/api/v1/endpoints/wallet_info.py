@@ -1,11 +1,27 @@
 # type: ignore
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+from app.config import settings
 from app.database import get_db
+from app.models.address import normalize_wallet_address
+from app.models.money import parse_amount
 from app.models.user import UserModel
 from app.models.wallet_info import WalletInfoModel
+from app.services.events import publish_event
+from app.services.pnl import (
+    CostBasisMethod, TransferRecord, PnLResult,
+    transfers_to_arrays, calculate_pnl, save_pnl_results, loss_from_totals, pnl_from_totals
+)
+from app.services.price import PriceService, get_price_service, to_price_date
+from app.services.ingestion import TransactionProvider, get_transaction_provider
+from app.services.batch import analyze_wallets
+from app.services.streaming import STREAM_MEDIA_TYPES, iter_rows
+from app.services.serialization import RowEncoder
+from app.services.write_behind import upsert_wallet_info_rows, validate_wallet_info_row, wallet_info_buffer
 import uuid
 from datetime import datetime
 from decimal import Decimal
@@ -56,6 +72,64 @@ class WalletInfoResponse(BaseModel):
     created_at: str
 
 
+# 빠른 응답 모드용 사전 컴파일 인코더
+WALLET_INFO_ENCODER = RowEncoder(WalletInfoResponse, WalletInfoModel)
+
+
+class WalletAnalyzeRequest(BaseModel):
+    """지갑 전송 내역 기반 손익 계산 요청 모델"""
+    wallet_address: str
+    method: CostBasisMethod = CostBasisMethod.AVERAGE
+    chain: str = "eth-mainnet"
+    transfers: List[TransferRecord]
+    current_prices: Dict[str, float] = {}
+
+
+class WalletBatchAnalyzeRequest(BaseModel):
+    """여러 지갑 일괄 손익 계산 요청 모델"""
+    wallet_addresses: List[str]
+    method: CostBasisMethod = CostBasisMethod.AVERAGE
+    chain: str = "eth-mainnet"
+    concurrency: Optional[int] = None
+
+
+class WalletAnalyzeResponse(BaseModel):
+    """지갑 손익 계산 응답 모델"""
+    wallet_address: str
+    method: CostBasisMethod
+    results: List[PnLResult]
+    message: str
+
+
+class WalletPortfolioItem(BaseModel):
+    """포트폴리오 티커별 통계 (프론트엔드에서 모든 값을 string으로 전송)"""
+    ticker: str
+    avg_buyprice: str = "0.0"
+    avg_sellprice: str = "0.0"
+    current_price: str = "0.0"
+    total_buyprice: str = "0.0"
+    total_sellprice: str = "0.0"
+
+
+class WalletPortfolioRequest(BaseModel):
+    """지갑 포트폴리오 일괄 저장 요청 모델"""
+    wallet_address: str
+    items: List[WalletPortfolioItem]
+
+
+class WalletPortfolioResponse(BaseModel):
+    """지갑 포트폴리오 응답 모델 (저장 후 지갑 전체 기준)"""
+    wallet_address: str
+    user_id: int
+    user_uuid: str
+    items: List[WalletInfoResponse]
+    total_buyprice: float
+    total_sellprice: float
+    loss_amount: float
+    loss_rate: float
+    message: str
+
+
 @router.post(
     "/", 
     response_model=WalletInfoCreateResponse,
@@ -82,20 +156,22 @@ async def create_wallet_info(
     손실률과 손실금액은 자동으로 계산됩니다.
     """
     try:
-        # 지갑 주소 형식 검증
-        if not wallet_info.wallet_address.startswith('0x') or len(wallet_info.wallet_address) != 42:
+        # 지갑 주소 형식 검증 (체크섬 표기로 정규화해서 대소문자만 다른 주소를 같은 지갑으로 처리)
+        try:
+            wallet_info.wallet_address = normalize_wallet_address(wallet_info.wallet_address)
+        except ValueError:
             raise HTTPException(
                 status_code=400, 
                 detail="Invalid wallet address format"
             )
         
-        # String 값을 float로 변환하고 검증
+        # String 값을 소수점 8자리 Decimal 로 변환하고 검증 (float 를 거치지 않아 입력값 그대로 저장)
         try:
-            avg_buyprice = float(wallet_info.avg_buyprice)
-            avg_sellprice = float(wallet_info.avg_sellprice)
-            current_price = float(wallet_info.current_price)
-            total_buyprice = float(wallet_info.total_buyprice)
-            total_sellprice = float(wallet_info.total_sellprice)
+            avg_buyprice = parse_amount(wallet_info.avg_buyprice)
+            avg_sellprice = parse_amount(wallet_info.avg_sellprice)
+            current_price = parse_amount(wallet_info.current_price)
+            total_buyprice = parse_amount(wallet_info.total_buyprice)
+            total_sellprice = parse_amount(wallet_info.total_sellprice)
         except ValueError:
             raise HTTPException(
                 status_code=400,
@@ -115,6 +191,16 @@ async def create_wallet_info(
                 detail="Total amounts must be non-negative"
             )
         
+        # 손실/수익 금액은 전체 포트폴리오 저장과 같은 방식으로 계산 (이동평균법 기준)
+        loss_amount, loss_rate = loss_from_totals(
+            avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice
+        )
+        pnl = pnl_from_totals(avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice)
+        gain_amount = max(pnl, Decimal(0)).quantize(Decimal("0.00000001"))
+        
+        # 쓰기 지연 버퍼에 남은 이 지갑의 예전 값이 나중에 덮어쓰지 않도록 먼저 저장
+        await wallet_info_buffer.flush_wallet(wallet_info.wallet_address)
+        
         # 기존 사용자 확인 또는 생성
         user = db.query(UserModel).filter(
             UserModel.wallet_address == wallet_info.wallet_address
@@ -130,19 +216,27 @@ async def create_wallet_info(
             db.commit()
             db.refresh(user)
         
-        # 기존 wallet_info 확인 (같은 지갑 주소와 티커 조합이 있는지)
+        # 기존 wallet_info 확인 (같은 지갑 주소와 티커의 수동 입력 행, 분석으로 만든 토큰 행은 제외)
         existing_wallet_info = db.query(WalletInfoModel).filter(
             WalletInfoModel.wallet_address == wallet_info.wallet_address,
-            WalletInfoModel.ticker == wallet_info.ticker
+            WalletInfoModel.ticker == wallet_info.ticker,
+            WalletInfoModel.token_id.is_(None)
         ).first()
         
         if existing_wallet_info:
             # 기존 데이터 업데이트 (직접 속성 접근)
-            existing_wallet_info.avg_buyprice = Decimal(str(avg_buyprice))  # type: ignore
-            existing_wallet_info.avg_sellprice = Decimal(str(avg_sellprice))  # type: ignore
-            existing_wallet_info.current_price = Decimal(str(current_price))  # type: ignore
-            existing_wallet_info.total_buyprice = Decimal(str(total_buyprice))  # type: ignore
-            existing_wallet_info.total_sellprice = Decimal(str(total_sellprice))  # type: ignore
+            existing_wallet_info.avg_buyprice = avg_buyprice  # type: ignore
+            existing_wallet_info.avg_sellprice = avg_sellprice  # type: ignore
+            existing_wallet_info.current_price = current_price  # type: ignore
+            existing_wallet_info.total_buyprice = total_buyprice  # type: ignore
+            existing_wallet_info.total_sellprice = total_sellprice  # type: ignore
+            existing_wallet_info.loss_rate = loss_rate  # type: ignore
+            existing_wallet_info.loss_amount = loss_amount  # type: ignore
+            existing_wallet_info.gain_amount = gain_amount  # type: ignore
+            publish_event(db, "leaderboard", wallet_info.wallet_address, {
+                "wallet_address": wallet_info.wallet_address,
+                "ticker": wallet_info.ticker
+            })
             db.commit()
             db.refresh(existing_wallet_info)
             
@@ -168,13 +262,20 @@ async def create_wallet_info(
                 user_uuid=user.uuid,
                 wallet_address=wallet_info.wallet_address,  # type: ignore
                 ticker=wallet_info.ticker,  # type: ignore
-                avg_buyprice=Decimal(str(avg_buyprice)),  # type: ignore
-                avg_sellprice=Decimal(str(avg_sellprice)),  # type: ignore
-                current_price=Decimal(str(current_price)),  # type: ignore
-                total_buyprice=Decimal(str(total_buyprice)),  # type: ignore
-                total_sellprice=Decimal(str(total_sellprice))  # type: ignore
+                avg_buyprice=avg_buyprice,  # type: ignore
+                avg_sellprice=avg_sellprice,  # type: ignore
+                current_price=current_price,  # type: ignore
+                total_buyprice=total_buyprice,  # type: ignore
+                total_sellprice=total_sellprice,  # type: ignore
+                loss_rate=loss_rate,  # type: ignore
+                loss_amount=loss_amount,  # type: ignore
+                gain_amount=gain_amount  # type: ignore
             )
             db.add(new_wallet_info)
+            publish_event(db, "leaderboard", wallet_info.wallet_address, {
+                "wallet_address": wallet_info.wallet_address,
+                "ticker": wallet_info.ticker
+            })
             db.commit()
             db.refresh(new_wallet_info)
             
@@ -203,6 +304,174 @@ async def create_wallet_info(
         )
 
 
+@router.post(
+    "/portfolio",
+    response_model=WalletPortfolioResponse,
+    summary="포트폴리오 일괄 저장",
+    description="한 지갑의 여러 티커 거래 정보를 한 번에 저장하고 지갑 전체 포트폴리오를 반환합니다",
+    tags=["wallet_info"]
+)
+async def save_wallet_portfolio(
+    portfolio: WalletPortfolioRequest,
+    sync: bool = Query(False, description="쓰기 지연 모드에서도 바로 저장하고 전체 포트폴리오 반환"),
+    db: Session = Depends(get_db)
+):
+    """
+    포트폴리오 일괄 저장 (프론트엔드에서 모든 값을 string으로 전송)
+
+    - **wallet_address**: 지갑 주소
+    - **items**: 티커별 통계 리스트 (ticker, avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice)
+
+    - **sync**: 쓰기 지연 모드에서도 바로 저장 (선택사항)
+
+    사용자 조회/생성은 한 번, 모든 티커 저장은 하나의 upsert 문으로 처리합니다.
+    손실률과 손실금액은 통계값으로 다시 계산되며, 응답에는 이 지갑의 전체 티커와 합계가 포함됩니다.
+    쓰기 지연 모드(WALLET_WRITE_BEHIND_ENABLED)에서는 값을 버퍼에 넣고 202 와 받은 티커 수만 응답하며,
+    같은 티커의 연속 갱신은 마지막 값만 저장됩니다.
+    """
+    try:
+        # 지갑 주소 형식 검증 (체크섬 표기로 정규화해서 대소문자만 다른 주소를 같은 지갑으로 처리)
+        try:
+            portfolio.wallet_address = normalize_wallet_address(portfolio.wallet_address)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid wallet address format"
+            )
+
+        if not portfolio.items:
+            raise HTTPException(
+                status_code=400,
+                detail="items must not be empty"
+            )
+
+        tickers = [item.ticker for item in portfolio.items]
+        if len(set(tickers)) != len(tickers):
+            raise HTTPException(
+                status_code=400,
+                detail="Duplicate tickers in items"
+            )
+
+        # String 값을 소수점 8자리 Decimal 로 변환하고 검증
+        values = []
+        for item in portfolio.items:
+            try:
+                avg_buyprice = parse_amount(item.avg_buyprice)
+                avg_sellprice = parse_amount(item.avg_sellprice)
+                current_price = parse_amount(item.current_price)
+                total_buyprice = parse_amount(item.total_buyprice)
+                total_sellprice = parse_amount(item.total_sellprice)
+            except ValueError:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid numeric values provided for {item.ticker}"
+                )
+
+            if min(avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice) < 0:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Prices and totals must be non-negative for {item.ticker}"
+                )
+
+            loss_amount, loss_rate = loss_from_totals(
+                avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice
+            )
+            pnl = pnl_from_totals(avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice)
+            values.append({
+                "ticker": item.ticker,
+                "avg_buyprice": avg_buyprice,
+                "avg_sellprice": avg_sellprice,
+                "current_price": current_price,
+                "total_buyprice": total_buyprice,
+                "total_sellprice": total_sellprice,
+                "loss_rate": loss_rate,
+                "loss_amount": loss_amount,
+                "gain_amount": max(pnl, Decimal(0)).quantize(Decimal("0.00000001"))
+            })
+            # 컬럼에 들어가지 않는 값(긴 티커, 저장 범위를 넘는 금액)은 저장 단계가 아니라 여기서 거부
+            try:
+                validate_wallet_info_row(item.ticker, values[-1])
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=400,
+                    detail=str(e)
+                )
+
+        # 쓰기 지연 모드: 버퍼에 넣고 바로 응답 (버퍼가 가득 찼으면 아래에서 바로 저장)
+        if settings.wallet_write_behind_enabled and not sync and wallet_info_buffer.submit(portfolio.wallet_address, values):
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "wallet_address": portfolio.wallet_address,
+                    "accepted": len(values),
+                    "message": "Wallet portfolio accepted"
+                }
+            )
+
+        # 버퍼에 남은 이 지갑의 예전 값이 나중에 덮어쓰지 않도록 먼저 저장
+        await wallet_info_buffer.flush_wallet(portfolio.wallet_address)
+
+        # 사용자 조회/생성과 모든 티커 저장 (하나의 INSERT ... ON CONFLICT 문, 사용자 합계도 함께 갱신)
+        users = upsert_wallet_info_rows(db, {
+            (portfolio.wallet_address, value["ticker"]): value for value in values
+        })
+        user_id, user_uuid = users[portfolio.wallet_address]
+
+        records = db.query(WalletInfoModel).filter(
+            WalletInfoModel.wallet_address == portfolio.wallet_address
+        ).order_by(WalletInfoModel.ticker).all()
+
+        total_buyprice = sum((record.total_buyprice for record in records), Decimal(0))
+        total_sellprice = sum((record.total_sellprice for record in records), Decimal(0))
+        loss_amount = sum((record.loss_amount for record in records), Decimal(0))
+
+        # 커밋 후에는 ORM 속성이 만료되므로 응답을 먼저 만든다
+        response = WalletPortfolioResponse(
+            wallet_address=portfolio.wallet_address,
+            user_id=user_id,
+            user_uuid=str(user_uuid),
+            items=[
+                WalletInfoResponse(
+                    wallet_address=record.wallet_address,
+                    ticker=record.ticker,
+                    avg_buyprice=float(record.avg_buyprice),
+                    avg_sellprice=float(record.avg_sellprice),
+                    current_price=float(record.current_price),
+                    total_buyprice=float(record.total_buyprice),
+                    total_sellprice=float(record.total_sellprice),
+                    loss_rate=float(record.loss_rate),
+                    loss_amount=float(record.loss_amount),
+                    user_id=record.user_id,
+                    user_uuid=str(record.user_uuid),
+                    created_at=record.created_at.isoformat() if record.created_at else ""
+                )
+                for record in records
+            ],
+            total_buyprice=float(total_buyprice),
+            total_sellprice=float(total_sellprice),
+            loss_amount=float(loss_amount),
+            loss_rate=float(loss_amount / total_buyprice * 100) if total_buyprice > 0 else 0.0,
+            message="Wallet portfolio saved successfully"
+        )
+        publish_event(db, "leaderboard", portfolio.wallet_address, {
+            "wallet_address": portfolio.wallet_address,
+            "loss_amount": str(loss_amount),
+            "loss_rate": response.loss_rate
+        })
+        db.commit()
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error saving wallet portfolio: {str(e)}"
+        )
+
+
 @router.get(
     "/", 
     response_model=List[WalletInfoResponse],
@@ -218,6 +487,7 @@ async def get_wallet_info_list(
     ),
     limit: int = Query(50, description="조회할 개수", example=50),
     offset: int = Query(0, description="건너뛸 개수", example=0),
+    fast: Optional[bool] = Query(None, description="빠른 응답 모드 (기본값: 서버 설정)"),
     db: Session = Depends(get_db)
 ):
     """
@@ -226,8 +496,26 @@ async def get_wallet_info_list(
     - **wallet_address**: 특정 지갑 주소로 필터링 (선택사항)
     - **limit**: 조회할 개수 (기본값: 50)
     - **offset**: 건너뛸 개수 (기본값: 0)
+    - **fast**: 빠른 응답 모드 사용 여부 (응답 형식은 같음)
     """
+    if wallet_address:
+        try:
+            wallet_address = normalize_wallet_address(wallet_address)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid wallet address format"
+            )
+
     try:
+        if fast if fast is not None else settings.fast_responses:
+            # DB 결과 행을 응답 모델 객체 없이 바로 JSON 으로 직렬화
+            statement = WALLET_INFO_ENCODER.select()
+            if wallet_address:
+                statement = statement.where(WalletInfoModel.wallet_address == wallet_address)
+            rows = db.execute(statement.offset(offset).limit(limit))
+            return Response(content=WALLET_INFO_ENCODER.encode(rows), media_type="application/json")
+
         query = db.query(WalletInfoModel)
         
         if wallet_address:
@@ -258,4 +546,216 @@ async def get_wallet_info_list(
         raise HTTPException(
             status_code=500, 
             detail=f"Error fetching wallet info: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+@router.get(
+    "/stream",
+    summary="거래 정보 스트리밍 조회",
+    description="거래 정보를 서버 측 커서로 읽어 NDJSON 또는 CSV 로 스트리밍합니다 (대량 조회용)",
+    tags=["wallet_info"]
+)
+async def stream_wallet_info(
+    format: str = Query("ndjson", description="응답 형식 (ndjson/csv)", pattern="^(ndjson|csv)$"),
+    wallet_address: Optional[str] = Query(None, description="특정 지갑 주소로 필터링 (선택사항)"),
+    ticker: Optional[str] = Query(None, description="특정 티커로 필터링 (선택사항)"),
+    after_id: Optional[int] = Query(None, description="이 ID 이후의 행만 조회 (끊긴 스트림 이어받기용)"),
+    limit: Optional[int] = Query(None, description="최대 행 수 (선택사항)", ge=1)
+):
+    """
+    거래 정보 스트리밍 조회
+
+    - **format**: 응답 형식 (ndjson: 한 줄에 JSON 하나 / csv: 헤더 포함 CSV)
+    - **wallet_address**: 특정 지갑 주소로 필터링 (선택사항)
+    - **ticker**: 특정 티커로 필터링 (선택사항)
+    - **after_id**: 이 ID 이후의 행만 조회 (선택사항)
+    - **limit**: 최대 행 수 (선택사항, 기본값: 제한 없음)
+
+    결과는 id 순으로 전송되므로 연결이 끊기면 마지막으로 받은 id 를 after_id 로 넘겨 이어받을 수 있습니다.
+    """
+    if wallet_address:
+        try:
+            wallet_address = normalize_wallet_address(wallet_address)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid wallet address format"
+            )
+
+    statement = select(
+        WalletInfoModel.id,
+        WalletInfoModel.wallet_address,
+        WalletInfoModel.ticker,
+        WalletInfoModel.token_id,
+        WalletInfoModel.avg_buyprice,
+        WalletInfoModel.avg_sellprice,
+        WalletInfoModel.current_price,
+        WalletInfoModel.total_buyprice,
+        WalletInfoModel.total_sellprice,
+        WalletInfoModel.loss_rate,
+        WalletInfoModel.loss_amount,
+        WalletInfoModel.user_id,
+        WalletInfoModel.user_uuid,
+        WalletInfoModel.created_at
+    ).order_by(WalletInfoModel.id)
+
+    if wallet_address:
+        statement = statement.where(WalletInfoModel.wallet_address == wallet_address)
+    if ticker:
+        statement = statement.where(WalletInfoModel.ticker == ticker)
+    if after_id is not None:
+        statement = statement.where(WalletInfoModel.id > after_id)
+    if limit:
+        statement = statement.limit(limit)
+
+    return StreamingResponse(
+        iter_rows(statement, format, settings.stream_chunk_size),
+        media_type=STREAM_MEDIA_TYPES[format]
+    )
+
+
+@router.post(
+    "/analyze",
+    response_model=WalletAnalyzeResponse,
+    summary="전송 내역 기반 손익 계산",
+    description="지갑 전송 내역으로 토큰별 손익을 서버에서 계산하고 저장합니다",
+    tags=["wallet_info"]
+)
+async def analyze_wallet(
+    analyze_request: WalletAnalyzeRequest,
+    db: Session = Depends(get_db),
+    price_service: PriceService = Depends(get_price_service)
+):
+    """
+    전송 내역 기반 손익 계산
+
+    - **wallet_address**: 지갑 주소
+    - **method**: 원가 계산 방식 (average/fifo)
+    - **chain**: 과거 가격 조회용 체인 이름 (기본값: eth-mainnet)
+    - **transfers**: 전송 내역 리스트 (price 가 0 이면 거래일 가격을 서버에서 조회)
+    - **current_prices**: 티커별 현재가 (없으면 마지막 거래가 사용)
+
+    클라이언트가 계산한 값을 그대로 받지 않고, 서버에서 계산한 결과를 wallet_info 에 저장합니다.
+    """
+    try:
+        # 지갑 주소 형식 검증 (체크섬 표기로 정규화해서 대소문자만 다른 주소를 같은 지갑으로 처리)
+        try:
+            analyze_request.wallet_address = normalize_wallet_address(analyze_request.wallet_address)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid wallet address format"
+            )
+
+        for transfer in analyze_request.transfers:
+            if transfer.type not in ("buy", "sell"):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Transfer type must be 'buy' or 'sell'"
+                )
+            if transfer.amount < 0 or transfer.price < 0:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Amounts and prices must be non-negative"
+                )
+
+        # 가격이 없는 전송 내역은 (토큰, 날짜) 단위로 묶어서 한 번에 조회
+        unpriced = [transfer for transfer in analyze_request.transfers if transfer.price <= 0]
+        if unpriced:
+            prices = await price_service.get_prices(db, [
+                (transfer.token_address, analyze_request.chain, to_price_date(transfer.timestamp))
+                for transfer in unpriced
+            ])
+            for transfer in unpriced:
+                transfer.price = prices[(
+                    transfer.token_address.lower(),
+                    analyze_request.chain,
+                    to_price_date(transfer.timestamp)
+                )]
+
+        results = calculate_pnl(
+            transfers_to_arrays(analyze_request.transfers),
+            analyze_request.current_prices,
+            analyze_request.method
+        )
+        await wallet_info_buffer.flush_wallet(analyze_request.wallet_address)
+        save_pnl_results(db, analyze_request.wallet_address, results)
+
+        return WalletAnalyzeResponse(
+            wallet_address=analyze_request.wallet_address,
+            method=analyze_request.method,
+            results=results,
+            message="Wallet PnL analyzed successfully"
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error analyzing wallet: {str(e)}"
+        )
+
+
+@router.post(
+    "/analyze/batch",
+    summary="여러 지갑 일괄 손익 계산",
+    description="여러 지갑의 전송 내역을 동시에 수집/분석하고 끝나는 순서대로 NDJSON 으로 스트리밍합니다",
+    tags=["wallet_info"]
+)
+async def analyze_wallet_batch(
+    batch_request: WalletBatchAnalyzeRequest,
+    provider: TransactionProvider = Depends(get_transaction_provider),
+    price_service: PriceService = Depends(get_price_service)
+):
+    """
+    여러 지갑 일괄 손익 계산
+
+    - **wallet_addresses**: 분석할 지갑 주소 리스트
+    - **method**: 원가 계산 방식 (average/fifo)
+    - **chain**: 체인 이름 (기본값: eth-mainnet)
+    - **concurrency**: 동시에 분석할 지갑 수 (기본값: 서버 설정, 서버 설정값을 넘을 수 없음)
+
+    응답은 지갑 하나당 한 줄의 JSON (application/x-ndjson) 이며, 분석이 끝나는 순서대로 전송됩니다.
+    """
+    wallet_addresses = []
+    for wallet_address in batch_request.wallet_addresses:
+        try:
+            wallet_addresses.append(normalize_wallet_address(wallet_address))
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid wallet address format: {wallet_address}"
+            )
+    # 정규화 후 중복 제거 (대소문자만 다른 주소는 한 번만 분석)
+    wallet_addresses = list(dict.fromkeys(wallet_addresses))
+    if not wallet_addresses:
+        raise HTTPException(
+            status_code=400,
+            detail="wallet_addresses must not be empty"
+        )
+
+    if len(wallet_addresses) > settings.batch_analysis_max_wallets:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.batch_analysis_max_wallets} wallets can be analyzed at once"
+        )
+
+    concurrency = min(
+        batch_request.concurrency or settings.batch_analysis_concurrency,
+        settings.batch_analysis_concurrency
+    )
+
+    async def stream_results():
+        async for result in analyze_wallets(
+            wallet_addresses,
+            batch_request.chain,
+            batch_request.method,
+            provider,
+            price_service,
+            concurrency
+        ):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import Field
 
 
@@ -10,12 +10,115 @@ class Settings(BaseSettings):
     postgres_password: str
     postgres_port: int
     database_url: Optional[str] = None
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    money_fixed_point: bool = False  # 금액 컬럼을 1e-8 단위 BIGINT 로 저장 (기존 DB 는 init.sql 의 변환 쿼리 필요)
     
     # Web3 Configuration
     monad_rpc_url: Optional[str] = None
     monad_chain_id: int = Field(default=10143, alias="MONAD_TESTNET_CHAIN_ID")
     private_key: Optional[str] = None
     
+    # Price Provider Configuration
+    price_provider: str = "covalent"          # covalent / fixture
+    covalent_api_key: Optional[str] = None
+    covalent_base_url: str = "https://api.covalenthq.com/v1"
+    price_fixture_path: Optional[str] = None  # fixture 제공자용 JSON 파일 경로
+    price_cache_size: int = 10000             # 메모리 LRU 캐시 크기
+    price_negative_ttl: float = 21600.0       # 가격이 없거나 조회에 실패한 키를 다시 조회하지 않는 시간 (초)
+    
+    # Transaction Ingestion Configuration
+    transaction_provider: str = "covalent"          # covalent / mock
+    transaction_fixture_path: Optional[str] = None  # mock 제공자용 JSON 파일 경로
+    ingestion_batch_size: int = 5000                # COPY 배치 크기
+    
+    # External Provider Rate Limiting (Covalent 무료 플랜 기준 초당 4회)
+    provider_rate_limit: float = 4.0      # 초당 허용 요청 수
+    provider_rate_burst: float = 4.0      # 순간 최대 요청 수
+    provider_max_retries: int = 5         # 429 응답 시 최대 재시도 횟수
+    provider_max_connections: int = 20    # 공유 httpx 클라이언트 연결 수
+    
+    # Token Registry Configuration
+    token_rpc_urls: Dict[str, str] = {}   # 체인별 JSON-RPC URL (JSON, 예: {"eth-mainnet": "https://..."})
+    token_rpc_batch_size: int = 50        # JSON-RPC 배치 1회당 토큰 수
+    rpc_rate_limit: float = 10.0          # 체인 RPC 초당 허용 요청 수
+    rpc_rate_burst: float = 10.0
+    
+    # Batch Analysis Configuration
+    batch_analysis_concurrency: int = 8   # 동시에 분석할 지갑 수
+    batch_analysis_max_wallets: int = 1000
+    
+    # Response Configuration
+    fast_responses: bool = False    # 목록 API 기본 응답 모드 (요청의 fast 파라미터가 우선)
+    compression_enabled: bool = True
+    compression_encodings: str = "zstd,br,gzip"  # 서버 선호 순서 (설치된 라이브러리만 사용)
+    compression_minimum_size: int = 1024         # 이보다 작은 응답은 압축하지 않음
+    compression_offload_size: int = 262144       # 이보다 큰 본문/청크는 스레드풀에서 압축
+    
+    # Admission Control Configuration
+    admission_enabled: bool = True
+    admission_ip_rate: float = 20.0             # IP 별 초당 요청 수
+    admission_ip_burst: float = 40.0
+    admission_wallet_mint_rate: float = 0.2     # 지갑별 초당 민팅 요청 수
+    admission_wallet_mint_burst: float = 3.0
+    admission_read_concurrency: int = 12        # 라우트 종류별 동시 실행 수 (합계가 DB 풀 크기를 넘지 않게)
+    admission_write_concurrency: int = 4
+    admission_mint_concurrency: int = 2
+    admission_max_queue: int = 64               # 라우트 종류별 대기열 길이 (초과 시 503)
+    admission_queue_timeout: float = 2.0        # 대기열 최대 대기 시간 (초)
+    admission_p99_threshold_ms: float = 2000.0  # p99 응답 시간이 이를 넘으면 대기 없이 503 (0 이면 사용 안 함)
+    admission_trust_proxy: bool = False         # X-Forwarded-For 로 클라이언트 IP 판별
+    
+    # Metrics Configuration
+    metrics_enabled: bool = True                    # 요청 메트릭 수집 (/metrics 는 항상 노출)
+    query_tracing_enabled: bool = True              # 요청별 SQL 문/커밋 수 추적
+    server_timing_enabled: bool = True              # 응답에 Server-Timing 헤더 추가
+    query_budget: int = 20                          # 요청당 SQL 문 수가 이를 넘으면 경고 로그
+    query_repeat_threshold: int = 5                 # 같은 형태의 SQL 문이 이 횟수 이상이면 N+1 경고
+    
+    # Health Check Configuration
+    health_refresh_interval: float = 5.0            # 상태 갱신 주기 (초)
+    health_probe_timeout: float = 2.0               # DB/RPC 확인 시간 제한 (초)
+    health_pool_saturation_threshold: float = 0.9   # 커넥션 풀 사용률이 이 이상이면 not ready
+    health_queue_threshold: int = 32                # 수락 제어 대기열이 이 이상이면 not ready
+    health_require_rpc: bool = False                # RPC 장애를 not ready 로 처리
+    
+    # Event Push Configuration (SSE/WebSocket)
+    events_enabled: bool = True                     # Postgres LISTEN/NOTIFY 기반 이벤트 푸시
+    events_max_subscribers: int = 1000              # 워커당 최대 구독자 수 (초과 시 503)
+    events_max_pending: int = 256                   # 구독자별 대기 이벤트 수 (초과 시 버리고 resync 전송)
+    events_coalesce_ms: int = 250                   # 연달아 오는 갱신을 모아서 보내는 시간 (밀리초)
+    events_heartbeat_seconds: float = 15.0          # 이벤트가 없을 때 연결 유지용 하트비트 주기
+    
+    # Write-Behind Configuration (포트폴리오 저장을 메모리에서 합쳐 두었다가 일괄 저장)
+    wallet_write_behind_enabled: bool = False
+    wallet_write_behind_flush_ms: int = 200         # 저장 주기 (밀리초)
+    wallet_write_behind_max_rows: int = 500         # 이만큼 쌓이면 주기를 기다리지 않고 저장
+    wallet_write_behind_max_pending: int = 10000    # 버퍼 최대 키 수 (초과 시 요청에서 바로 저장, 비정상 종료 시 잃을 수 있는 최대 갱신 수)
+    
+    # Scheduler Configuration (작업마다 advisory lock 을 잡은 워커 하나만 실행)
+    scheduler_enabled: bool = True
+    scheduler_election_interval: float = 10.0      # 리더가 없는 작업의 락을 다시 시도하는 주기 (초, 리더 교체 최대 지연)
+    scheduler_jitter: float = 30.0                  # 실행 시각에 더하는 무작위 지연 최대값 (초)
+    sync_catchup_interval: float = 0.0              # 오래된 지갑 전송 내역 이어서 수집 주기 (초, 0 이면 끔)
+    sync_catchup_stale_seconds: float = 3600.0      # 마지막 수집 후 이 시간이 지난 지갑만 수집
+    sync_catchup_batch: int = 50                    # 실행 1회당 수집할 지갑 수
+    export_cron: str = ""                           # Parquet 스냅샷 내보내기 cron (UTC, 예: "0 3 * * *", 비어 있으면 끔)
+    user_totals_verify_interval: float = 300.0      # users.total_loss/total_gain 검증 주기 (초, 0 이면 끔)
+    user_totals_verify_batch: int = 1000            # 실행 1회당 검증할 사용자 수 (id 순으로 돌아가며 확인)
+    
+    # Export Configuration
+    export_dir: str = "exports"                 # Parquet 스냅샷 출력 디렉터리
+    export_batch_size: int = 50000              # 서버 측 커서 배치 크기 (= Parquet row group 크기)
+    stream_chunk_size: int = 1000               # 스트리밍 응답 청크당 행 수
+    export_max_rows_per_file: int = 10000000    # 파일 1개당 최대 행 수 (배치 경계에서 나뉨)
+    
+    # Search Configuration (pg_trgm 인덱스 기반 사용자/티커 검색)
+    search_max_results: int = 200               # 검색 종류별 최대 결과 수 (offset + limit 상한, 후보 정렬 비용 상한)
+    search_cache_size: int = 1024               # 짧은 검색어 결과 메모리 LRU 캐시 크기
+    search_cache_ttl: float = 30.0              # 캐시 유지 시간 (초)
+    search_cache_max_query_length: int = 4      # 이 길이 이하의 검색어만 캐시 (자주 쓰이고 결과가 많은 접두사)
+
     # JWT Configuration (POC에서는 사용하지 않음)
     """
     secret_key: Optional[str] = None
@@ -30,6 +133,12 @@ class Settings(BaseSettings):
     # Server Configuration
     server_host: str
     server_port: int
+    server_workers: int = 0                 # 0 이면 CPU 코어 수 (python -m app.server)
+    server_graceful_timeout: int = 30       # SIGTERM 후 처리 중인 요청을 기다리는 시간 (초)
+    server_worker_timeout: int = 60         # 응답 없는 워커를 재시작하기까지의 시간 (초)
+    server_keepalive: int = 5
+    server_max_requests: int = 0            # 워커당 처리 요청 수가 넘으면 재시작 (0 이면 사용 안 함)
+    server_max_requests_jitter: int = 0
     
     # File Storage
     upload_dir: str
@@ -1,8 +1,8 @@
 from sqlalchemy import create_engine, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 from app.config import settings
+from app.services.instrumentation import TimedQueuePool, instrument_engine
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,17 +11,26 @@ logger = logging.getLogger(__name__)
 if not settings.database_url:
     raise ValueError("DATABASE_URL environment variable is required")
 
+# 동시 요청/배치 분석이 같은 연결을 공유하지 않도록 연결 풀 사용
 engine = create_engine(
     settings.database_url,
-    poolclass=StaticPool,
+    poolclass=TimedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
     pool_pre_ping=True,
     echo=settings.debug
 )
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def reset_engine_after_fork():
+    """fork 된 워커 프로세스에서 호출: 부모에게서 물려받은 연결은 닫지 않고 버리고 워커 전용 풀을 새로 사용"""
+    engine.dispose(close=False)
+
+
 def get_db():
     """데이터베이스 세션 생성"""
     db = SessionLocal()
@@ -34,6 +43,9 @@ def get_db():
 def init_db():
     """데이터베이스 초기화"""
     try:
+        # 검색 인덱스(gin_trgm_ops)에 필요한 확장 먼저 생성
+        with engine.begin() as connection:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         # 테이블 생성
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
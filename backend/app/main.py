@@ -1,8 +1,20 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api.v1.api import api_router
-from app.database import init_db, check_db_connection
+from app.database import init_db
+from app.services.http_client import close_provider_client
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.tracing import QueryTracerMiddleware
+from app.middleware.admission import AdmissionMiddleware, RateLimiter, create_route_classes
+from app.services.health import HealthMonitor
+from app.services.metrics import render_metrics
+from app.services.events import broadcaster
+from app.services.jobs import register_jobs
+from app.services.scheduler import scheduler
+from app.services.write_behind import wallet_info_buffer
 import logging
 
 # 로깅 설정
@@ -24,6 +36,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 설정
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        offload_size=settings.compression_offload_size,
+        encodings=[encoding.strip() for encoding in settings.compression_encodings.split(",")]
+    )
+
+# 요청 수락 제어 (IP 별 속도 제한, 라우트 종류별 동시 실행 제한)
+route_classes = create_route_classes()
+if settings.admission_enabled:
+    app.add_middleware(
+        AdmissionMiddleware,
+        path_prefix=settings.api_v1_str,
+        ip_limiter=RateLimiter(settings.admission_ip_rate, settings.admission_ip_burst),
+        classes=route_classes,
+        trust_proxy=settings.admission_trust_proxy,
+        streaming_paths=(f"{settings.api_v1_str}/events",)
+    )
+
+# 요청별 SQL 왕복 추적 (Server-Timing 헤더, 쿼리 예산/N+1 경고)
+if settings.query_tracing_enabled:
+    app.add_middleware(
+        QueryTracerMiddleware,
+        query_budget=settings.query_budget,
+        repeat_threshold=settings.query_repeat_threshold,
+        server_timing=settings.server_timing_enabled
+    )
+
+# 요청 메트릭 (가장 바깥에서 수락 제어 대기 시간까지 포함해 측정)
+# (이벤트 스트림은 연결 시간이 응답 시간으로 기록되지 않도록 제외, 구독자 수는 별도 게이지)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, exclude_paths=("/metrics", f"{settings.api_v1_str}/events/stream"))
+
+# 서비스 상태 (백그라운드 갱신, 프로브는 캐시된 값만 읽음)
+health_monitor = HealthMonitor(
+    interval=settings.health_refresh_interval,
+    probe_timeout=settings.health_probe_timeout,
+    pool_saturation_threshold=settings.health_pool_saturation_threshold,
+    queue_threshold=settings.health_queue_threshold,
+    require_rpc=settings.health_require_rpc,
+    queue_depth=lambda: sum(limiter.queued for limiter in route_classes.values())
+)
+
 # API 라우터 포함
 app.include_router(api_router, prefix=settings.api_v1_str)
 
@@ -35,6 +92,23 @@ async def startup_event():
         # 데이터베이스 초기화
         init_db()
         logger.info("Database initialized successfully")
+        
+        # 첫 상태를 확인한 뒤 백그라운드 갱신 시작
+        await health_monitor.refresh()
+        health_monitor.start()
+        
+        # 이벤트 푸시 (Postgres LISTEN)
+        if settings.events_enabled:
+            await broadcaster.start()
+        
+        # 포트폴리오 쓰기 지연 버퍼
+        if settings.wallet_write_behind_enabled:
+            wallet_info_buffer.start()
+        
+        # 주기 작업 (워커마다 실행하되 작업별 리더 워커만 실제로 실행)
+        if settings.scheduler_enabled:
+            register_jobs(scheduler)
+            scheduler.start()
         logger.info("Application startup completed")
         
     except Exception as e:
@@ -42,6 +116,17 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """애플리케이션 종료 시 실행"""
+    await health_monitor.stop()
+    await wallet_info_buffer.stop()
+    await scheduler.stop()
+    await broadcaster.stop()
+    await close_provider_client()
+    logger.info("Application shutdown completed")
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -54,16 +139,37 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """헬스 체크 엔드포인트"""
-    db_status = "connected" if check_db_connection() else "disconnected"
+    """헬스 체크 엔드포인트 (마지막으로 갱신된 상태 요약)"""
+    status = health_monitor.snapshot()
+    database = status.get("database", {}).get("status")
     
     return {
-        "status": "healthy",
-        "database": db_status,
-        "timestamp": "2024-01-01T00:00:00Z"
+        "status": "healthy" if status["ready"] else "degraded",
+        "database": "connected" if database == "up" else "disconnected",
+        "timestamp": status["checked_at"]
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 메트릭 엔드포인트"""
+    content, media_type = render_metrics()
+    return Response(content, media_type=media_type)
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness 프로브 (이벤트 루프가 응답하는지만 확인, 외부 의존성 확인 없음)"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness 프로브 (백그라운드에서 갱신된 상태 반환, 준비되지 않았으면 503)"""
+    status = health_monitor.snapshot()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=settings.server_host, port=settings.server_port) 
\ No newline at end of file
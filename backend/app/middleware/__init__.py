@@ -0,0 +1 @@
+# Middleware for Crypto Graves
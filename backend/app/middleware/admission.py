@@ -0,0 +1,254 @@
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Deque, Dict, Optional, Sequence
+from collections import OrderedDict, deque
+from app.config import settings
+from app.services.metrics import (
+    ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_REJECTED, ADMISSION_WAIT_SECONDS
+)
+import asyncio
+import math
+import time
+
+# 제한 없이 통과시키는 메서드 (CORS preflight)
+EXEMPT_METHODS = ("OPTIONS",)
+
+
+class RateLimiter:
+    """키별 토큰 버킷 (대기하지 않고 바로 허용/거부)
+
+    키 수가 max_keys 를 넘으면 가장 오래 사용하지 않은 키부터 버린다.
+    버려진 키는 다음 요청 때 가득 찬 버킷으로 다시 시작한다.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def hit(self, key: str, cost: float = 1.0) -> float:
+        """토큰을 쓰고 0 을 반환, 부족하면 다시 시도할 수 있을 때까지의 초를 반환"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        return (cost - bucket[0]) / self.rate
+
+
+class RouteClassLimiter:
+    """라우트 종류별 동시 실행 수 제한과 대기열
+
+    - 동시 실행 수가 limit 미만이면 바로 실행
+    - 가득 차면 max_queue 까지 queue_timeout 동안 대기, 그 이상은 즉시 거부
+    - 최근 응답 시간의 p99 가 기준을 넘으면 대기열을 쓰지 않고 즉시 거부 (과부하 시 빠른 실패)
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float, p99_threshold: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.p99_threshold = p99_threshold
+        self.queued = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self._p99 = 0.0
+        self._p99_updated = 0.0
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    def p99(self) -> float:
+        """최근 응답 시간의 p99 (초), 1초에 한 번만 다시 계산"""
+        now = time.monotonic()
+        if now - self._p99_updated >= 1.0 and self._latencies:
+            ordered = sorted(self._latencies)
+            self._p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+            self._p99_updated = now
+        return self._p99
+
+    def overloaded(self) -> bool:
+        return self.p99_threshold > 0 and self.p99() > self.p99_threshold
+
+    async def acquire(self) -> Optional[str]:
+        """실행 슬롯 획득, 거부 시 사유 반환"""
+        if not self.semaphore.locked():
+            await self.semaphore.acquire()
+            return None
+
+        if self.overloaded():
+            return "latency"
+        if self.queued >= self.max_queue:
+            return "queue_full"
+
+        self.queued += 1
+        ADMISSION_QUEUED.labels(route_class=self.name).inc()
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return "queue_timeout"
+        finally:
+            self.queued -= 1
+            ADMISSION_QUEUED.labels(route_class=self.name).dec()
+            ADMISSION_WAIT_SECONDS.labels(route_class=self.name).observe(time.monotonic() - started)
+        return None
+
+    def release(self, latency: float):
+        self.semaphore.release()
+        self._latencies.append(latency)
+
+
+class AdmissionMiddleware:
+    """API 요청 수락 제어 미들웨어
+
+    API 경로(settings.api_v1_str) 요청에만 적용되며, /health 등 나머지 경로는 그대로 통과한다.
+    1) 클라이언트 IP 별 토큰 버킷 -> 429 + Retry-After
+    2) 라우트 종류(read/write/mint)별 동시 실행 제한과 대기열 -> 503 + Retry-After
+    요청 처리 중인 동안(스트리밍 응답 포함) 실행 슬롯을 잡고 있으므로, 슬롯 합계를
+    DB 커넥션 풀 크기 이하로 두면 과부하 시에도 풀이 고갈되지 않는다.
+    streaming_paths 로 시작하는 경로(SSE/WebSocket 이벤트 구독)는 연결이 오래 유지되고
+    DB 커넥션을 쓰지 않으므로 IP 속도 제한만 적용한다 (구독자 수는 브로드캐스터가 제한).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefix: str,
+        ip_limiter: RateLimiter,
+        classes: Dict[str, RouteClassLimiter],
+        retry_after: float = 1.0,
+        trust_proxy: bool = False,
+        streaming_paths: Sequence[str] = ()
+    ):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.ip_limiter = ip_limiter
+        self.classes = classes
+        self.retry_after = retry_after
+        self.trust_proxy = trust_proxy
+        self.streaming_paths = tuple(streaming_paths)
+
+    def route_class(self, scope: Scope) -> str:
+        if scope["path"].startswith(f"{self.path_prefix}/mint"):
+            return "mint"
+        if scope["method"] in ("GET", "HEAD"):
+            return "read"
+        return "write"
+
+    def client_ip(self, scope: Scope) -> str:
+        if self.trust_proxy:
+            forwarded = Headers(scope=scope).get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "websocket" and self.streaming_paths and scope["path"].startswith(self.streaming_paths):
+            if self.ip_limiter.hit(self.client_ip(scope)) > 0:
+                ADMISSION_REJECTED.labels(route_class="stream", reason="ip_rate").inc()
+                await send({"type": "websocket.close", "code": 1013})
+                return
+            await self.app(scope, receive, send)
+            return
+
+        if (
+            scope["type"] != "http"
+            or scope["method"] in EXEMPT_METHODS
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        streaming = bool(self.streaming_paths) and scope["path"].startswith(self.streaming_paths)
+        route_class = "stream" if streaming else self.route_class(scope)
+
+        wait = self.ip_limiter.hit(self.client_ip(scope))
+        if wait > 0:
+            ADMISSION_REJECTED.labels(route_class=route_class, reason="ip_rate").inc()
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+            await response(scope, receive, send)
+            return
+
+        if streaming:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.classes[route_class]
+        reason = await limiter.acquire()
+        if reason is not None:
+            ADMISSION_REJECTED.labels(route_class=route_class, reason=reason).inc()
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry later"},
+                status_code=503,
+                headers={"Retry-After": str(math.ceil(self.retry_after))}
+            )
+            await response(scope, receive, send)
+            return
+
+        ADMISSION_IN_FLIGHT.labels(route_class=route_class).inc()
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.monotonic() - started)
+            ADMISSION_IN_FLIGHT.labels(route_class=route_class).dec()
+
+
+def create_route_classes() -> Dict[str, RouteClassLimiter]:
+    """설정값으로 라우트 종류별 제한 생성"""
+    limits = {
+        "read": settings.admission_read_concurrency,
+        "write": settings.admission_write_concurrency,
+        "mint": settings.admission_mint_concurrency,
+    }
+    return {
+        name: RouteClassLimiter(
+            name,
+            limit,
+            settings.admission_max_queue,
+            settings.admission_queue_timeout,
+            settings.admission_p99_threshold_ms / 1000
+        )
+        for name, limit in limits.items()
+    }
+
+
+# 지갑별 민팅 요청 제한 (요청 본문을 파싱한 뒤 엔드포인트에서 확인)
+wallet_mint_limiter = RateLimiter(settings.admission_wallet_mint_rate, settings.admission_wallet_mint_burst)
+
+
+def check_wallet_rate(wallet_address: str):
+    """지갑별 민팅 요청 속도 확인, 초과 시 429 (Retry-After 포함)"""
+    if not settings.admission_enabled:
+        return
+    wait = wallet_mint_limiter.hit(wallet_address.lower())
+    if wait > 0:
+        ADMISSION_REJECTED.labels(route_class="mint", reason="wallet_rate").inc()
+        raise HTTPException(
+            status_code=429,
+            detail="Too many mint requests for this wallet",
+            headers={"Retry-After": str(math.ceil(wait))}
+        )
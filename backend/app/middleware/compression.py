@@ -0,0 +1,268 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Callable, Dict, Optional, Sequence
+from app.services.metrics import (
+    COMPRESSION_CPU_SECONDS, COMPRESSION_INPUT_BYTES, COMPRESSION_OUTPUT_BYTES,
+    COMPRESSION_RATIO, COMPRESSION_SKIPPED
+)
+import anyio
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:  # 설치되어 있지 않으면 br 협상에서 제외
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # 설치되어 있지 않으면 zstd 협상에서 제외
+    zstandard = None
+
+# 압축하는 Content-Type (나머지는 이미 압축되었거나 바이너리이므로 그대로 전송)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+# text/* 중 압축하면 안 되는 형식 (SSE 는 이벤트 단위 즉시 전달이 중요)
+UNCOMPRESSIBLE_TYPES = (
+    "text/event-stream",
+)
+
+
+class _Compressor:
+    """인코딩별 스트리밍 압축기 공통 인터페이스"""
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        """data 를 압축 (flush 면 지금까지의 입력을 바로 디코딩 가능하게 출력)"""
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        raise NotImplementedError
+
+
+class _GzipCompressor(_Compressor):
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data, flush):
+        output = self._obj.compress(data)
+        return output + self._obj.flush(zlib.Z_SYNC_FLUSH) if flush else output
+
+    def finish(self):
+        return self._obj.flush()
+
+
+class _BrotliCompressor(_Compressor):
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data, flush):
+        output = self._obj.process(data)
+        return output + self._obj.flush() if flush else output
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class _ZstdCompressor(_Compressor):
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data, flush):
+        output = self._obj.compress(data)
+        return output + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else output
+
+    def finish(self):
+        return self._obj.flush()
+
+
+def available_encodings() -> Dict[str, Callable[[int], _Compressor]]:
+    """설치된 라이브러리 기준으로 사용할 수 있는 인코딩"""
+    encodings: Dict[str, Callable[[int], _Compressor]] = {}
+    if zstandard is not None:
+        encodings["zstd"] = _ZstdCompressor
+    if brotli is not None:
+        encodings["br"] = _BrotliCompressor
+    encodings["gzip"] = _GzipCompressor
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, preferred: Sequence[str]) -> Optional[str]:
+    """Accept-Encoding 의 q 값이 가장 높은 인코딩 선택 (같으면 preferred 순서)"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[token] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in preferred:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if content_type.startswith(UNCOMPRESSIBLE_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+class CompressionMiddleware:
+    """Accept-Encoding 협상 기반 응답 압축 미들웨어 (zstd / br / gzip)
+
+    - minimum_size 보다 작은 단일 응답, 이미 인코딩된 응답, 바이너리 응답은 그대로 보낸다.
+    - 스트리밍 응답(NDJSON/CSV 등 텍스트)은 청크마다 flush 하며 압축해 첫 바이트 지연을 늘리지 않는다.
+    - offload_size 이상의 본문/청크는 스레드풀에서 압축해 이벤트 루프를 막지 않는다.
+    - 인코딩별 입력/출력 바이트, 압축률, CPU 시간을 메트릭으로 기록한다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 256 * 1024,
+        encodings: Sequence[str] = ("zstd", "br", "gzip"),
+        levels: Optional[Dict[str, int]] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.factories = available_encodings()
+        self.encodings = [encoding for encoding in encodings if encoding in self.factories]
+        self.levels = {"zstd": 3, "br": 4, "gzip": 6, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """응답 1개의 압축 상태"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def _skip(self, reason: str):
+        self.passthrough = True
+        COMPRESSION_SKIPPED.labels(reason=reason).inc()
+
+    async def _compress(self, data: bytes, flush: bool, finish: bool) -> bytes:
+        def run() -> bytes:
+            started = time.thread_time()
+            output = self.compressor.compress(data, flush) if data else b""
+            if finish:
+                output += self.compressor.finish()
+            self.cpu_seconds += time.thread_time() - started
+            return output
+
+        self.bytes_in += len(data)
+        if len(data) >= self.middleware.offload_size:
+            output = await anyio.to_thread.run_sync(run)
+        else:
+            output = run()
+        self.bytes_out += len(output)
+        return output
+
+    def _record(self):
+        COMPRESSION_INPUT_BYTES.labels(encoding=self.encoding).inc(self.bytes_in)
+        COMPRESSION_OUTPUT_BYTES.labels(encoding=self.encoding).inc(self.bytes_out)
+        COMPRESSION_CPU_SECONDS.labels(encoding=self.encoding).inc(self.cpu_seconds)
+        if self.bytes_in:
+            COMPRESSION_RATIO.labels(encoding=self.encoding).observe(self.bytes_out / self.bytes_in)
+
+    def _start_compressed(self, content_length: Optional[int]):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            if "content-encoding" in headers:
+                self._skip("encoded")
+            elif not is_compressible(headers.get("content-type", "")):
+                self._skip("content_type")
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self._send(self.start_message)
+                self.start_message = None
+            await self._send(message)
+            return
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                # 작은 단일 응답은 압축 이득보다 비용이 큼
+                self._skip("small")
+                await self._send(self.start_message)
+                self.start_message = None
+                await self._send(message)
+                return
+
+            self.compressor = self.middleware.factories[self.encoding](self.middleware.levels[self.encoding])
+            if not more_body:
+                output = await self._compress(body, flush=False, finish=True)
+                self._start_compressed(len(output))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": output})
+                self._record()
+                return
+
+            # 스트리밍 응답: 길이를 알 수 없으므로 Content-Length 제거 후 청크 단위 압축
+            self._start_compressed(None)
+            await self._send(self.start_message)
+            self.start_message = None
+
+        output = await self._compress(body, flush=more_body, finish=not more_body)
+        await self._send({"type": "http.response.body", "body": output, "more_body": more_body})
+        if not more_body:
+            self._record()
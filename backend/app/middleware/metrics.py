@@ -0,0 +1,49 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.instrumentation import start_request_stats
+from app.services.metrics import (
+    DB_QUERIES_PER_REQUEST, DB_SECONDS_PER_REQUEST, HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+)
+import time
+
+
+def route_label(scope: Scope) -> str:
+    """메트릭 라벨용 라우트 경로 템플릿 (경로 파라미터 값 대신 {param} 형태)
+
+    라우터에 도달하지 못한 요청(404, 수락 제어에서 거부된 요청 등)은 "unmatched" 로 묶는다.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """요청 수, 처리 시간, 요청당 DB 사용량을 Prometheus 메트릭으로 기록하는 미들웨어"""
+
+    def __init__(self, app: ASGIApp, exclude_paths=("/metrics",)):
+        self.app = app
+        self.exclude_paths = tuple(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = start_request_stats()
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = route_label(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method=method, route=route, status=str(status)).inc()
+            HTTP_REQUEST_SECONDS.labels(method=method, route=route).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route=route).observe(stats.queries)
+            DB_SECONDS_PER_REQUEST.labels(route=route).observe(stats.db_seconds)
@@ -0,0 +1,55 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.middleware.metrics import route_label
+from app.services.instrumentation import current_request_stats, start_request_stats
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTracerMiddleware:
+    """요청별 SQL 왕복 추적 미들웨어
+
+    - 응답 헤더에 Server-Timing (SQL 문 수, 커밋 수, DB 시간, 풀 대기 시간) 추가
+      (스트리밍 응답은 응답 시작 시점까지의 값)
+    - SQL 문 수가 query_budget 을 넘거나, 같은 형태의 문이 repeat_threshold 번 이상 실행되면 (N+1 의심) 경고 로그
+    MetricsMiddleware 안쪽에 두면 같은 요청 통계를 함께 사용한다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        query_budget: int = 20,
+        repeat_threshold: int = 5,
+        server_timing: bool = True
+    ):
+        self.app = app
+        self.query_budget = query_budget
+        self.repeat_threshold = repeat_threshold
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = current_request_stats() or start_request_stats()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            repeated = stats.repeated(self.repeat_threshold)
+            if stats.queries > self.query_budget or repeated:
+                route = route_label(scope)
+                logger.warning(
+                    f"{scope['method']} {route}: {stats.queries} queries, {stats.commits} commits, "
+                    f"{stats.db_seconds * 1000:.1f}ms in DB (budget {self.query_budget})"
+                )
+                for statement, count in repeated:
+                    logger.warning(f"{scope['method']} {route}: possible N+1, {count}x {statement}")
@@ -1,12 +1,21 @@
 # Data models for Crypto Graves
 # 이 패키지는 Crypto Graves 프로젝트의 모든 데이터 모델을 포함합니다.
 
+from .address import WalletAddress, normalize_wallet_address
 from .user import UserModel, User, UserCreate, UserUpdate, UserRole
 from .loss import LossModel, Loss, LossCreate, LossUpdate, LossStatus
+from .token import TokenModel, Token
 from .wallet_info import WalletInfoModel, WalletInfo, WalletInfoCreate, WalletInfoUpdate
+from .token_price import TokenPriceModel, TokenPrice
+from .transfer import TransferModel, Transfer, WalletSyncStateModel, WalletSyncState
+from .pnl_position import PnLPositionModel, PnLPosition
 
 # 외부에서 import할 수 있는 모델들
 __all__ = [
+    # 지갑 주소 타입
+    "WalletAddress",             # SQLAlchemy 지갑 주소 컬럼 타입 (20바이트 저장, 체크섬 표기로 조회)
+    "normalize_wallet_address",  # API 입력 지갑 주소 -> 체크섬 표기 정규화
+    
     # User 관련 모델들
     "UserModel",      # SQLAlchemy 사용자 모델 (데이터베이스 테이블과 매핑)
     "User",           # Pydantic 사용자 응답 모델 (API 응답용)
@@ -26,4 +35,22 @@ __all__ = [
     "WalletInfo",        # Pydantic 지갑 정보 응답 모델 (API 응답용)
     "WalletInfoCreate",  # Pydantic 지갑 정보 생성 모델 (API 요청용)
     "WalletInfoUpdate",  # Pydantic 지갑 정보 업데이트 모델 (API 요청용)
+    
+    # Token 관련 모델들
+    "TokenModel",        # SQLAlchemy 토큰 레지스트리 모델 (체인/컨트랙트 주소별 메타데이터)
+    "Token",             # Pydantic 토큰 메타데이터 응답 모델
+    
+    # TokenPrice 관련 모델들
+    "TokenPriceModel",   # SQLAlchemy 토큰 일별 가격 캐시 모델
+    "TokenPrice",        # Pydantic 토큰 일별 가격 응답 모델
+    
+    # Transfer 관련 모델들
+    "TransferModel",         # SQLAlchemy 지갑 전송 내역 모델
+    "Transfer",              # Pydantic 전송 내역 응답 모델
+    "WalletSyncStateModel",  # SQLAlchemy 지갑 수집 체크포인트 모델
+    "WalletSyncState",       # Pydantic 지갑 수집 체크포인트 응답 모델
+    
+    # PnLPosition 관련 모델들
+    "PnLPositionModel",  # SQLAlchemy 지갑/티커별 누적 손익 집계 모델
+    "PnLPosition",       # Pydantic 누적 손익 집계 응답 모델
 ] 
\ No newline at end of file
@@ -0,0 +1,56 @@
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+from eth_utils import to_checksum_address
+from functools import lru_cache
+from typing import Optional, Union
+
+# 지갑 주소 바이트 길이 (0x 제외 hex 40자)
+ADDRESS_BYTES = 20
+
+
+def address_to_bytes(value: Union[str, bytes]) -> bytes:
+    """지갑 주소 -> 20바이트 (대소문자/0x 접두사 무관, 형식이 틀리면 ValueError)"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        raw = bytes(value)
+    else:
+        text = value.strip()
+        if text[:2] not in ("0x", "0X") or len(text) != 2 + ADDRESS_BYTES * 2:
+            raise ValueError(f"Invalid wallet address: {value!r}")
+        raw = bytes.fromhex(text[2:])
+    if len(raw) != ADDRESS_BYTES:
+        raise ValueError(f"Invalid wallet address: {value!r}")
+    return raw
+
+
+@lru_cache(maxsize=65536)
+def checksum_address(raw: bytes) -> str:
+    """20바이트 주소 -> EIP-55 체크섬 표기 (keccak 계산 결과 캐시)"""
+    return to_checksum_address(raw)
+
+
+def normalize_wallet_address(value: str) -> str:
+    """API 경계에서 받은 지갑 주소를 표시용 체크섬 표기로 정규화 (형식이 틀리면 ValueError)"""
+    return checksum_address(address_to_bytes(value))
+
+
+class WalletAddress(TypeDecorator):
+    """지갑 주소 컬럼 타입
+
+    DB 에는 20바이트 BYTEA 로 저장하고(VARCHAR(42) 대비 인덱스 크기 절반),
+    파이썬에서는 체크섬 표기 문자열로 다룬다.
+    바인딩할 때 대소문자와 관계없이 같은 바이트로 변환되므로
+    `Model.wallet_address == "0xabc..."` 비교는 어떤 표기로 들어와도 같은 행을 찾는다.
+    """
+
+    impl = LargeBinary(ADDRESS_BYTES)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return address_to_bytes(value)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return checksum_address(bytes(value))
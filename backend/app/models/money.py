@@ -0,0 +1,119 @@
+from sqlalchemy import BigInteger, Numeric, cast, func, type_coerce
+from sqlalchemy.types import TypeDecorator, TypeEngine
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional, Union
+from app.config import settings
+import re
+
+# 고정소수점 단위 (1 = 1e-8, Numeric(20, 8) 과 같은 정밀도)
+SCALE = 100_000_000
+SCALE_DIGITS = 8
+# Numeric(20, 8) 이 담을 수 있는 최대 단위 수
+MAX_UNITS = 10 ** 20 - 1
+# BIGINT 로 저장할 때의 최대 단위 수 (약 920억)
+MAX_BIGINT_UNITS = 2 ** 63 - 1
+
+_AMOUNT = re.compile(r"\s*([+-]?)(\d*)(?:\.(\d*))?(?:[eE]([+-]?\d{1,3}))?\s*\Z")
+
+
+def parse_units(value: str) -> int:
+    """금액 문자열 -> 1e-8 단위 정수 (float 를 거치지 않음, 형식이 틀리면 ValueError)
+
+    "12.5", ".5", "1e-7" (JS 의 작은 수 표기) 형식을 받고,
+    소수점 9자리부터는 Numeric 과 같이 반올림(0.5 는 0 에서 멀어지는 방향)한다.
+    """
+    match = _AMOUNT.match(value)
+    if not match or not (match.group(2) or match.group(3)):
+        raise ValueError(f"Invalid amount: {value!r}")
+    sign, whole, fraction, exponent = match.groups()
+    fraction = fraction or ""
+    digits = (whole + fraction).lstrip("0") or "0"
+    # units = int(digits) * 10 ** shift
+    shift = int(exponent or 0) - len(fraction) + SCALE_DIGITS
+
+    if shift >= 0:
+        if len(digits) + shift > 21 and digits != "0":
+            raise ValueError(f"Amount out of range: {value!r}")
+        units = int(digits) * 10 ** shift
+    else:
+        kept = digits[:shift]
+        units = int(kept) if kept else 0
+        if len(digits) >= -shift and digits[shift] >= "5":
+            units += 1
+
+    if units > MAX_UNITS:
+        raise ValueError(f"Amount out of range: {value!r}")
+    return -units if sign == "-" else units
+
+
+def units_to_decimal(units: int) -> Decimal:
+    """1e-8 단위 정수 -> Decimal (Numeric(20, 8) 조회 결과와 같은 값/자릿수)"""
+    return Decimal(units).scaleb(-SCALE_DIGITS)
+
+
+def decimal_to_units(value: Union[Decimal, int, float, str]) -> int:
+    """금액 -> 1e-8 단위 정수 (float 는 기존 관례대로 str 을 거쳐 변환)"""
+    if isinstance(value, str):
+        return parse_units(value)
+    if isinstance(value, float):
+        value = Decimal(str(value))
+    return int(Decimal(value).scaleb(SCALE_DIGITS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def float_to_units(value: Union[float, Decimal]) -> int:
+    """계산 결과(float/Decimal) -> 1e-8 단위 정수
+
+    str 을 거치지 않고 float 의 정확한 2진 값에서 소수점 8자리로 한 번만 반올림한다.
+    """
+    units = int(Decimal(value).quantize(Decimal(1).scaleb(-SCALE_DIGITS), rounding=ROUND_HALF_UP).scaleb(SCALE_DIGITS))
+    if abs(units) > MAX_UNITS:
+        raise ValueError(f"Amount out of range: {value!r}")
+    return units
+
+
+def parse_amount(value: str) -> Decimal:
+    """API 로 받은 금액 문자열 -> 소수점 8자리 Decimal (float 변환 없이 정확한 값)"""
+    return units_to_decimal(parse_units(value))
+
+
+class Fixed8(TypeDecorator):
+    """금액 컬럼 타입 (고정소수점 모드)
+
+    DB 에는 1e-8 단위 BIGINT 로 저장해서 합계/비교를 정수 연산으로 처리하고,
+    파이썬에서는 Numeric(20, 8) 과 같은 Decimal 로 다룬다.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        units = decimal_to_units(value)
+        if abs(units) > MAX_BIGINT_UNITS:
+            raise ValueError(f"Amount out of range for fixed-point storage: {value!r}")
+        return units
+
+    def process_result_value(self, value, dialect) -> Optional[Decimal]:
+        if value is None:
+            return None
+        return units_to_decimal(value)
+
+
+def money_type() -> TypeEngine:
+    """금액 컬럼 타입 (MONEY_FIXED_POINT 설정에 따라 BIGINT 고정소수점 또는 Numeric(20, 8))"""
+    if settings.money_fixed_point:
+        return Fixed8()
+    return Numeric(20, 8)
+
+
+def money_units(column):
+    """금액 컬럼 -> 1e-8 단위 BIGINT SQL 식 (고정소수점 모드에서는 변환 없이 저장값 그대로)"""
+    if isinstance(column.type, Fixed8):
+        return type_coerce(column, BigInteger)
+    return cast(func.round(column * SCALE), BigInteger)
+
+
+def money_scale() -> int:
+    """원시 SQL 로 금액을 넣을 때 곱할 값 (고정소수점 모드면 SCALE, 아니면 1)"""
+    return SCALE if settings.money_fixed_point else 1
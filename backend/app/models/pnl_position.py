@@ -0,0 +1,84 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, CheckConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.address import WalletAddress
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+# SQLAlchemy ORM Model
+class PnLPositionModel(Base):
+    """지갑/토큰별 누적 손익 집계 테이블 모델
+
+    새 전송이 들어올 때마다 상수 시간에 갱신되므로 전체 내역을 다시 계산하지 않아도 된다.
+    """
+    __tablename__ = "pnl_positions"
+    __table_args__ = (
+        UniqueConstraint("wallet_address", "chain", "token_address", name="uq_pnl_positions_wallet_chain_token"),
+        CheckConstraint("octet_length(wallet_address) = 20", name="ck_pnl_positions_wallet_address_length"),
+    )
+
+    # 기본 식별자
+    id = Column(Integer, primary_key=True, index=True)
+
+    # 집계 키 (지갑 주소는 20바이트, 토큰 주소는 소문자, 같은 심볼의 다른 토큰은 별도 집계)
+    wallet_address = Column(WalletAddress, nullable=False, index=True)
+    chain = Column(String(50), nullable=False)
+    token_address = Column(String(42), nullable=False)
+    token_id = Column(Integer, ForeignKey("tokens.id"), nullable=True, index=True)  # 토큰 레지스트리 ID
+    ticker = Column(String(20), nullable=False)
+
+    # 누적 매수/매도
+    bought_qty = Column(Float, nullable=False, default=0.0)        # 총 매수 수량
+    bought_cost = Column(Float, nullable=False, default=0.0)       # 총 매수 금액
+    sold_qty = Column(Float, nullable=False, default=0.0)          # 총 매도 수량 (보유량 초과분 제외)
+    sold_proceeds = Column(Float, nullable=False, default=0.0)     # 총 매도 금액
+
+    # 보유 현황
+    balance = Column(Float, nullable=False, default=0.0)           # 현재 보유량
+    last_price = Column(Float, nullable=False, default=0.0)        # 마지막 거래 가격
+
+    # 이동평균법 상태
+    avg_cost_basis = Column(Float, nullable=False, default=0.0)    # 보유분 원가 (이동평균)
+    avg_realized_pnl = Column(Float, nullable=False, default=0.0)  # 실현 손익 (이동평균)
+
+    # 선입선출법 상태
+    fifo_lots = Column(JSONB, nullable=False, default=list)        # 남은 매수 lot [[수량, 가격], ...]
+    fifo_cost_basis = Column(Float, nullable=False, default=0.0)   # 보유분 원가 (선입선출)
+    fifo_realized_pnl = Column(Float, nullable=False, default=0.0) # 실현 손익 (선입선출)
+
+    # 마지막 반영 위치
+    last_block = Column(BigInteger, nullable=False, default=0)
+    last_trade_at = Column(DateTime(timezone=True), nullable=True)
+
+    # 타임스탬프
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Pydantic Models
+class PnLPosition(BaseModel):
+    """지갑/토큰별 누적 손익 집계 응답 모델"""
+    wallet_address: str
+    chain: str
+    token_address: str
+    token_id: Optional[int] = None
+    ticker: str
+    bought_qty: float = 0.0
+    bought_cost: float = 0.0
+    sold_qty: float = 0.0
+    sold_proceeds: float = 0.0
+    balance: float = 0.0
+    last_price: float = 0.0
+    avg_cost_basis: float = 0.0
+    avg_realized_pnl: float = 0.0
+    fifo_lots: List[List[float]] = Field(default_factory=list, description="남은 매수 lot [[수량, 가격], ...]")
+    fifo_cost_basis: float = 0.0
+    fifo_realized_pnl: float = 0.0
+    last_block: int = 0
+    last_trade_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
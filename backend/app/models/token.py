@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+# SQLAlchemy ORM Model
+class TokenModel(Base):
+    """토큰 레지스트리 테이블 모델 ((체인, 컨트랙트 주소) 기준 메타데이터)"""
+    __tablename__ = "tokens"
+    __table_args__ = (
+        UniqueConstraint("chain", "address", name="uq_tokens_chain_address"),
+    )
+
+    # 기본 식별자
+    id = Column(Integer, primary_key=True, index=True)
+
+    # 토큰 키 (주소는 소문자로 저장)
+    chain = Column(String(50), nullable=False)  # 체인 이름 (예: eth-mainnet)
+    address = Column(String(42), nullable=False)  # 컨트랙트 주소
+
+    # 토큰 메타데이터
+    symbol = Column(String(20), nullable=False)  # 토큰 심볼 (예: USDC)
+    name = Column(String(100), nullable=True)  # 토큰 이름
+    decimals = Column(SmallInteger, nullable=False)  # 소수점 자리수
+    source = Column(String(20), nullable=False)  # 메타데이터 출처 (rpc/covalent/native)
+
+    # 타임스탬프
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Pydantic Models
+class Token(BaseModel):
+    """토큰 메타데이터 응답 모델"""
+    id: Optional[int] = None
+    chain: str = Field(..., description="체인 이름")
+    address: str = Field(..., description="컨트랙트 주소 (소문자)")
+    symbol: str = Field(..., description="토큰 심볼")
+    name: Optional[str] = Field(None, description="토큰 이름")
+    decimals: int = Field(..., description="소수점 자리수")
+    source: str = Field(..., description="메타데이터 출처")
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Numeric, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import date, datetime
+
+
+# SQLAlchemy ORM Model
+class TokenPriceModel(Base):
+    """토큰 일별 가격 캐시 테이블 모델"""
+    __tablename__ = "token_prices"
+    __table_args__ = (
+        UniqueConstraint("token_address", "chain", "price_date", name="uq_token_prices_token_chain_date"),
+    )
+
+    # 기본 식별자
+    id = Column(Integer, primary_key=True, index=True)
+
+    # 가격 키 (토큰 주소는 소문자로 저장)
+    token_address = Column(String(42), nullable=False)  # 토큰 컨트랙트 주소
+    chain = Column(String(50), nullable=False)  # 체인 이름 (예: eth-mainnet)
+    price_date = Column(Date, nullable=False)  # 가격 기준일
+
+    # 가격 정보
+    price = Column(Numeric(38, 18), nullable=True)  # USD 가격 (NULL 이면 제공자에 가격이 없음, created_at 기준으로 일정 시간 재조회 안 함)
+    source = Column(String(50), nullable=True)  # 가격 제공자
+
+    # 타임스탬프
+    created_at = Column(DateTime(timezone=True), server_default=func.now())  # 저장(가격 없음 기록은 마지막 확인) 시간
+
+
+# Pydantic Models
+class TokenPrice(BaseModel):
+    """토큰 일별 가격 응답 모델"""
+    token_address: str = Field(..., description="토큰 컨트랙트 주소")
+    chain: str = Field(..., description="체인 이름")
+    price_date: date = Field(..., description="가격 기준일")
+    price: Optional[float] = Field(None, description="USD 가격 (없으면 null)")
+    source: Optional[str] = Field(None, description="가격 제공자")
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
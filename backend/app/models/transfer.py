@@ -0,0 +1,86 @@
+from sqlalchemy import Column, BigInteger, Integer, SmallInteger, String, DateTime, Numeric, UniqueConstraint, Index, CheckConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.address import WalletAddress
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+
+# SQLAlchemy ORM Model
+class TransferModel(Base):
+    """지갑 전송 내역 테이블 모델 (네이티브/ERC20 전송을 정규화해서 저장)"""
+    __tablename__ = "transfers"
+    __table_args__ = (
+        UniqueConstraint("wallet_address", "chain", "tx_hash", "log_index", name="uq_transfers_wallet_tx_log"),
+        Index("idx_transfers_wallet_chain_block", "wallet_address", "chain", "block_number"),
+        CheckConstraint("octet_length(wallet_address) = 20", name="ck_transfers_wallet_address_length"),
+    )
+
+    # 기본 식별자
+    id = Column(BigInteger, primary_key=True)
+
+    # 지갑/체인 정보
+    wallet_address = Column(WalletAddress, nullable=False)  # 20바이트, 조회 시 체크섬 표기
+    chain = Column(String(50), nullable=False)
+
+    # 블록체인 정보
+    block_number = Column(BigInteger, nullable=False)
+    block_signed_at = Column(DateTime(timezone=True), nullable=False)
+    tx_hash = Column(String(66), nullable=False)
+    log_index = Column(Integer, nullable=False)  # 네이티브 전송은 -1
+
+    # 자산 정보
+    token_address = Column(String(42), nullable=False)
+    ticker = Column(String(20), nullable=False)
+    decimals = Column(SmallInteger, nullable=False)
+
+    # 전송 정보
+    direction = Column(SmallInteger, nullable=False)  # +1 입금(매수) / -1 출금(매도)
+    amount = Column(Numeric(38, 18), nullable=False)  # decimals 적용된 수량
+
+    # 타임스탬프
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class WalletSyncStateModel(Base):
+    """지갑별 전송 내역 수집 체크포인트 테이블 모델"""
+    __tablename__ = "wallet_sync_state"
+    __table_args__ = (
+        CheckConstraint("octet_length(wallet_address) = 20", name="ck_wallet_sync_state_wallet_address_length"),
+    )
+
+    wallet_address = Column(WalletAddress, primary_key=True)  # 20바이트, 조회 시 체크섬 표기
+    chain = Column(String(50), primary_key=True)
+    last_block = Column(BigInteger, nullable=False, default=0)  # 마지막으로 수집한 블록 번호
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Pydantic Models
+class Transfer(BaseModel):
+    """전송 내역 응답 모델"""
+    wallet_address: str
+    chain: str
+    block_number: int
+    block_signed_at: datetime
+    tx_hash: str
+    log_index: int
+    token_address: str
+    ticker: str
+    decimals: int
+    direction: int = Field(..., description="+1 입금(매수) / -1 출금(매도)")
+    amount: float
+
+    class Config:
+        from_attributes = True
+
+
+class WalletSyncState(BaseModel):
+    """지갑 수집 체크포인트 응답 모델"""
+    wallet_address: str
+    chain: str
+    last_block: int
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
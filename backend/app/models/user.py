@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Numeric, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.address import WalletAddress
+from app.models.money import money_type
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
@@ -21,13 +23,22 @@ class UserRole(str, Enum):
 class UserModel(Base):
     """사용자 정보 테이블 모델"""
     __tablename__ = "users"
+    __table_args__ = (
+        CheckConstraint("octet_length(wallet_address) = 20", name="ck_users_wallet_address_length"),
+        # 검색용: 사용자명/지갑 주소(hex) 부분 일치는 pg_trgm GIN,
+        # 사용자명 접두사는 C 정렬 B-tree 로 범위 검색 + 정렬된 순서로 LIMIT 까지만 읽기
+        Index("idx_users_username_trgm", text("lower(username) gin_trgm_ops"), postgresql_using="gin"),
+        Index("idx_users_wallet_address_trgm", text("encode(wallet_address, 'hex') gin_trgm_ops"),
+              postgresql_using="gin"),
+        Index("idx_users_username_prefix", text('lower(username) COLLATE "C"')),
+    )
     
     # 기본 식별자
     id = Column(Integer, primary_key=True, index=True)                    # 사용자 고유 ID (자동 증가)
     uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False, index=True)  # 보안용 UUID
     
     # 지갑 정보
-    wallet_address = Column(String(42), unique=True, nullable=False, index=True)  # 이더리움 지갑 주소
+    wallet_address = Column(WalletAddress, unique=True, nullable=False, index=True)  # 이더리움 지갑 주소 (20바이트, 조회 시 체크섬 표기)
     
     # 사용자 정보
     username = Column(String(100), nullable=True)                        # 사용자명 (선택사항)
@@ -35,8 +46,8 @@ class UserModel(Base):
     role = Column(String(20), default=UserRole.USER.value)              # 사용자 역할 (user/admin/moderator)
     
     # 손익 정보
-    total_loss = Column(Numeric(20, 8), default=0.0)                    # 총 손실 금액 (MON 기준, 소수점 8자리)
-    total_gain = Column(Numeric(20, 8), default=0.0)                    # 총 수익 금액 (MON 기준, 소수점 8자리)
+    total_loss = Column(money_type(), default=0.0)                      # 총 손실 금액 (MON 기준, 소수점 8자리)
+    total_gain = Column(money_type(), default=0.0)                      # 총 수익 금액 (MON 기준, 소수점 8자리)
     
     # 프로필 정보
     profile_image_url = Column(Text, nullable=True)                      # 프로필 이미지 URL
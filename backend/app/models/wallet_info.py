@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, CheckConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, relationship
 from app.database import Base
+from app.models.address import WalletAddress
+from app.models.money import money_type
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
@@ -13,6 +15,14 @@ import uuid
 class WalletInfoModel(Base):
     """지갑 정보 테이블 모델"""
     __tablename__ = "wallet_info"
+    __table_args__ = (
+        # 레지스트리에 등록된 토큰은 token_id 로, 수동 입력 행은 티커로 지갑 내 유일성 보장
+        Index("uq_wallet_info_wallet_token", "wallet_address", "token_id", unique=True,
+              postgresql_where=text("token_id IS NOT NULL")),
+        Index("uq_wallet_info_wallet_ticker", "wallet_address", "ticker", unique=True,
+              postgresql_where=text("token_id IS NULL")),
+        CheckConstraint("octet_length(wallet_address) = 20", name="ck_wallet_info_wallet_address_length"),
+    )
     
     # 기본 식별자
     id = Column(Integer, primary_key=True, index=True)
@@ -23,21 +33,24 @@ class WalletInfoModel(Base):
     user_uuid = Column(UUID(as_uuid=True), nullable=False, index=True)
     
     # 지갑 정보
-    wallet_address = Column(String(42), nullable=False, index=True)
+    wallet_address = Column(WalletAddress, nullable=False, index=True)  # 20바이트, 조회 시 체크섬 표기
     
     # 자산 정보
-    ticker = Column(String(10), nullable=False, index=True)  # 자산 티커
+    ticker = Column(String(20), nullable=False, index=True)  # 자산 티커 (레지스트리 심볼과 같은 최대 20자)
+    token_id = Column(Integer, ForeignKey("tokens.id"), nullable=True, index=True)  # 토큰 레지스트리 ID (같은 심볼 구분용)
     
     # 거래 정보
-    avg_buyprice = Column(Numeric(20, 8), default=0.0, nullable=False)  # 평균 매수가
-    avg_sellprice = Column(Numeric(20, 8), default=0.0, nullable=False)  # 평균 매도가
-    current_price = Column(Numeric(20, 8), default=0.0, nullable=False)  # 현재가
-    total_buyprice = Column(Numeric(20, 8), default=0.0, nullable=False)  # 총 매수금액
-    total_sellprice = Column(Numeric(20, 8), default=0.0, nullable=False)  # 총 매도금액
+    avg_buyprice = Column(money_type(), default=0.0, nullable=False)  # 평균 매수가
+    avg_sellprice = Column(money_type(), default=0.0, nullable=False)  # 평균 매도가
+    current_price = Column(money_type(), default=0.0, nullable=False)  # 현재가
+    total_buyprice = Column(money_type(), default=0.0, nullable=False)  # 총 매수금액
+    total_sellprice = Column(money_type(), default=0.0, nullable=False)  # 총 매도금액
     
     # 손실 정보 (자동 계산됨)
     loss_rate = Column(Float, nullable=False, default=0.0)  # 손실률 (퍼센트)
-    loss_amount = Column(Numeric(20, 8), default=0.0, nullable=False)  # 손실 금액 (MON 기준)
+    # users.total_loss / total_gain 에 변경분을 반영하려면 이전 값이 필요하므로, 만료된 객체에 값을 넣을 때도 이전 값을 읽어 둔다
+    loss_amount = column_property(Column(money_type(), default=0.0, nullable=False), active_history=True)  # 손실 금액 (MON 기준)
+    gain_amount = column_property(Column(money_type(), default=0.0, nullable=False), active_history=True)  # 수익 금액 (MON 기준, 손익이 양수일 때)
     
     # 타임스탬프
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,132 @@
+"""
+Crypto Graves - 프로덕션 서버 실행
+
+    python -m app.server
+
+gunicorn 마스터가 앱을 한 번 import(preload)한 뒤 CPU 코어 수만큼 워커를 fork 한다.
+- 워커: uvicorn (uvloop 이벤트 루프 + httptools 파서, 설치되어 있지 않으면 기본 구현)
+- fork 직후 워커마다 DB 엔진의 연결 풀을 새로 만든다 (프로세스 간 연결 공유 없음)
+- SIGTERM: 새 연결을 받지 않고 처리 중인 요청을 server_graceful_timeout 초까지 마친 뒤 종료
+- 워커가 여러 개면 Prometheus 메트릭을 PROMETHEUS_MULTIPROC_DIR 로 합쳐서 /metrics 에 노출
+
+DB 연결 수는 워커 수 x (db_pool_size + db_max_overflow + 헬스 체크 1) 이므로
+Postgres max_connections 안에 들어오도록 설정한다. 수락 제어 한도도 워커별로 적용된다.
+"""
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+from app.config import settings
+import gc
+import glob
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+class ProductionWorker(UvicornWorker):
+    """uvloop/httptools 를 쓰고, gunicorn graceful_timeout 동안 요청을 마저 처리하는 uvicorn 워커"""
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        "lifespan": "on",
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = self.cfg.graceful_timeout
+
+
+def worker_count() -> int:
+    """설정값이 없으면 CPU 코어 수 (비동기 워커는 코어당 1개)"""
+    return settings.server_workers or os.cpu_count() or 1
+
+
+def prepare_metrics_dir(workers: int):
+    """멀티 워커용 Prometheus 메트릭 디렉터리 준비 (prometheus_client import 전에 호출)
+
+    이전 실행에서 남은 파일은 지운다.
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        if workers <= 1:
+            return
+        directory = tempfile.mkdtemp(prefix="crypto-graves-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        os.remove(path)
+
+
+def post_fork(server, worker):
+    """fork 직후 워커에서 실행: 마스터에게서 물려받은 DB 연결을 버리고 워커 전용 풀 사용"""
+    from app.database import reset_engine_after_fork
+    reset_engine_after_fork()
+
+
+def child_exit(server, worker):
+    """종료된 워커의 실시간(live) 게이지 값을 메트릭에서 제외"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+class Server(BaseApplication):
+    """gunicorn 애플리케이션 (설정 파일 없이 settings 로 구성)"""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        # preload 한 객체를 GC 대상에서 빼서, 워커의 GC 가 공유 메모리 페이지를 건드려 복사되지 않도록 함
+        gc.collect()
+        gc.freeze()
+        return app
+
+
+def main():
+    workers = worker_count()
+    prepare_metrics_dir(workers)
+
+    per_worker = settings.db_pool_size + settings.db_max_overflow + 1
+    logger.info(
+        f"Starting {workers} workers (loop={ProductionWorker.CONFIG_KWARGS['loop']}, "
+        f"http={ProductionWorker.CONFIG_KWARGS['http']}), up to {workers * per_worker} DB connections"
+    )
+
+    Server({
+        "bind": f"{settings.server_host}:{settings.server_port}",
+        "workers": workers,
+        "worker_class": "app.server.ProductionWorker",
+        "preload_app": True,
+        "graceful_timeout": settings.server_graceful_timeout,
+        "timeout": settings.server_worker_timeout,
+        "keepalive": settings.server_keepalive,
+        "max_requests": settings.server_max_requests,
+        "max_requests_jitter": settings.server_max_requests_jitter,
+        "loglevel": settings.log_level.lower(),
+        "accesslog": "-" if settings.debug else None,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+    }).run()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=getattr(logging, settings.log_level.upper()))
+    main()
@@ -0,0 +1 @@
+# Business services for Crypto Graves
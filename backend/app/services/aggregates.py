@@ -0,0 +1,248 @@
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Sequence, Tuple
+from collections import deque
+from datetime import datetime
+from app.models.pnl_position import PnLPositionModel
+from app.models.transfer import TransferModel
+from app.services.pnl import CostBasisMethod, PnLResult
+from app.services.price import PriceService
+from app.services.token_registry import TokenRegistry, get_token_registry
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 잔고가 이 값 이하로 떨어지면 0 으로 간주 (부동소수점 잔여분 정리)
+EPSILON = 1e-12
+
+# (ticker, token_address, direction, amount, block_number, log_index, block_signed_at)
+NewTransfer = Tuple[str, str, int, object, int, int, datetime]
+
+
+class PositionState:
+    """누적 집계의 메모리 상태
+
+    이벤트마다 ORM 속성을 건드리지 않도록 값을 꺼내서 갱신하고, 마지막에 한 번만 기록한다.
+    매수/매도 1건 반영은 상수 시간이며, FIFO lot 은 각 lot 이 한 번씩만 들어가고 나오므로
+    분할 상환(amortized) 상수 시간이다.
+    """
+
+    def __init__(self, record: PnLPositionModel):
+        self.record = record
+        self.bought_qty = record.bought_qty or 0.0
+        self.bought_cost = record.bought_cost or 0.0
+        self.sold_qty = record.sold_qty or 0.0
+        self.sold_proceeds = record.sold_proceeds or 0.0
+        self.balance = record.balance or 0.0
+        self.last_price = record.last_price or 0.0
+        self.avg_cost_basis = record.avg_cost_basis or 0.0
+        self.avg_realized_pnl = record.avg_realized_pnl or 0.0
+        # lot 은 제자리에서 줄어들므로 ORM 값과 공유하지 않도록 복사 (같은 객체면 변경이 감지되지 않아 저장되지 않음)
+        self.fifo_lots = deque([list(lot) for lot in record.fifo_lots or []])
+        self.fifo_cost_basis = record.fifo_cost_basis or 0.0
+        self.fifo_realized_pnl = record.fifo_realized_pnl or 0.0
+        self.last_block = record.last_block or 0
+        self.last_trade_at = record.last_trade_at
+
+    def apply(self, direction: int, amount: float, price: float):
+        """전송 1건 반영 (보유량을 초과한 매도는 잘라냄)"""
+        if amount <= 0:
+            return
+
+        if direction > 0:
+            cost = amount * price
+            self.bought_qty += amount
+            self.bought_cost += cost
+            self.balance += amount
+            self.avg_cost_basis += cost
+            self.fifo_cost_basis += cost
+            self.fifo_lots.append([amount, price])
+            return
+
+        filled = min(amount, self.balance)
+        if filled <= 0:
+            return
+
+        self.sold_qty += filled
+        self.sold_proceeds += filled * price
+
+        # 이동평균법: 평균 단가만큼 원가 차감
+        avg_price = self.avg_cost_basis / self.balance
+        self.avg_realized_pnl += filled * (price - avg_price)
+        self.avg_cost_basis -= filled * avg_price
+        self.balance -= filled
+
+        # 선입선출법: 오래된 lot 부터 소진
+        remaining = filled
+        while remaining > EPSILON and self.fifo_lots:
+            lot = self.fifo_lots[0]
+            take = min(remaining, lot[0])
+            self.fifo_realized_pnl += take * (price - lot[1])
+            self.fifo_cost_basis -= take * lot[1]
+            lot[0] -= take
+            remaining -= take
+            if lot[0] <= EPSILON:
+                self.fifo_lots.popleft()
+
+        if self.balance <= EPSILON:
+            self.balance = 0.0
+            self.avg_cost_basis = 0.0
+            self.fifo_cost_basis = 0.0
+            self.fifo_lots.clear()
+
+    def flush(self):
+        """메모리 상태를 ORM 레코드에 기록"""
+        record = self.record
+        record.bought_qty = self.bought_qty
+        record.bought_cost = self.bought_cost
+        record.sold_qty = self.sold_qty
+        record.sold_proceeds = self.sold_proceeds
+        record.balance = self.balance
+        record.last_price = self.last_price
+        record.avg_cost_basis = self.avg_cost_basis
+        record.avg_realized_pnl = self.avg_realized_pnl
+        record.fifo_lots = list(self.fifo_lots)
+        record.fifo_cost_basis = self.fifo_cost_basis
+        record.fifo_realized_pnl = self.fifo_realized_pnl
+        record.last_block = self.last_block
+        record.last_trade_at = self.last_trade_at
+
+
+def load_positions(db: Session, wallet_address: str, chain: str) -> List[PnLPositionModel]:
+    """지갑의 토큰별 집계 조회"""
+    return db.query(PnLPositionModel).filter(
+        PnLPositionModel.wallet_address == wallet_address,
+        PnLPositionModel.chain == chain
+    ).all()
+
+
+async def apply_new_transfers(
+    db: Session,
+    price_service: PriceService,
+    wallet_address: str,
+    chain: str,
+    transfers: Sequence[NewTransfer],
+    token_registry: Optional[TokenRegistry] = None
+) -> List[PnLPositionModel]:
+    """새로 수집된 전송들을 시간순으로 집계에 반영 (커밋은 호출 측에서)
+
+    집계는 토큰 컨트랙트 주소 기준이므로 심볼이 같은 서로 다른 토큰도 섞이지 않는다.
+    """
+    if not transfers:
+        return []
+
+    ordered = sorted(transfers, key=lambda transfer: (transfer[4], transfer[5]))
+    price_keys = [(transfer[1], chain, transfer[6].date()) for transfer in ordered]
+    prices = await price_service.get_prices(db, price_keys)
+
+    token_addresses = {transfer[1] for transfer in ordered}
+    states: Dict[str, PositionState] = {
+        record.token_address: PositionState(record)
+        for record in db.query(PnLPositionModel).filter(
+            PnLPositionModel.wallet_address == wallet_address,
+            PnLPositionModel.chain == chain,
+            PnLPositionModel.token_address.in_(token_addresses)
+        ).all()
+    }
+
+    # 새 토큰의 심볼/ID 는 레지스트리에서 한 번에 조회
+    new_addresses = token_addresses - set(states)
+    tokens = await (token_registry or get_token_registry()).resolve_many(
+        db, chain, new_addresses
+    ) if new_addresses else {}
+
+    for transfer, price_key in zip(ordered, price_keys):
+        ticker, token_address, direction, amount, block_number, _, block_signed_at = transfer
+        state = states.get(token_address)
+        if state is None:
+            token = tokens.get(token_address)
+            record = PnLPositionModel(
+                wallet_address=wallet_address,
+                chain=chain,
+                token_address=token_address,
+                token_id=token.id if token else None,
+                ticker=token.symbol if token and token.id else ticker,
+                fifo_lots=[]
+            )
+            db.add(record)
+            state = states[token_address] = PositionState(record)
+
+        price = prices[price_key]
+        state.apply(direction, float(amount), price)
+        state.last_price = price
+        state.last_block = block_number
+        state.last_trade_at = block_signed_at
+
+    for state in states.values():
+        state.flush()
+    db.flush()
+    return [state.record for state in states.values()]
+
+
+async def rebuild_positions(
+    db: Session,
+    price_service: PriceService,
+    wallet_address: str,
+    chain: str,
+    token_registry: Optional[TokenRegistry] = None
+) -> List[PnLPositionModel]:
+    """transfers 테이블 전체 내역으로 집계를 다시 생성 (최초 백필/복구용)"""
+    db.query(PnLPositionModel).filter(
+        PnLPositionModel.wallet_address == wallet_address,
+        PnLPositionModel.chain == chain
+    ).delete(synchronize_session=False)
+
+    rows = db.query(
+        TransferModel.ticker,
+        TransferModel.token_address,
+        TransferModel.direction,
+        TransferModel.amount,
+        TransferModel.block_number,
+        TransferModel.log_index,
+        TransferModel.block_signed_at
+    ).filter(
+        TransferModel.wallet_address == wallet_address,
+        TransferModel.chain == chain
+    ).all()
+
+    logger.info(f"Rebuilding PnL positions for {wallet_address} on {chain} from {len(rows)} transfers")
+    return await apply_new_transfers(
+        db, price_service, wallet_address, chain, [tuple(row) for row in rows], token_registry
+    )
+
+
+def positions_to_results(
+    positions: Sequence[PnLPositionModel],
+    method: CostBasisMethod = CostBasisMethod.AVERAGE
+) -> List[PnLResult]:
+    """집계 상태를 손익 결과로 변환 (토큰 수만큼만 계산)"""
+    results = []
+    for position in positions:
+        if method == CostBasisMethod.FIFO:
+            realized_pnl = position.fifo_realized_pnl
+            cost_basis = position.fifo_cost_basis
+        else:
+            realized_pnl = position.avg_realized_pnl
+            cost_basis = position.avg_cost_basis
+
+        unrealized_pnl = position.balance * position.last_price - cost_basis
+        loss_amount = max(-(realized_pnl + unrealized_pnl), 0.0)
+
+        results.append(PnLResult(
+            ticker=position.ticker,
+            token_address=position.token_address,
+            token_id=position.token_id,
+            total_bought=position.bought_qty,
+            total_sold=position.sold_qty,
+            current_balance=position.balance,
+            avg_buyprice=position.bought_cost / position.bought_qty if position.bought_qty > 0 else 0.0,
+            avg_sellprice=position.sold_proceeds / position.sold_qty if position.sold_qty > 0 else 0.0,
+            current_price=position.last_price,
+            total_buyprice=position.bought_cost,
+            total_sellprice=position.sold_proceeds,
+            realized_pnl=realized_pnl,
+            unrealized_pnl=unrealized_pnl,
+            loss_amount=loss_amount,
+            loss_rate=loss_amount / position.bought_cost * 100 if position.bought_cost > 0 else 0.0,
+            last_trade_at=position.last_trade_at
+        ))
+    return results
@@ -0,0 +1,105 @@
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import AsyncIterator, List, Optional, Sequence
+from app.database import SessionLocal
+from app.config import settings
+from app.services.aggregates import load_positions, positions_to_results
+from app.services.ingestion import TransactionProvider, ingest_wallet
+from app.services.pnl import CostBasisMethod, PnLResult, save_pnl_results
+from app.services.price import PriceService
+from app.services.write_behind import wallet_info_buffer
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class WalletAnalysisResult(BaseModel):
+    """배치 분석의 지갑별 결과"""
+    wallet_address: str
+    status: str                          # ok / error
+    transfers_inserted: int = 0          # 이번에 새로 수집한 전송 수
+    results: List[PnLResult] = []
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+
+async def analyze_wallet(
+    db: Session,
+    provider: TransactionProvider,
+    price_service: PriceService,
+    wallet_address: str,
+    chain: str,
+    method: CostBasisMethod
+) -> WalletAnalysisResult:
+    """지갑 1개 분석: 새 전송 수집 및 집계 반영 -> 집계로 손익 계산 -> wallet_info 저장"""
+    started = time.perf_counter()
+    ingest = await ingest_wallet(
+        db, provider, wallet_address, chain, settings.ingestion_batch_size, price_service
+    )
+    results = positions_to_results(load_positions(db, wallet_address, chain), method)
+    await wallet_info_buffer.flush_wallet(wallet_address)
+    save_pnl_results(db, wallet_address, results)
+
+    return WalletAnalysisResult(
+        wallet_address=wallet_address,
+        status="ok",
+        transfers_inserted=ingest.transfers_inserted,
+        results=results,
+        elapsed_ms=(time.perf_counter() - started) * 1000
+    )
+
+
+async def analyze_wallets(
+    wallet_addresses: Sequence[str],
+    chain: str,
+    method: CostBasisMethod,
+    provider: TransactionProvider,
+    price_service: PriceService,
+    concurrency: int = 8
+) -> AsyncIterator[WalletAnalysisResult]:
+    """여러 지갑을 최대 concurrency 개씩 동시에 분석하고, 끝나는 순서대로 결과를 반환
+
+    지갑마다 별도 DB 세션을 사용하며, 외부 API 호출 속도는 공유 클라이언트의 토큰 버킷이 제한한다.
+    호출 측이 중간에 순회를 멈추면 (예: 클라이언트 연결 종료) 남은 작업은 취소된다.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    for wallet_address in wallet_addresses:
+        pending.put_nowait(wallet_address)
+    finished: asyncio.Queue = asyncio.Queue()
+
+    async def worker():
+        while True:
+            try:
+                wallet_address = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            started = time.perf_counter()
+            db = SessionLocal()
+            try:
+                result = await analyze_wallet(db, provider, price_service, wallet_address, chain, method)
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Batch analysis failed for {wallet_address}: {e}")
+                result = WalletAnalysisResult(
+                    wallet_address=wallet_address,
+                    status="error",
+                    error=str(e),
+                    elapsed_ms=(time.perf_counter() - started) * 1000
+                )
+            finally:
+                db.close()
+            await finished.put(result)
+
+    workers = [
+        asyncio.create_task(worker())
+        for _ in range(max(1, min(concurrency, len(wallet_addresses))))
+    ]
+    try:
+        for _ in range(len(wallet_addresses)):
+            yield await finished.get()
+    finally:
+        for task in workers:
+            task.cancel()
@@ -0,0 +1,243 @@
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional
+from app.config import settings
+from app.services.metrics import EVENT_SUBSCRIBERS, EVENTS_DROPPED
+import anyio
+import asyncio
+import itertools
+import logging
+import orjson
+import psycopg2
+import psycopg2.extensions
+import time
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY 채널 (모든 워커가 같은 채널을 LISTEN)
+EVENT_CHANNEL = "crypto_graves_events"
+# NOTIFY payload 최대 크기 (Postgres 기본 8000바이트 미만)
+MAX_PAYLOAD_BYTES = 7900
+
+# 이벤트 종류
+EVENT_TYPES = ("mint", "grave", "leaderboard")
+
+
+def publish_event(db: Session, event_type: str, key: Optional[str], data: Dict[str, Any]):
+    """이벤트 발행 (호출한 세션의 트랜잭션이 커밋될 때 모든 워커에 전달됨)
+
+    key 가 같은 이벤트는 구독자에게 전달되기 전에 마지막 값 하나로 합쳐진다 (None 이면 합치지 않음).
+    """
+    payload = orjson.dumps({"type": event_type, "key": key, "data": data, "ts": time.time()}, default=str)
+    if len(payload) > MAX_PAYLOAD_BYTES:
+        logger.warning(f"Event payload too large, dropped: {event_type} {key} ({len(payload)} bytes)")
+        return
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": EVENT_CHANNEL, "payload": payload.decode()})
+
+
+class Subscription:
+    """구독자 1명의 전송 대기열
+
+    브로드캐스터는 대기열에 넣기만 하고 기다리지 않으므로 느린 구독자가 다른 구독자를 막지 않는다.
+    - 합치기: 같은 key 의 이벤트는 대기 중인 이전 값을 덮어씀 (순서는 처음 들어온 위치 유지)
+    - 백프레셔: 대기 중인 이벤트가 max_pending 을 넘으면 밀린 이벤트를 버리고 resync 이벤트 하나만 남김
+      (클라이언트는 resync 를 받으면 REST API 로 현재 상태를 다시 조회)
+    """
+
+    _sequence = itertools.count()
+
+    def __init__(
+        self,
+        types: Optional[FrozenSet[str]] = None,
+        wallet_address: Optional[str] = None,
+        max_pending: int = 256,
+        coalesce_window: float = 0.0
+    ):
+        self.types = types
+        self.wallet_address = wallet_address
+        self.max_pending = max_pending
+        self.coalesce_window = coalesce_window
+        self.pending: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def accepts(self, event: Dict[str, Any]) -> bool:
+        if event["type"] == "resync":
+            return True
+        if self.types is not None and event["type"] not in self.types:
+            return False
+        if self.wallet_address is not None:
+            wallet = event["data"].get("wallet_address")
+            if wallet is not None and wallet != self.wallet_address:
+                return False
+        return True
+
+    def offer(self, event: Dict[str, Any]):
+        """이벤트를 대기열에 추가 (이벤트 루프 스레드에서 호출, 블로킹 없음)"""
+        if not self.accepts(event):
+            return
+        key = event.get("key")
+        if key is None:
+            key = ("unique", next(self._sequence))
+        else:
+            key = (event["type"], key)
+
+        if key in self.pending:
+            self.pending[key] = event
+            EVENTS_DROPPED.labels(reason="coalesced").inc()
+        elif len(self.pending) >= self.max_pending:
+            EVENTS_DROPPED.labels(reason="overflow").inc(len(self.pending))
+            self.pending.clear()
+            self.pending[("resync", None)] = {"type": "resync", "key": None, "data": {"reason": "overflow"}, "ts": time.time()}
+        else:
+            self.pending[key] = event
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> List[Dict[str, Any]]:
+        """대기 중인 이벤트를 모두 꺼냄 (timeout 동안 없으면 빈 리스트, 하트비트용)"""
+        if not self.pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        if self.coalesce_window:
+            # 짧은 시간 안에 연달아 오는 갱신을 한 번에 보냄
+            await asyncio.sleep(self.coalesce_window)
+        events = list(self.pending.values())
+        self.pending.clear()
+        return events
+
+
+class EventBroadcaster:
+    """워커 프로세스당 하나: Postgres LISTEN 연결 1개로 받은 이벤트를 구독자들에게 나눠줌
+
+    LISTEN 연결은 요청용 커넥션 풀과 별도이며, 소켓을 이벤트 루프에 등록해서 스레드 없이 알림을 읽는다.
+    연결이 끊기면 다시 연결하고, 그 사이 놓친 이벤트가 있을 수 있으므로 구독자 전체에 resync 를 보낸다.
+    """
+
+    def __init__(self, max_subscribers: int, max_pending: int, coalesce_window: float, reconnect_delay: float = 1.0):
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self.coalesce_window = coalesce_window
+        self.reconnect_delay = reconnect_delay
+        self.subscribers: "set[Subscription]" = set()
+        self._connection = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None
+
+    def _connect(self):
+        url = make_url(settings.database_url).set(drivername="postgresql")
+        connection = psycopg2.connect(url.render_as_string(hide_password=False))
+        connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {EVENT_CHANNEL}")
+        return connection
+
+    async def start(self):
+        """LISTEN 시작 (애플리케이션 시작 시 호출, 실패하면 백그라운드에서 재시도)"""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = False
+        try:
+            self._attach(await anyio.to_thread.run_sync(self._connect))
+        except Exception as e:
+            logger.warning(f"Event listener connection failed: {e}")
+            self._schedule_reconnect()
+
+    def _attach(self, connection):
+        self._connection = connection
+        self._loop.add_reader(connection.fileno(), self._on_readable)
+        logger.info(f"Listening for events on {EVENT_CHANNEL}")
+
+    def _detach(self):
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            self._loop.remove_reader(connection.fileno())
+        except Exception:
+            pass
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _on_readable(self):
+        try:
+            self._connection.poll()
+        except Exception as e:
+            logger.warning(f"Event listener connection lost: {e}")
+            self._detach()
+            self._schedule_reconnect()
+            return
+        notifies = self._connection.notifies
+        while notifies:
+            notify = notifies.pop(0)
+            try:
+                event = orjson.loads(notify.payload)
+            except orjson.JSONDecodeError:
+                logger.warning("Ignoring malformed event payload")
+                continue
+            self.dispatch(event)
+
+    def dispatch(self, event: Dict[str, Any]):
+        for subscription in self.subscribers:
+            subscription.offer(event)
+
+    def _schedule_reconnect(self):
+        if self._stopped or (self._reconnect_task is not None and not self._reconnect_task.done()):
+            return
+        self._reconnect_task = self._loop.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        delay = self.reconnect_delay
+        while not self._stopped:
+            await asyncio.sleep(delay)
+            try:
+                self._attach(await anyio.to_thread.run_sync(self._connect))
+            except Exception as e:
+                logger.warning(f"Event listener reconnect failed: {e}")
+                delay = min(delay * 2, 30.0)
+                continue
+            self.dispatch({"type": "resync", "key": None, "data": {"reason": "reconnected"}, "ts": time.time()})
+            return
+
+    async def stop(self):
+        """LISTEN 종료 (애플리케이션 종료 시 호출)"""
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+            self._reconnect_task = None
+        self._detach()
+
+    def subscribe(self, types: Optional[FrozenSet[str]] = None, wallet_address: Optional[str] = None) -> Optional[Subscription]:
+        """구독 등록 (구독자 수가 한도에 도달했으면 None)"""
+        if len(self.subscribers) >= self.max_subscribers:
+            return None
+        subscription = Subscription(types, wallet_address, self.max_pending, self.coalesce_window)
+        self.subscribers.add(subscription)
+        EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self.subscribers:
+            self.subscribers.discard(subscription)
+            EVENT_SUBSCRIBERS.dec()
+
+
+# 워커 프로세스당 하나의 브로드캐스터
+broadcaster = EventBroadcaster(
+    max_subscribers=settings.events_max_subscribers,
+    max_pending=settings.events_max_pending,
+    coalesce_window=settings.events_coalesce_ms / 1000
+)
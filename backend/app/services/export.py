@@ -0,0 +1,269 @@
+from sqlalchemy import Date, Text, cast, func, select
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.engine import Connection
+from sqlalchemy import types as sqltypes
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Sequence
+from datetime import datetime, timezone
+from itertools import groupby
+from urllib.parse import quote
+from app.config import settings
+from app.database import engine
+from app.models.address import WalletAddress
+from app.models.money import Fixed8
+from app.models.user import UserModel
+from app.models.wallet_info import WalletInfoModel
+from app.models.loss import LossModel
+import pyarrow as pa
+import pyarrow.parquet as pq
+import argparse
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# 내보낼 수 있는 테이블
+EXPORT_TABLES: Dict[str, type] = {
+    "wallet_info": WalletInfoModel,
+    "losses": LossModel,
+    "users": UserModel,
+}
+
+# 테이블별 티커 컬럼 (티커 파티셔닝용)
+TICKER_COLUMNS = {
+    "wallet_info": "ticker",
+    "losses": "asset_ticker",
+}
+
+# 지원하는 파티션 키
+PARTITION_KEYS = ("ticker", "date")
+
+
+class ExportResult(BaseModel):
+    """테이블 1개 내보내기 결과"""
+    table: str
+    rows: int
+    files: List[str]
+    path: str
+
+
+def arrow_type(column_type: sqltypes.TypeEngine) -> pa.DataType:
+    """SQLAlchemy 컬럼 타입을 Arrow 타입으로 변환 (Numeric 은 float 변환 없이 decimal128 유지)"""
+    if isinstance(column_type, Fixed8):
+        # 고정소수점 금액도 Numeric(20, 8) 저장 시와 같은 스키마로 내보냄
+        return pa.decimal128(20, 8)
+    if isinstance(column_type, sqltypes.BigInteger):
+        return pa.int64()
+    if isinstance(column_type, sqltypes.SmallInteger):
+        return pa.int16()
+    if isinstance(column_type, sqltypes.Integer):
+        return pa.int32()
+    if isinstance(column_type, sqltypes.Float):
+        return pa.float64()
+    if isinstance(column_type, sqltypes.Numeric):
+        return pa.decimal128(column_type.precision or 38, column_type.scale or 0)
+    if isinstance(column_type, sqltypes.Boolean):
+        return pa.bool_()
+    if isinstance(column_type, sqltypes.DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, sqltypes.Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _select_column(column):
+    """UUID/JSONB 는 DB 에서 텍스트로 변환해서 받아 행 단위 변환을 없앰
+
+    지갑 주소(BYTEA)도 행마다 체크섬(keccak)을 계산하지 않도록 DB 에서 소문자 0x hex 로 변환한다.
+    """
+    if isinstance(column.type, (UUID, JSONB)):
+        return cast(column, Text).label(column.name)
+    if isinstance(column.type, WalletAddress):
+        return func.concat("0x", func.encode(column, "hex")).label(column.name)
+    return column
+
+
+def _partition_value(value) -> str:
+    """파티션 디렉터리 이름 (Hive 관례: URI 인코딩, NULL 은 기본 파티션)"""
+    if value is None:
+        return "__HIVE_DEFAULT_PARTITION__"
+    return quote(str(value), safe="")
+
+
+class _PartitionWriter:
+    """정렬된 행 스트림을 파티션별 Parquet 파일로 기록 (동시에 파일 1개만 열어둠)"""
+
+    def __init__(self, root: str, schema: pa.Schema, max_rows_per_file: int, compression: str):
+        self.root = root
+        self.schema = schema
+        self.max_rows_per_file = max_rows_per_file
+        self.compression = compression
+        self.files: List[str] = []
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._key = None
+        self._part = 0
+        self._file_rows = 0
+
+    def _open(self, key: tuple, directory: str):
+        self.close()
+        if key != self._key:
+            self._key = key
+            self._part = 0
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{self._part:05d}.parquet")
+        self._writer = pq.ParquetWriter(path, self.schema, compression=self.compression)
+        self.files.append(os.path.relpath(path, self.root))
+        self._part += 1
+        self._file_rows = 0
+
+    def write(self, key: tuple, directory: str, batch: pa.RecordBatch):
+        """배치 1개를 row group 으로 기록 (파티션이 바뀌거나 파일이 가득 차면 새 파일)"""
+        if self._writer is None or key != self._key or self._file_rows >= self.max_rows_per_file:
+            self._open(key, directory)
+        self._writer.write_batch(batch)
+        self._file_rows += batch.num_rows
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def export_table(
+    connection: Connection,
+    table: str,
+    destination: str,
+    partition_by: Sequence[str] = (),
+    batch_size: int = 50000,
+    max_rows_per_file: int = 10000000,
+    compression: str = "zstd"
+) -> ExportResult:
+    """테이블 1개를 Parquet 로 내보내기
+
+    서버 측 커서(yield_per)로 batch_size 행씩 읽어 Arrow RecordBatch 로 바로 변환하므로
+    메모리 사용량은 테이블 크기와 무관하게 배치 1개 분량이다.
+    파티셔닝 시에는 파티션 키로 정렬해서 읽기 때문에 파일도 한 번에 하나만 열린다.
+    파티션은 Hive 형식 디렉터리 (ticker=PEPE/date=2024-01-01/part-00000.parquet) 로 기록된다.
+    """
+    model = EXPORT_TABLES[table]
+    columns = [column for column in model.__table__.columns]
+    for key in partition_by:
+        if key not in PARTITION_KEYS:
+            raise ValueError(f"Unknown partition key: {key}")
+        if key == "ticker" and table not in TICKER_COLUMNS:
+            raise ValueError(f"Table {table} cannot be partitioned by ticker")
+
+    selected = [_select_column(column) for column in columns]
+    # Hive 관례에 따라 티커 파티션 컬럼은 파일 본문에서 제외 (디렉터리 이름으로 복원됨)
+    ticker_column = TICKER_COLUMNS.get(table) if "ticker" in partition_by else None
+    data_indexes = [i for i, column in enumerate(columns) if column.name != ticker_column]
+    schema = pa.schema([
+        pa.field(columns[i].name, arrow_type(columns[i].type), nullable=columns[i].nullable)
+        for i in data_indexes
+    ])
+
+    partition_columns = []
+    for key in partition_by:
+        if key == "ticker":
+            partition_columns.append(model.__table__.c[ticker_column])
+        else:
+            partition_columns.append(cast(func.timezone("UTC", model.__table__.c.created_at), Date))
+
+    statement = select(*selected, *partition_columns)
+    if partition_columns:
+        statement = statement.order_by(*partition_columns)
+
+    root = os.path.join(destination, table)
+    writer = _PartitionWriter(root, schema, max_rows_per_file, compression)
+    width = len(columns)
+    rows = 0
+
+    result = connection.execution_options(yield_per=batch_size).execute(statement)
+    try:
+        for chunk in result.partitions(batch_size):
+            # 정렬되어 있으므로 같은 파티션 행은 연속으로 나옴
+            for key, group in groupby(chunk, key=lambda row: tuple(row[width:])):
+                group_rows = list(group)
+                values = list(zip(*group_rows))
+                batch = pa.RecordBatch.from_arrays(
+                    [pa.array(values[i], type=schema.field(j).type) for j, i in enumerate(data_indexes)],
+                    schema=schema
+                )
+                directory = os.path.join(root, *[
+                    f"{name}={_partition_value(value)}" for name, value in zip(partition_by, key)
+                ])
+                writer.write(key, directory, batch)
+                rows += batch.num_rows
+    finally:
+        result.close()
+        writer.close()
+
+    if not writer.files:
+        # 빈 테이블도 스키마는 남겨둠
+        os.makedirs(root, exist_ok=True)
+        pq.write_table(schema.empty_table(), os.path.join(root, "part-00000.parquet"), compression=compression)
+        writer.files.append("part-00000.parquet")
+
+    logger.info(f"Exported {rows} rows from {table} into {len(writer.files)} files under {root}")
+    return ExportResult(table=table, rows=rows, files=writer.files, path=root)
+
+
+def export_snapshot(
+    tables: Sequence[str] = tuple(EXPORT_TABLES),
+    destination: Optional[str] = None,
+    partition_by: Sequence[str] = (),
+    batch_size: Optional[int] = None,
+    max_rows_per_file: Optional[int] = None
+) -> List[ExportResult]:
+    """여러 테이블을 같은 시점의 스냅샷으로 내보내기
+
+    모든 테이블을 하나의 REPEATABLE READ 읽기 전용 트랜잭션에서 읽어 테이블 간 일관성을 보장한다.
+    결과는 <destination>/<스냅샷 ID>/<테이블>/ 아래에 기록되고, 마지막에 _manifest.json 을 남긴다.
+    """
+    for table in tables:
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Unknown export table: {table}")
+
+    snapshot_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    root = os.path.join(destination or settings.export_dir, snapshot_id)
+    os.makedirs(root, exist_ok=True)
+
+    results = []
+    with engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        with connection.begin():
+            for table in tables:
+                # ticker 파티션이 없는 테이블(users)은 날짜로만 나눔
+                keys = [key for key in partition_by if key != "ticker" or table in TICKER_COLUMNS]
+                results.append(export_table(
+                    connection,
+                    table,
+                    root,
+                    keys,
+                    batch_size or settings.export_batch_size,
+                    max_rows_per_file or settings.export_max_rows_per_file
+                ))
+
+    with open(os.path.join(root, "_manifest.json"), "w") as f:
+        json.dump({
+            "snapshot_id": snapshot_id,
+            "partition_by": list(partition_by),
+            "tables": [result.model_dump() for result in results]
+        }, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m app.services.export --tables wallet_info losses --partition-by ticker date
+    parser = argparse.ArgumentParser(description="wallet_info / losses / users 스냅샷을 Parquet 로 내보내기")
+    parser.add_argument("--tables", nargs="+", default=list(EXPORT_TABLES), choices=list(EXPORT_TABLES))
+    parser.add_argument("--out", default=None, help="출력 디렉터리 (기본값: EXPORT_DIR)")
+    parser.add_argument("--partition-by", nargs="*", default=[], choices=list(PARTITION_KEYS))
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--max-rows-per-file", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for export in export_snapshot(args.tables, args.out, args.partition_by, args.batch_size, args.max_rows_per_file):
+        print(f"{export.table}: {export.rows} rows, {len(export.files)} files -> {export.path}")
@@ -0,0 +1,168 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from app.config import settings
+from app.database import engine
+import anyio
+import asyncio
+import httpx
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """백그라운드에서 주기적으로 갱신되는 서비스 상태
+
+    프로브 요청은 마지막으로 갱신된 상태만 읽으므로 DB/RPC 를 직접 호출하지 않는다.
+    - DB: 전용 연결 1개로 SELECT 1 응답 시간 측정 (요청용 커넥션 풀과 경쟁하지 않음)
+    - 커넥션 풀: 사용 중인 연결 수 / (pool_size + max_overflow)
+    - RPC: eth_blockNumber 응답 여부와 시간
+    - 대기열: 수락 제어 대기열에 쌓인 요청 수
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        probe_timeout: float,
+        pool_saturation_threshold: float,
+        queue_threshold: int,
+        require_rpc: bool = False,
+        queue_depth: Optional[Callable[[], int]] = None
+    ):
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self.pool_saturation_threshold = pool_saturation_threshold
+        self.queue_threshold = queue_threshold
+        self.require_rpc = require_rpc
+        self.queue_depth = queue_depth or (lambda: 0)
+        self.status: Dict[str, Any] = {"ready": False, "reasons": ["starting"], "checked_at": None}
+        self._checked_monotonic: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._probe_engine: Optional[Engine] = None
+
+    @property
+    def probe_engine(self) -> Engine:
+        # 워커 프로세스에서 처음 사용할 때 생성 (preload 한 마스터 프로세스의 연결을 물려받지 않도록)
+        if self._probe_engine is None:
+            self._probe_engine = create_engine(
+                settings.database_url,
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=self.probe_timeout,
+                pool_pre_ping=False,
+                connect_args={"connect_timeout": max(1, int(self.probe_timeout))}
+            )
+        return self._probe_engine
+
+    def _ping_db(self) -> float:
+        started = time.perf_counter()
+        with self.probe_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return (time.perf_counter() - started) * 1000
+
+    async def _check_db(self) -> Dict[str, Any]:
+        try:
+            with anyio.fail_after(self.probe_timeout):
+                latency_ms = await anyio.to_thread.run_sync(self._ping_db, cancellable=True)
+            return {"status": "up", "latency_ms": round(latency_ms, 2)}
+        except Exception as e:
+            logger.warning(f"Database health probe failed: {e!r}")
+            return {"status": "down", "error": type(e).__name__}
+
+    def _check_pool(self) -> Dict[str, Any]:
+        pool = engine.pool
+        capacity = settings.db_pool_size + settings.db_max_overflow
+        checked_out = pool.checkedout()
+        return {
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "saturation": round(checked_out / capacity, 3) if capacity else 0.0
+        }
+
+    async def _check_rpc(self) -> Dict[str, Any]:
+        if not settings.monad_rpc_url:
+            return {"status": "unconfigured"}
+        started = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(timeout=self.probe_timeout) as client:
+                response = await client.post(
+                    settings.monad_rpc_url,
+                    json={"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}
+                )
+                response.raise_for_status()
+                block = int(response.json()["result"], 16)
+            return {
+                "status": "up",
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                "block_number": block
+            }
+        except Exception as e:
+            logger.warning(f"RPC health probe failed: {e!r}")
+            return {"status": "down", "error": type(e).__name__}
+
+    async def refresh(self):
+        """모든 항목을 다시 확인하고 상태 갱신"""
+        db, rpc = await asyncio.gather(self._check_db(), self._check_rpc())
+        pool = self._check_pool()
+        queue = {"depth": self.queue_depth(), "threshold": self.queue_threshold}
+
+        reasons: List[str] = []
+        if db["status"] != "up":
+            reasons.append("database_down")
+        if pool["saturation"] >= self.pool_saturation_threshold:
+            reasons.append("pool_saturated")
+        if queue["depth"] >= self.queue_threshold:
+            reasons.append("queue_backlog")
+        if self.require_rpc and rpc["status"] == "down":
+            reasons.append("rpc_down")
+
+        self.status = {
+            "ready": not reasons,
+            "reasons": reasons,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "database": db,
+            "pool": pool,
+            "rpc": rpc,
+            "queue": queue
+        }
+        self._checked_monotonic = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """마지막 상태 반환 (갱신이 interval 의 3배 이상 밀리면 준비되지 않은 것으로 처리)"""
+        status = dict(self.status)
+        if self._checked_monotonic is not None:
+            age = time.monotonic() - self._checked_monotonic
+            status["age_seconds"] = round(age, 3)
+            if age > self.interval * 3:
+                status["ready"] = False
+                status["reasons"] = status["reasons"] + ["stale"]
+        return status
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """백그라운드 갱신 시작 (애플리케이션 시작 시 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """백그라운드 갱신 중지 (애플리케이션 종료 시 호출)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._probe_engine is not None:
+            self._probe_engine.dispose()
+            self._probe_engine = None
@@ -0,0 +1,136 @@
+from typing import Optional
+from app.config import settings
+import asyncio
+import httpx
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """비동기 토큰 버킷 (초당 rate 개 충전, 최대 capacity 개 누적)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 때까지 대기 (대기자는 도착 순서대로 처리)"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    def drain(self):
+        """429 응답을 받았을 때 남은 토큰을 비워 다른 요청도 잠시 멈추게 함"""
+        self._refill()
+        self.tokens = 0.0
+
+
+class RateLimitedClient:
+    """외부 API 용 공유 httpx 클라이언트 (토큰 버킷 + 429 자동 재시도)"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        bucket: TokenBucket,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Retry-After 헤더가 있으면 따르고, 없으면 지수 백오프 + 지터"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            response = await self.client.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == self.max_retries:
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            logger.warning(f"Rate limited by {response.url.host}, retrying in {delay:.2f}s (attempt {attempt + 1})")
+            self.bucket.drain()
+            await asyncio.sleep(delay)
+        return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+_provider_client: Optional[RateLimitedClient] = None
+_rpc_client: Optional[RateLimitedClient] = None
+
+
+def get_provider_client() -> RateLimitedClient:
+    """데이터 제공자(Covalent) 호출용 프로세스 단위 공유 클라이언트"""
+    global _provider_client
+    if _provider_client is None:
+        _provider_client = RateLimitedClient(
+            httpx.AsyncClient(
+                timeout=60.0,
+                limits=httpx.Limits(
+                    max_connections=settings.provider_max_connections,
+                    max_keepalive_connections=settings.provider_max_connections
+                )
+            ),
+            TokenBucket(settings.provider_rate_limit, settings.provider_rate_burst),
+            max_retries=settings.provider_max_retries
+        )
+    return _provider_client
+
+
+def get_rpc_client() -> RateLimitedClient:
+    """체인 JSON-RPC 호출용 프로세스 단위 공유 클라이언트"""
+    global _rpc_client
+    if _rpc_client is None:
+        _rpc_client = RateLimitedClient(
+            httpx.AsyncClient(timeout=30.0),
+            TokenBucket(settings.rpc_rate_limit, settings.rpc_rate_burst),
+            max_retries=settings.provider_max_retries
+        )
+    return _rpc_client
+
+
+async def close_provider_client():
+    """애플리케이션 종료 시 공유 클라이언트 정리"""
+    global _provider_client, _rpc_client
+    if _provider_client is not None:
+        await _provider_client.aclose()
+        _provider_client = None
+    if _rpc_client is not None:
+        await _rpc_client.aclose()
+        _rpc_client = None
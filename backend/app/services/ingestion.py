@@ -0,0 +1,439 @@
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from abc import ABC, abstractmethod
+from pydantic import BaseModel
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from decimal import Decimal
+from app.config import settings
+from app.services.http_client import RateLimitedClient, get_provider_client
+from app.services.metrics import INGESTION_SKIPPED_TRANSFERS
+from app.models.address import normalize_wallet_address
+from app.models.transfer import WalletSyncStateModel
+from app.services.aggregates import NewTransfer, apply_new_transfers, load_positions, rebuild_positions
+from app.services.price import PriceService
+from app.services.token_registry import NATIVE_TOKEN_ADDRESS, TokenHint, TokenRegistry, get_token_registry
+from app.models.token import Token
+from weakref import WeakValueDictionary
+import asyncio
+import csv
+import io
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# COPY 대상 컬럼 (순서가 normalize_transaction 결과 튜플과 같아야 함)
+TRANSFER_COLUMNS = (
+    "wallet_address", "chain", "block_number", "block_signed_at", "tx_hash", "log_index",
+    "token_address", "ticker", "decimals", "direction", "amount"
+)
+
+TransferRow = Tuple[str, str, int, str, str, int, str, str, int, int, Decimal]
+
+# 다른 워커가 같은 지갑을 수집 중일 때 체크포인트 행 잠금을 다시 시도하는 간격 (초)
+SYNC_LOCK_RETRY_SECONDS = 0.2
+
+# Postgres lock_not_available (FOR UPDATE NOWAIT 가 잠긴 행을 만났을 때)
+LOCK_NOT_AVAILABLE = "55P03"
+
+# 워커 안에서 같은 지갑 수집을 차례로 실행하기 위한 지갑별 락 (사용 중인 동안만 유지)
+_sync_locks: "WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = WeakValueDictionary()
+
+
+class TransactionProvider(ABC):
+    """지갑 트랜잭션 제공자 인터페이스"""
+    name: str = "unknown"
+
+    @abstractmethod
+    def iter_pages(
+        self,
+        wallet_address: str,
+        chain: str,
+        after_block: int = 0
+    ) -> AsyncIterator[List[dict]]:
+        """after_block 보다 큰 블록의 트랜잭션을 최신순 페이지 단위로 반환 (Covalent 응답 형식)"""
+
+
+class CovalentTransactionProvider(TransactionProvider):
+    """Covalent transactions_v2 기반 트랜잭션 제공자"""
+    name = "covalent"
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str,
+        page_size: int = 100,
+        client: Optional[RateLimitedClient] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.client = client or get_provider_client()
+
+    async def iter_pages(self, wallet_address, chain, after_block=0):
+        page_number = 0
+        while True:
+            response = await self.client.get(
+                f"{self.base_url}/{chain}/address/{wallet_address}/transactions_v2/",
+                params={
+                    "page-number": page_number,
+                    "page-size": self.page_size,
+                    "block-signed-at-asc": "false"
+                },
+                headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            if data.get("error"):
+                raise Exception(f"Covalent transaction API error: {data.get('error_message')}")
+
+            items = (data.get("data") or {}).get("items") or []
+            page = [tx for tx in items if (tx.get("block_height") or 0) > after_block]
+            if page:
+                yield page
+
+            # 최신순이므로 체크포인트 이전 블록이 나오면 더 볼 필요가 없음
+            has_more = ((data.get("data") or {}).get("pagination") or {}).get("has_more")
+            if not has_more or len(page) < len(items):
+                break
+            page_number += 1
+
+
+class MockTransactionProvider(TransactionProvider):
+    """로컬 JSON 기반 트랜잭션 제공자 (테스트/개발용)
+
+    fixture 형식: {"<wallet_address>": [Covalent 트랜잭션, ...]}
+    """
+    name = "mock"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        transactions: Optional[Dict[str, List[dict]]] = None,
+        page_size: int = 100
+    ):
+        if transactions is None:
+            with open(path, "r") as f:
+                transactions = json.load(f)
+        self.transactions = {
+            wallet.lower(): sorted(items, key=lambda tx: tx["block_height"], reverse=True)
+            for wallet, items in transactions.items()
+        }
+        self.page_size = page_size
+        self.pages_served = 0  # 반환한 페이지 수 (테스트 검증용)
+
+    async def iter_pages(self, wallet_address, chain, after_block=0):
+        transactions = self.transactions.get(wallet_address.lower(), [])
+        for start in range(0, len(transactions), self.page_size):
+            items = transactions[start:start + self.page_size]
+            page = [tx for tx in items if tx["block_height"] > after_block]
+            if page:
+                self.pages_served += 1
+                yield page
+            if len(page) < len(items):
+                break
+
+
+class IngestResult(BaseModel):
+    """지갑 전송 내역 수집 결과"""
+    wallet_address: str
+    chain: str
+    from_block: int
+    last_block: int
+    transactions_seen: int
+    transfers_inserted: int
+
+
+def _to_amount(value, decimals: int) -> Decimal:
+    """원시 정수 수량을 decimals 적용한 Decimal 로 변환 (float 미사용)"""
+    return Decimal(int(value)).scaleb(-decimals)
+
+
+def token_hints(tx: dict) -> Dict[str, TokenHint]:
+    """Covalent 트랜잭션에 포함된 토큰 메타데이터 (레지스트리 대체값용)"""
+    gas_metadata = tx.get("gas_metadata") or {}
+    hints: Dict[str, TokenHint] = {
+        NATIVE_TOKEN_ADDRESS: (
+            gas_metadata.get("contract_ticker_symbol"),
+            gas_metadata.get("contract_name"),
+            gas_metadata.get("contract_decimals")
+        )
+    }
+    for log_event in tx.get("log_events") or []:
+        address = (log_event.get("sender_address") or "").lower()
+        if address and (log_event.get("decoded") or {}).get("name") == "Transfer":
+            hints[address] = (
+                log_event.get("sender_contract_ticker_symbol"),
+                log_event.get("sender_name"),
+                log_event.get("sender_contract_decimals")
+            )
+    return hints
+
+
+def normalize_transaction(
+    tx: dict,
+    wallet_address: str,
+    chain: str,
+    tokens: Optional[Dict[str, Token]] = None
+) -> List[TransferRow]:
+    """Covalent 트랜잭션 1건을 네이티브/ERC20 전송 행으로 정규화
+
+    프론트엔드 getCovalentTransactions 와 같은 규칙을 따른다.
+    (지갑으로 들어오면 매수, 지갑에서 나가면 매도, 자기 자신에게 보낸 전송은 제외)
+    tokens 가 주어지면 심볼/decimals 는 제공자 값 대신 토큰 레지스트리 값을 사용한다.
+    decimals 를 레지스트리와 제공자 어디에서도 알 수 없는 토큰의 전송은 18 로 추측하지 않고 건너뛴다.
+    지갑 주소는 COPY 로 BYTEA 컬럼에 바로 들어가도록 \\x hex 표기로 넣는다.
+    """
+    tokens = tokens or {}
+
+    def metadata(address: str, symbol: Optional[str], decimals: Optional[int]) -> Optional[Tuple[str, int]]:
+        """(심볼, decimals), decimals 를 알 수 없으면 None (수량 단위를 추측하지 않고 전송을 건너뜀)"""
+        token = tokens.get(address)
+        if token is not None and token.source != "default":
+            return token.symbol, token.decimals
+        if decimals is None:
+            INGESTION_SKIPPED_TRANSFERS.labels(chain=chain).inc()
+            logger.warning(f"Skipping transfer of {address} on {chain} in {tx_hash}: token decimals unknown")
+            return None
+        return (symbol or "UNKNOWN")[:20], int(decimals)
+
+    # 제공자 응답의 from/to 주소(소문자 hex)와 비교할 값
+    wallet = wallet_address.lower()
+    wallet_bytea = "\\x" + wallet[2:]
+    rows: List[TransferRow] = []
+    block_number = int(tx["block_height"])
+    block_signed_at = tx["block_signed_at"]
+    tx_hash = tx["tx_hash"]
+
+    # 네이티브 코인 전송
+    value = tx.get("value")
+    if value and value != "0":
+        from_address = (tx.get("from_address") or "").lower()
+        to_address = (tx.get("to_address") or "").lower()
+        if (from_address == wallet) != (to_address == wallet):
+            gas_metadata = tx.get("gas_metadata") or {}
+            resolved = metadata(
+                NATIVE_TOKEN_ADDRESS,
+                gas_metadata.get("contract_ticker_symbol") or "ETH",
+                gas_metadata.get("contract_decimals")
+            )
+            if resolved is not None:
+                ticker, decimals = resolved
+                rows.append((
+                    wallet_bytea, chain, block_number, block_signed_at, tx_hash, -1,
+                    NATIVE_TOKEN_ADDRESS,
+                    ticker,
+                    decimals,
+                    -1 if from_address == wallet else 1,
+                    _to_amount(value, decimals)
+                ))
+
+    # ERC20 Transfer 이벤트
+    for log_event in tx.get("log_events") or []:
+        decoded = log_event.get("decoded") or {}
+        if decoded.get("name") != "Transfer":
+            continue
+
+        params = {param.get("name"): param.get("value") for param in decoded.get("params") or []}
+        from_address = (params.get("from") or "").lower()
+        to_address = (params.get("to") or "").lower()
+        value = params.get("value")
+        if not from_address or not to_address or not value:
+            continue
+        if (from_address == wallet) == (to_address == wallet):
+            continue
+
+        token_address = (log_event.get("sender_address") or "").lower()
+        resolved = metadata(
+            token_address,
+            log_event.get("sender_contract_ticker_symbol"),
+            log_event.get("sender_contract_decimals")
+        )
+        if resolved is None:
+            continue
+        ticker, decimals = resolved
+        rows.append((
+            wallet_bytea, chain, block_number, log_event.get("block_signed_at") or block_signed_at, tx_hash,
+            int(log_event.get("log_offset") or 0),
+            token_address,
+            ticker,
+            decimals,
+            -1 if from_address == wallet else 1,
+            _to_amount(value, decimals)
+        ))
+
+    return rows
+
+
+def copy_transfers(db: Session, rows: List[TransferRow]) -> List[NewTransfer]:
+    """COPY 로 임시 테이블에 적재한 뒤 transfers 에 중복 없이 반영하고, 새로 들어간 행을 반환"""
+    if not rows:
+        return []
+
+    columns = ", ".join(TRANSFER_COLUMNS)
+    db.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS transfers_staging "
+        f"AS SELECT {columns} FROM transfers WITH NO DATA"
+    ))
+    db.execute(text("TRUNCATE transfers_staging"))
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(rows)
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY transfers_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+    inserted = db.execute(text(
+        f"INSERT INTO transfers ({columns}) "
+        f"SELECT {columns} FROM transfers_staging "
+        "ON CONFLICT (wallet_address, chain, tx_hash, log_index) DO NOTHING "
+        "RETURNING ticker, token_address, direction, amount, block_number, log_index, block_signed_at"
+    ))
+    return [tuple(row) for row in inserted]
+
+
+def wallet_sync_lock(wallet_address: str, chain: str) -> asyncio.Lock:
+    """같은 워커에서 같은 지갑 수집을 차례로 실행하기 위한 락"""
+    key = (wallet_address, chain)
+    lock = _sync_locks.get(key)
+    if lock is None:
+        lock = _sync_locks[key] = asyncio.Lock()
+    return lock
+
+
+async def lock_sync_state(db: Session, wallet_address: str, chain: str) -> WalletSyncStateModel:
+    """지갑 체크포인트 행을 (없으면 만들어서) 잠그고 반환
+
+    같은 지갑을 다른 워커가 수집 중이면 그 트랜잭션이 끝날 때까지 기다렸다가
+    갱신된 체크포인트부터 이어서 수집하므로, 같은 전송이 집계에 두 번 반영되거나 PK 충돌로 실패하지 않는다.
+    잠금은 NOWAIT 로 시도하고 실패하면 asyncio.sleep 후 다시 시도하므로 기다리는 동안 이벤트 루프를 막지 않는다.
+    """
+    # 행 생성은 바로 커밋 (열린 트랜잭션의 미커밋 INSERT 를 다른 요청이 기다리지 않도록)
+    db.execute(
+        insert(WalletSyncStateModel).values(
+            wallet_address=wallet_address, chain=chain, last_block=0
+        ).on_conflict_do_nothing(index_elements=["wallet_address", "chain"])
+    )
+    db.commit()
+
+    while True:
+        try:
+            return db.query(WalletSyncStateModel).filter(
+                WalletSyncStateModel.wallet_address == wallet_address,
+                WalletSyncStateModel.chain == chain
+            ).with_for_update(nowait=True).populate_existing().one()
+        except OperationalError as e:
+            if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE:
+                raise
+            db.rollback()
+            await asyncio.sleep(SYNC_LOCK_RETRY_SECONDS)
+
+
+async def ingest_wallet(
+    db: Session,
+    provider: TransactionProvider,
+    wallet_address: str,
+    chain: str,
+    batch_size: int = 5000,
+    price_service: Optional[PriceService] = None,
+    token_registry: Optional[TokenRegistry] = None
+) -> IngestResult:
+    """체크포인트 이후의 새 트랜잭션만 받아서 transfers 테이블에 적재
+
+    제공자 페이지를 스트리밍으로 읽어 batch_size 단위로 COPY 하므로 메모리는 배치 크기만큼만 사용한다.
+    토큰 심볼/decimals 는 페이지마다 토큰 레지스트리에서 한 번에 조회한다.
+    price_service 가 주어지면 새 전송만 손익 집계(pnl_positions)에 반영한다.
+    모든 배치와 집계, 체크포인트 갱신은 한 트랜잭션으로 커밋되며, 같은 지갑의 수집은 워커 안에서는 지갑별 asyncio 락으로,
+    워커 사이에서는 체크포인트 행 잠금으로 차례로 실행된다.
+    """
+    wallet = normalize_wallet_address(wallet_address)
+    async with wallet_sync_lock(wallet, chain):
+        token_registry = token_registry or get_token_registry()
+        try:
+            state = await lock_sync_state(db, wallet, chain)
+        except Exception:
+            db.rollback()
+            raise
+        from_block = state.last_block
+
+        last_block = from_block
+        transactions_seen = 0
+        transfers_inserted = 0
+        new_transfers: List[NewTransfer] = []  # 집계 반영용 (price_service 가 있을 때만 보관)
+        batch: List[TransferRow] = []
+
+        def merge(rows: List[TransferRow]):
+            nonlocal transfers_inserted
+            inserted = copy_transfers(db, rows)
+            transfers_inserted += len(inserted)
+            if price_service is not None:
+                new_transfers.extend(inserted)
+
+        try:
+            async for page in provider.iter_pages(wallet, chain, from_block):
+                hints: Dict[str, TokenHint] = {}
+                for tx in page:
+                    hints.update(token_hints(tx))
+                tokens = await token_registry.resolve_many(db, chain, hints, hints)
+
+                for tx in page:
+                    transactions_seen += 1
+                    last_block = max(last_block, int(tx["block_height"]))
+                    batch.extend(normalize_transaction(tx, wallet, chain, tokens))
+
+                if len(batch) >= batch_size:
+                    merge(batch)
+                    batch = []
+
+            merge(batch)
+
+            if price_service is not None:
+                if from_block > 0 and not load_positions(db, wallet, chain):
+                    # 집계 도입 이전에 수집된 지갑은 전체 내역으로 한 번 백필
+                    await rebuild_positions(db, price_service, wallet, chain, token_registry)
+                else:
+                    await apply_new_transfers(db, price_service, wallet, chain, new_transfers, token_registry)
+
+            state.last_block = last_block
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        logger.info(
+            f"Ingested {transfers_inserted} transfers from {transactions_seen} transactions "
+            f"for {wallet} on {chain} (blocks {from_block + 1}~{last_block})"
+        )
+        return IngestResult(
+            wallet_address=wallet,
+            chain=chain,
+            from_block=from_block,
+            last_block=last_block,
+            transactions_seen=transactions_seen,
+            transfers_inserted=transfers_inserted
+        )
+
+
+_transaction_provider: Optional[TransactionProvider] = None
+
+
+def get_transaction_provider() -> TransactionProvider:
+    """설정값에 맞는 프로세스 단위 트랜잭션 제공자 (FastAPI 의존성으로도 사용)"""
+    global _transaction_provider
+    if _transaction_provider is None:
+        if settings.transaction_provider == "mock":
+            _transaction_provider = MockTransactionProvider(settings.transaction_fixture_path)
+        else:
+            _transaction_provider = CovalentTransactionProvider(
+                settings.covalent_api_key,
+                settings.covalent_base_url
+            )
+    return _transaction_provider
@@ -0,0 +1,146 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.services.metrics import DB_POOL_WAIT_SECONDS, DB_QUERY_SECONDS
+import time
+
+
+class RequestStats:
+    """요청 1개 동안의 DB 사용량
+
+    미들웨어가 요청 시작 시 contextvar 에 넣어두면, 스레드풀에서 실행되는 동기 핸들러에서도
+    (컨텍스트가 복사되므로) 같은 객체에 누적된다.
+    SQL 문은 파라미터가 분리된 문자열 그대로를 형태(shape)로 보고 실행 횟수를 센다.
+    """
+
+    __slots__ = ("queries", "commits", "db_seconds", "pool_wait_seconds", "shapes")
+
+    def __init__(self):
+        self.queries = 0
+        self.commits = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.shapes: Dict[str, int] = {}
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """threshold 번 이상 실행된 같은 형태의 SQL 문 (N+1 의심), 많이 실행된 순"""
+        return sorted(
+            ((statement, count) for statement, count in self.shapes.items() if count >= threshold),
+            key=lambda item: item[1],
+            reverse=True
+        )
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값"""
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="queries={self.queries} commits={self.commits}", '
+            f"db-pool;dur={self.pool_wait_seconds * 1000:.2f}"
+        )
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request_stats() -> RequestStats:
+    """현재 컨텍스트에서 새 요청 통계 시작"""
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+class TimedQueuePool(QueuePool):
+    """연결을 얻기까지의 대기 시간(풀 고갈 시 대기, 새 연결 생성 포함)을 기록하는 QueuePool"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            DB_POOL_WAIT_SECONDS.observe(waited)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.pool_wait_seconds += waited
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    DB_QUERY_SECONDS.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        stats.shapes[statement] = stats.shapes.get(statement, 0) + 1
+
+
+def _commit(conn):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.commits += 1
+
+
+def _handle_error(exception_context):
+    # 실패한 문은 after_cursor_execute 가 호출되지 않으므로 시작 시각만 정리
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def instrument_engine(engine: Engine):
+    """엔진에 SQL 실행 시간 측정 이벤트 등록"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    event.listen(engine, "commit", _commit)
+
+
+@contextmanager
+def count_queries() -> Iterator[RequestStats]:
+    """블록 안에서 실행된 SQL 문/커밋 수 측정
+
+    with count_queries() as stats:
+        ...
+    print(stats.queries, stats.commits)
+    """
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(maximum: int) -> Iterator[RequestStats]:
+    """블록 안의 SQL 문 수가 maximum 을 넘으면 AssertionError (실행된 문 목록 포함)"""
+    with count_queries() as stats:
+        yield stats
+    if stats.queries > maximum:
+        executed = "\n".join(f"  {count}x {statement}" for statement, count in stats.repeated(1))
+        raise AssertionError(f"Expected at most {maximum} queries, got {stats.queries}:\n{executed}")
+
+
+def response_query_count(headers) -> int:
+    """응답의 Server-Timing 헤더에서 SQL 문 수 추출 (TestClient 등 다른 스레드에서 호출한 요청용)
+
+    response = client.get(...)
+    assert response_query_count(response.headers) <= 3
+    """
+    timing = headers.get("server-timing", "")
+    marker = 'desc="queries='
+    start = timing.find(marker)
+    if start < 0:
+        raise AssertionError("Response has no Server-Timing db entry")
+    start += len(marker)
+    return int(timing[start:timing.index(" ", start)])
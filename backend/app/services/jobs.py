@@ -0,0 +1,91 @@
+from sqlalchemy import func
+from datetime import datetime, timedelta, timezone
+from app.config import settings
+from app.database import SessionLocal
+from app.models.transfer import WalletSyncStateModel
+from app.services.aggregates import load_positions, positions_to_results
+from app.services.export import export_snapshot
+from app.services.ingestion import get_transaction_provider, ingest_wallet
+from app.services.pnl import CostBasisMethod, save_pnl_results
+from app.services.price import get_price_service
+from app.services.scheduler import Scheduler
+from app.services.user_totals import TotalsVerifier
+from app.services.write_behind import wallet_info_buffer
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def sync_catchup():
+    """수집 체크포인트가 오래된 지갑부터 새 트랜잭션을 이어서 수집
+
+    한 번에 sync_catchup_batch 개 지갑만 처리하고, 처리한 지갑은 새 전송이 없어도 updated_at 을 갱신해서
+    다음 실행에서 다른 지갑이 먼저 선택되도록 한다. 지갑 하나가 실패해도 나머지는 계속 처리한다.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.sync_catchup_stale_seconds)
+    provider = get_transaction_provider()
+    price_service = get_price_service()
+
+    db = SessionLocal()
+    try:
+        stale = db.query(WalletSyncStateModel.wallet_address, WalletSyncStateModel.chain).filter(
+            WalletSyncStateModel.updated_at < cutoff
+        ).order_by(WalletSyncStateModel.updated_at).limit(settings.sync_catchup_batch).all()
+        db.rollback()
+
+        synced = failed = 0
+        for wallet_address, chain in stale:
+            try:
+                result = await ingest_wallet(
+                    db, provider, wallet_address, chain, settings.ingestion_batch_size, price_service
+                )
+                if result.transfers_inserted:
+                    positions = load_positions(db, wallet_address, chain)
+                    await wallet_info_buffer.flush_wallet(wallet_address)
+                    save_pnl_results(db, wallet_address, positions_to_results(positions, CostBasisMethod.AVERAGE))
+                db.query(WalletSyncStateModel).filter(
+                    WalletSyncStateModel.wallet_address == wallet_address,
+                    WalletSyncStateModel.chain == chain
+                ).update({"updated_at": func.now()}, synchronize_session=False)
+                db.commit()
+                synced += 1
+            except Exception as e:
+                db.rollback()
+                failed += 1
+                logger.warning(f"Catch-up sync failed for {wallet_address} on {chain}: {e!r}")
+
+        if stale:
+            logger.info(f"Catch-up sync finished: {synced} wallets synced, {failed} failed")
+    finally:
+        db.close()
+
+
+def scheduled_export():
+    """설정된 테이블 전체를 Parquet 스냅샷으로 내보내기 (스레드풀에서 실행)"""
+    results = export_snapshot()
+    logger.info(f"Scheduled export finished: {sum(result.rows for result in results)} rows")
+
+
+def register_jobs(scheduler: Scheduler):
+    """설정에서 켜진 주기 작업 등록 (주기가 0 이거나 cron 이 비어 있으면 등록하지 않음)"""
+    if settings.sync_catchup_interval > 0:
+        scheduler.add_job(
+            "sync_catchup",
+            sync_catchup,
+            interval=settings.sync_catchup_interval,
+            jitter=settings.scheduler_jitter
+        )
+    if settings.user_totals_verify_interval > 0:
+        scheduler.add_job(
+            "user_totals_verify",
+            TotalsVerifier(settings.user_totals_verify_batch),
+            interval=settings.user_totals_verify_interval,
+            jitter=settings.scheduler_jitter
+        )
+    if settings.export_cron:
+        scheduler.add_job(
+            "export_snapshot",
+            scheduled_export,
+            cron=settings.export_cron,
+            jitter=settings.scheduler_jitter
+        )
@@ -0,0 +1,226 @@
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from typing import Tuple
+import os
+import time
+
+# 응답 압축
+COMPRESSION_INPUT_BYTES = Counter(
+    "http_compression_input_bytes_total",
+    "압축 전 응답 바이트 수",
+    ["encoding"]
+)
+COMPRESSION_OUTPUT_BYTES = Counter(
+    "http_compression_output_bytes_total",
+    "압축 후 응답 바이트 수",
+    ["encoding"]
+)
+COMPRESSION_CPU_SECONDS = Counter(
+    "http_compression_cpu_seconds_total",
+    "응답 압축에 사용한 CPU 시간",
+    ["encoding"]
+)
+COMPRESSION_RATIO = Histogram(
+    "http_compression_ratio",
+    "응답별 압축률 (압축 후 / 압축 전)",
+    ["encoding"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.7, 0.9, 1.0)
+)
+COMPRESSION_SKIPPED = Counter(
+    "http_compression_skipped_total",
+    "압축하지 않고 보낸 응답 수",
+    ["reason"]
+)
+
+# 요청 수락 제어
+ADMISSION_REJECTED = Counter(
+    "http_admission_rejected_total",
+    "수락 제어로 거부한 요청 수",
+    ["route_class", "reason"]
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "http_admission_in_flight",
+    "라우트 종류별 처리 중인 요청 수",
+    ["route_class"],
+    multiprocess_mode="livesum"
+)
+ADMISSION_QUEUED = Gauge(
+    "http_admission_queued",
+    "라우트 종류별 실행 슬롯을 기다리는 요청 수",
+    ["route_class"],
+    multiprocess_mode="livesum"
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "http_admission_wait_seconds",
+    "실행 슬롯 대기 시간",
+    ["route_class"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+# 이벤트 푸시 (SSE/WebSocket)
+EVENT_SUBSCRIBERS = Gauge(
+    "event_subscribers",
+    "SSE/WebSocket 이벤트 구독자 수",
+    multiprocess_mode="livesum"
+)
+EVENTS_DROPPED = Counter(
+    "events_dropped_total",
+    "구독자에게 전달되지 않은 이벤트 수 (coalesced: 같은 key 의 새 값으로 대체 / overflow: 대기열 초과로 폐기)",
+    ["reason"]
+)
+
+# 백그라운드 작업 스케줄러
+SCHEDULER_JOB_SECONDS = Histogram(
+    "scheduler_job_duration_seconds",
+    "주기 작업 실행 시간",
+    ["job", "status"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+)
+SCHEDULER_JOB_OVERLAPS = Counter(
+    "scheduler_job_overlaps_total",
+    "이전 실행이 끝나지 않아 건너뛴 주기 작업 실행 수",
+    ["job"]
+)
+SCHEDULER_JOB_LEADER = Gauge(
+    "scheduler_job_leader",
+    "작업별 리더 워커 수 (정상이면 1, 0 이면 선출 대기 중)",
+    ["job"],
+    multiprocess_mode="livesum"
+)
+SCHEDULER_JOB_LAST_SUCCESS = Gauge(
+    "scheduler_job_last_success_timestamp_seconds",
+    "작업별 마지막 성공 시각 (unix time)",
+    ["job"],
+    multiprocess_mode="max"
+)
+
+# 사용자 합계 (users.total_loss / total_gain)
+USER_TOTALS_REPAIRED = Counter(
+    "user_totals_repaired_total",
+    "검증 작업이 wallet_info 합계와 달라서 다시 계산한 사용자 수"
+)
+
+# 트랜잭션 수집
+INGESTION_SKIPPED_TRANSFERS = Counter(
+    "ingestion_skipped_transfers_total",
+    "토큰 decimals 를 알 수 없어 수집하지 않은 전송 수",
+    ["chain"]
+)
+
+# wallet_info 쓰기 지연 (write-behind)
+WRITE_BEHIND_PENDING = Gauge(
+    "wallet_write_behind_pending",
+    "저장을 기다리는 (지갑, 티커) 수",
+    multiprocess_mode="livesum"
+)
+WRITE_BEHIND_COALESCED = Counter(
+    "wallet_write_behind_coalesced_total",
+    "저장 전에 같은 키의 새 값으로 합쳐진 갱신 수"
+)
+WRITE_BEHIND_FLUSHES = Counter(
+    "wallet_write_behind_flushes_total",
+    "버퍼 저장 횟수",
+    ["status"]
+)
+WRITE_BEHIND_DROPPED = Counter(
+    "wallet_write_behind_dropped_total",
+    "따로 저장해도 실패해서 버린 (지갑, 티커) 값 수"
+)
+WRITE_BEHIND_FLUSH_ROWS = Histogram(
+    "wallet_write_behind_flush_rows",
+    "저장 1회당 행 수",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+)
+WRITE_BEHIND_FLUSH_SECONDS = Histogram(
+    "wallet_write_behind_flush_seconds",
+    "저장 1회 (upsert + 커밋) 시간",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+# HTTP 요청
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "라우트/상태 코드별 요청 수",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "라우트별 요청 처리 시간 (응답 본문 전송 완료까지)",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+# 데이터베이스
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "SQL 문 1개 실행 시간",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "요청 1개에서 실행한 SQL 문 수",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "요청 1개에서 SQL 실행에 쓴 시간 합계",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "커넥션 풀에서 연결을 얻기까지 걸린 시간",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+
+# 캐시 (result: memory / db / shared / negative / miss, hit ratio = memory 또는 db 비율, negative 는 가격 없음 기록으로 답한 수)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "캐시 단계별 조회 결과 수",
+    ["cache", "result"]
+)
+
+# 검색 (kind: users / tickers, 캐시에서 반환한 검색은 제외)
+SEARCH_QUERY_SECONDS = Histogram(
+    "search_query_duration_seconds",
+    "검색 종류별 DB 조회 시간",
+    ["kind"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+# 민팅 처리 단계
+MINT_STAGE_SECONDS = Histogram(
+    "mint_stage_duration_seconds",
+    "민팅 요청 단계별 처리 시간",
+    ["operation", "stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+
+class StageTimer:
+    """mark() 호출 사이의 시간을 해당 단계의 소요 시간으로 기록"""
+
+    def __init__(self, histogram: Histogram, **labels: str):
+        self.histogram = histogram
+        self.labels = labels
+        self._started = time.perf_counter()
+
+    def mark(self, stage: str):
+        now = time.perf_counter()
+        self.histogram.labels(stage=stage, **self.labels).observe(now - self._started)
+        self._started = now
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheus 텍스트 형식으로 메트릭 출력
+
+    PROMETHEUS_MULTIPROC_DIR 가 설정되어 있으면 (멀티 워커) 모든 워커의 값을 합쳐서 출력한다.
+    이 경우 환경 변수는 prometheus_client 를 import 하기 전에 설정되어 있어야 한다.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,360 @@
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from app.models.money import float_to_units, units_to_decimal
+from app.models.user import UserModel
+from app.models.wallet_info import WalletInfoModel
+import numpy as np
+import uuid
+
+
+class CostBasisMethod(str, Enum):
+    """매수 원가 계산 방식 Enum"""
+    AVERAGE = "average"     # 이동평균법
+    FIFO = "fifo"           # 선입선출법
+
+
+class TransferRecord(BaseModel):
+    """지갑 전송 내역 (프론트엔드 TransactionRecord 와 호환)"""
+    token_address: str = Field(..., description="토큰 컨트랙트 주소")
+    ticker: str = Field(..., description="토큰 심볼")
+    type: str = Field(..., description="거래 타입 (buy/sell)")
+    amount: float = Field(..., description="거래 수량")
+    price: float = Field(default=0.0, description="거래 시점 가격 (USD)")
+    timestamp: float = Field(..., description="거래 시간 (unix seconds)")
+    tx_hash: Optional[str] = Field(None, description="트랜잭션 해시")
+
+
+class PnLResult(BaseModel):
+    """토큰별 손익 계산 결과"""
+    ticker: str
+    token_address: Optional[str] = None  # 토큰 컨트랙트 주소 (집계 기반 결과에만 존재)
+    token_id: Optional[int] = None       # 토큰 레지스트리 ID
+    total_bought: float = 0.0          # 총 매수 수량
+    total_sold: float = 0.0            # 총 매도 수량 (보유량 초과분 제외)
+    current_balance: float = 0.0       # 현재 보유량
+    avg_buyprice: float = 0.0          # 평균 매수가
+    avg_sellprice: float = 0.0         # 평균 매도가
+    current_price: float = 0.0         # 현재가
+    total_buyprice: float = 0.0        # 총 매수금액
+    total_sellprice: float = 0.0       # 총 매도금액
+    realized_pnl: float = 0.0          # 실현 손익
+    unrealized_pnl: float = 0.0        # 미실현 손익
+    loss_amount: float = 0.0           # 손실 금액
+    loss_rate: float = 0.0             # 손실률 (퍼센트)
+    last_trade_at: Optional[datetime] = None
+
+
+class TransferArrays(BaseModel):
+    """전송 내역의 컬럼 배열 표현 (벡터 연산용)"""
+    tickers: np.ndarray     # 토큰 심볼 (object)
+    sides: np.ndarray       # +1 매수 / -1 매도 (int8)
+    amounts: np.ndarray     # 수량 (float64)
+    prices: np.ndarray      # 가격 (float64)
+    timestamps: np.ndarray  # unix seconds (float64)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+def transfers_to_arrays(transfers: Sequence[TransferRecord]) -> TransferArrays:
+    """전송 내역 리스트를 컬럼 배열로 변환"""
+    n = len(transfers)
+    tickers = np.empty(n, dtype=object)
+    sides = np.empty(n, dtype=np.int8)
+    amounts = np.empty(n, dtype=np.float64)
+    prices = np.empty(n, dtype=np.float64)
+    timestamps = np.empty(n, dtype=np.float64)
+
+    for i, transfer in enumerate(transfers):
+        tickers[i] = transfer.ticker
+        sides[i] = 1 if transfer.type == "buy" else -1
+        amounts[i] = transfer.amount
+        prices[i] = transfer.price
+        timestamps[i] = transfer.timestamp
+
+    return TransferArrays(
+        tickers=tickers,
+        sides=sides,
+        amounts=amounts,
+        prices=prices,
+        timestamps=timestamps
+    )
+
+
+def _balances(signed_amounts: np.ndarray) -> np.ndarray:
+    """보유량 이하로만 매도된다고 가정한 잔고 계산
+
+    보유량을 초과한 매도는 잘라내므로 잔고는 0 에서 반사되는 누적합
+    b_t = S_t - min(0, min_{k<=t} S_k) 로 구할 수 있다.
+    """
+    cumulative = np.cumsum(signed_amounts)
+    floor = np.minimum.accumulate(np.minimum(cumulative, 0.0))
+    return cumulative - floor
+
+
+def _average_cost(
+    is_buy: np.ndarray,
+    amounts: np.ndarray,
+    prices: np.ndarray,
+    balances_before: np.ndarray,
+    balances: np.ndarray
+) -> np.ndarray:
+    """이동평균법 평균 단가 (각 시점 직후 기준)
+
+    평균 단가는 매수 시점에만 바뀌며 a_j = r_j * a_{j-1} + w_j 점화식을 따른다.
+    (r_j = 매수 전 잔고 / 매수 후 잔고, w_j = 매수금액 / 매수 후 잔고)
+    잔고가 0 이 된 뒤의 매수(r_j = 0)에서 구간을 나누고,
+    구간별 누적 log-sum-exp 로 점화식을 한 번에 푼다.
+    """
+    n = len(amounts)
+    avg = np.zeros(n, dtype=np.float64)
+    buy_idx = np.flatnonzero(is_buy & (amounts > 0))
+    if len(buy_idx) == 0:
+        return avg
+
+    b_before = balances_before[buy_idx]
+    b_after = balances[buy_idx]
+    w = amounts[buy_idx] * prices[buy_idx] / b_after
+
+    # 구간(epoch) 분리: 잔고 0 에서 새로 시작하는 매수
+    resets = b_before <= 0
+    resets[0] = True
+    segment = np.cumsum(resets) - 1
+
+    # 구간 내부 log r 누적합 (구간 시작점의 r 은 0 이므로 제외)
+    log_r = np.zeros(len(buy_idx), dtype=np.float64)
+    carry = ~resets
+    log_r[carry] = np.log(b_before[carry] / b_after[carry])
+    log_r_cum = np.cumsum(log_r)
+    log_r_cum -= log_r_cum[np.flatnonzero(resets)][segment]
+
+    with np.errstate(divide="ignore"):
+        v = np.log(w) - log_r_cum
+
+    # 구간별 누적 log-sum-exp: 뒤 구간일수록 큰 offset 을 더해 앞 구간 기여를 무시
+    finite = v[np.isfinite(v)]
+    span = float(finite.max() - finite.min()) if len(finite) else 0.0
+    shift = span + 64.0
+    running = np.logaddexp.accumulate(v + segment * shift) - segment * shift
+    buy_avg = np.exp(log_r_cum + running)
+
+    # 매도 시점은 직전 매수의 평균 단가를 그대로 유지
+    last_buy = np.maximum.accumulate(
+        np.where(is_buy & (amounts > 0), np.arange(n), -1)
+    )
+    position = np.searchsorted(buy_idx, last_buy[last_buy >= 0])
+    avg[last_buy >= 0] = buy_avg[position]
+    avg[balances <= 0] = 0.0
+    return avg
+
+
+def _calculate_token_pnl(
+    ticker: str,
+    sides: np.ndarray,
+    amounts: np.ndarray,
+    prices: np.ndarray,
+    timestamps: np.ndarray,
+    current_price: float,
+    method: CostBasisMethod
+) -> PnLResult:
+    """단일 토큰 손익 계산 (시간순 정렬된 배열 기준)"""
+    is_buy = sides > 0
+    balances = _balances(np.where(is_buy, amounts, -amounts))
+    balances_before = np.concatenate(([0.0], balances[:-1]))
+
+    # 실제 체결된 수량 (매도는 보유량 이하로 제한)
+    filled = np.where(is_buy, amounts, balances_before - balances)
+    sell_filled = np.where(is_buy, 0.0, filled)
+
+    total_bought = float(amounts[is_buy].sum())
+    total_sold = float(sell_filled.sum())
+    total_buyprice = float((amounts * prices)[is_buy].sum())
+    total_sellprice = float((sell_filled * prices).sum())
+    current_balance = float(balances[-1]) if len(balances) else 0.0
+
+    if method == CostBasisMethod.FIFO:
+        # 누적 매수 수량 -> 누적 매수 금액 곡선은 구간별 선형이므로
+        # 선입선출 원가는 누적 매도 구간을 이 곡선에 보간해서 구한다.
+        bought_qty = np.concatenate(([0.0], np.cumsum(np.where(is_buy, amounts, 0.0))))
+        bought_cost = np.concatenate(([0.0], np.cumsum(np.where(is_buy, amounts * prices, 0.0))))
+        sold_qty = np.cumsum(sell_filled)
+        cost_curve = np.interp(sold_qty, bought_qty, bought_cost)
+        cost_of_sold = float(cost_curve[-1]) if len(cost_curve) else 0.0
+        remaining_cost = total_buyprice - cost_of_sold
+    else:
+        avg = _average_cost(is_buy, amounts, prices, balances_before, balances)
+        avg_before = np.concatenate(([0.0], avg[:-1]))
+        cost_of_sold = float((sell_filled * avg_before).sum())
+        remaining_cost = float(avg[-1] * current_balance) if len(avg) else 0.0
+
+    realized_pnl = total_sellprice - cost_of_sold
+    unrealized_pnl = current_balance * current_price - remaining_cost
+    total_pnl = realized_pnl + unrealized_pnl
+    loss_amount = max(-total_pnl, 0.0)
+
+    return PnLResult(
+        ticker=ticker,
+        total_bought=total_bought,
+        total_sold=total_sold,
+        current_balance=current_balance,
+        avg_buyprice=total_buyprice / total_bought if total_bought > 0 else 0.0,
+        avg_sellprice=total_sellprice / total_sold if total_sold > 0 else 0.0,
+        current_price=current_price,
+        total_buyprice=total_buyprice,
+        total_sellprice=total_sellprice,
+        realized_pnl=realized_pnl,
+        unrealized_pnl=unrealized_pnl,
+        loss_amount=loss_amount,
+        loss_rate=loss_amount / total_buyprice * 100 if total_buyprice > 0 else 0.0,
+        last_trade_at=datetime.fromtimestamp(float(timestamps[-1]), tz=timezone.utc) if len(timestamps) else None
+    )
+
+
+def calculate_pnl(
+    transfers: TransferArrays,
+    current_prices: Optional[Dict[str, float]] = None,
+    method: CostBasisMethod = CostBasisMethod.AVERAGE
+) -> List[PnLResult]:
+    """지갑 전체 전송 내역으로 토큰별 손익 계산
+
+    토큰별로 한 번씩만 정렬/분할하고, 각 토큰 내부 계산은 모두 NumPy 벡터 연산이다.
+    current_prices 에 없는 토큰은 마지막 거래 가격을 현재가로 사용한다.
+    """
+    current_prices = current_prices or {}
+    if len(transfers.amounts) == 0:
+        return []
+
+    tickers, token_index = np.unique(transfers.tickers.astype(str), return_inverse=True)
+    order = np.lexsort((transfers.timestamps, token_index))
+    token_index = token_index[order]
+    sides = transfers.sides[order]
+    amounts = np.abs(transfers.amounts[order])
+    prices = transfers.prices[order]
+    timestamps = transfers.timestamps[order]
+
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(token_index)) + 1, [len(order)]))
+
+    results = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        ticker = str(tickers[token_index[start]])
+        current_price = current_prices.get(ticker, float(prices[end - 1]))
+        results.append(_calculate_token_pnl(
+            ticker,
+            sides[start:end],
+            amounts[start:end],
+            prices[start:end],
+            timestamps[start:end],
+            float(current_price),
+            method
+        ))
+    return results
+
+
+def pnl_from_totals(
+    avg_buyprice: Decimal,
+    avg_sellprice: Decimal,
+    current_price: Decimal,
+    total_buyprice: Decimal,
+    total_sellprice: Decimal
+) -> Decimal:
+    """평균가/총액만 있는 티커 통계로 손익 계산 (이동평균법 기준)
+
+    매수/매도 수량은 총액 / 평균가 로 역산하고, 남은 보유분은 현재가로 평가한다.
+    """
+    bought_qty = total_buyprice / avg_buyprice if avg_buyprice > 0 else Decimal(0)
+    sold_qty = total_sellprice / avg_sellprice if avg_sellprice > 0 else Decimal(0)
+    balance = max(bought_qty - sold_qty, Decimal(0))
+    return total_sellprice + balance * current_price - total_buyprice
+
+
+def loss_from_totals(
+    avg_buyprice: Decimal,
+    avg_sellprice: Decimal,
+    current_price: Decimal,
+    total_buyprice: Decimal,
+    total_sellprice: Decimal
+) -> Tuple[Decimal, float]:
+    """평균가/총액만 있는 티커 통계로 손실 금액과 손실률 계산 (이동평균법 기준)"""
+    pnl = pnl_from_totals(avg_buyprice, avg_sellprice, current_price, total_buyprice, total_sellprice)
+    loss_amount = max(-pnl, Decimal(0)).quantize(Decimal("0.00000001"))
+    loss_rate = float(loss_amount / total_buyprice * 100) if total_buyprice > 0 else 0.0
+    return loss_amount, loss_rate
+
+
+def save_pnl_results(
+    db: Session,
+    wallet_address: str,
+    results: Sequence[PnLResult]
+) -> List[WalletInfoModel]:
+    """손익 계산 결과를 wallet_info 에 저장
+
+    token_id 가 있는 결과는 (지갑 주소, token_id) 기준으로, 없는 결과는 (지갑 주소, 티커) 기준으로 upsert 한다.
+    token_id 가 없던 기존 행은 같은 티커의 레지스트리 토큰 결과가 들어오면 그 토큰으로 연결된다.
+    """
+    # 기존 사용자 확인 또는 생성
+    user = db.query(UserModel).filter(
+        UserModel.wallet_address == wallet_address
+    ).first()
+
+    if not user:
+        user = UserModel(
+            wallet_address=wallet_address,
+            uuid=uuid.uuid4()
+        )
+        db.add(user)
+        db.flush()
+
+    # 해당 지갑의 기존 wallet_info 를 한 번에 조회
+    token_ids = [result.token_id for result in results if result.token_id is not None]
+    by_token: Dict[int, WalletInfoModel] = {}
+    by_ticker: Dict[str, WalletInfoModel] = {}
+    for record in db.query(WalletInfoModel).filter(
+        WalletInfoModel.wallet_address == wallet_address,
+        or_(
+            WalletInfoModel.token_id.in_(token_ids),
+            WalletInfoModel.ticker.in_([result.ticker for result in results])
+        )
+    ).all():
+        if record.token_id is not None:
+            by_token[record.token_id] = record
+        else:
+            by_ticker[record.ticker] = record
+
+    records = []
+    for result in results:
+        if result.token_id is not None:
+            record = by_token.get(result.token_id) or by_ticker.pop(result.ticker, None)
+        else:
+            record = by_ticker.get(result.ticker)
+        if not record:
+            record = WalletInfoModel(
+                uuid=uuid.uuid4(),
+                user_id=user.id,
+                user_uuid=user.uuid,
+                wallet_address=wallet_address,
+                ticker=result.ticker
+            )
+            db.add(record)
+        if result.token_id is not None:
+            record.token_id = result.token_id
+            by_token[result.token_id] = record
+
+        # 엔진 결과(float)는 한 번만 8자리 단위로 반올림해서 저장 (Decimal(str(float)) 왕복 없이)
+        record.avg_buyprice = units_to_decimal(float_to_units(result.avg_buyprice))
+        record.avg_sellprice = units_to_decimal(float_to_units(result.avg_sellprice))
+        record.current_price = units_to_decimal(float_to_units(result.current_price))
+        record.total_buyprice = units_to_decimal(float_to_units(result.total_buyprice))
+        record.total_sellprice = units_to_decimal(float_to_units(result.total_sellprice))
+        record.loss_rate = result.loss_rate
+        record.loss_amount = units_to_decimal(float_to_units(result.loss_amount))
+        pnl_units = float_to_units(Decimal(result.realized_pnl) + Decimal(result.unrealized_pnl))
+        record.gain_amount = units_to_decimal(max(pnl_units, 0))
+        records.append(record)
+
+    db.commit()
+    return records
@@ -0,0 +1,329 @@
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from app.config import settings
+from app.database import SessionLocal
+from app.services.http_client import RateLimitedClient, get_provider_client
+from app.services.metrics import CACHE_LOOKUPS
+from app.models.token_price import TokenPriceModel
+import asyncio
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# (token_address, chain, date) 가격 키
+PriceKey = Tuple[str, str, date]
+
+# 제공자 조회에 실패한 키를 다시 조회하기까지 기다리는 시간 (초, 일시적인 오류일 수 있으므로 짧게)
+FAILED_FETCH_RETRY_SECONDS = 60.0
+
+
+class PriceProvider(ABC):
+    """과거 가격 제공자 인터페이스"""
+    name: str = "unknown"
+
+    @abstractmethod
+    async def fetch_range(
+        self,
+        token_address: str,
+        chain: str,
+        start: date,
+        end: date
+    ) -> Dict[date, float]:
+        """토큰의 [start, end] 기간 일별 USD 가격을 한 번에 조회"""
+
+
+class CovalentPriceProvider(PriceProvider):
+    """Covalent historical_by_addresses_v2 기반 가격 제공자"""
+    name = "covalent"
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str,
+        client: Optional[RateLimitedClient] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.client = client or get_provider_client()
+
+    async def fetch_range(self, token_address, chain, start, end):
+        url = f"{self.base_url}/pricing/historical_by_addresses_v2/{chain}/USD/{token_address}/"
+        response = await self.client.get(
+            url,
+            params={"from": start.isoformat(), "to": end.isoformat()},
+            headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        if data.get("error"):
+            raise Exception(f"Covalent price API error: {data.get('error_message')}")
+
+        prices = {}
+        for item in data.get("data") or []:
+            for point in item.get("prices") or []:
+                if point.get("price") is None or not point.get("date"):
+                    continue
+                prices[date.fromisoformat(point["date"][:10])] = float(point["price"])
+        return prices
+
+
+class FixturePriceProvider(PriceProvider):
+    """로컬 JSON fixture 기반 가격 제공자 (테스트/개발용)
+
+    fixture 형식: {"<chain>": {"<token_address>": {"YYYY-MM-DD": price}}}
+    """
+    name = "fixture"
+
+    def __init__(self, path: Optional[str] = None, data: Optional[dict] = None):
+        if data is None:
+            with open(path, "r") as f:
+                data = json.load(f)
+        self.data = {
+            chain: {address.lower(): series for address, series in tokens.items()}
+            for chain, tokens in data.items()
+        }
+        self.calls: List[Tuple[str, str, date, date]] = []  # 호출 기록 (테스트 검증용)
+
+    async def fetch_range(self, token_address, chain, start, end):
+        self.calls.append((token_address, chain, start, end))
+        series = self.data.get(chain, {}).get(token_address.lower(), {})
+        prices = {}
+        for day, price in series.items():
+            price_date = date.fromisoformat(day)
+            if start <= price_date <= end:
+                prices[price_date] = float(price)
+        return prices
+
+
+class PriceService:
+    """토큰 과거 가격 조회 서비스
+
+    메모리 LRU -> token_prices 테이블 -> 가격 제공자 순으로 조회한다.
+    제공자 호출은 토큰별로 필요한 날짜 범위를 묶어 한 번만 수행하고,
+    동시에 들어온 같은 키 요청은 진행 중인 조회 결과를 함께 기다린다.
+    제공자에 가격이 없는 키(스팸 토큰 등)는 NULL 가격 행으로 남기고 negative_ttl 초 동안 0.0 으로 답하며 다시 조회하지 않는다.
+    조회에 실패한 키는 메모리에만 FAILED_FETCH_RETRY_SECONDS 동안 기록한다.
+    """
+
+    def __init__(self, provider: PriceProvider, cache_size: int = 10000, negative_ttl: float = 21600.0):
+        self.provider = provider
+        self.cache_size = cache_size
+        self.negative_ttl = negative_ttl
+        self._cache: "OrderedDict[PriceKey, float]" = OrderedDict()
+        self._negative: "OrderedDict[PriceKey, float]" = OrderedDict()  # 가격 없음 키 -> 만료 시각 (time.monotonic)
+        self._inflight: Dict[PriceKey, asyncio.Future] = {}
+
+    def _cache_get(self, key: PriceKey) -> Optional[float]:
+        price = self._cache.get(key)
+        if price is not None:
+            self._cache.move_to_end(key)
+        return price
+
+    def _cache_put(self, key: PriceKey, price: float):
+        self._cache[key] = price
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _negative_fresh(self, key: PriceKey) -> bool:
+        expires = self._negative.get(key)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._negative[key]
+            return False
+        self._negative.move_to_end(key)
+        return True
+
+    def _negative_put(self, key: PriceKey, ttl: float):
+        self._negative[key] = time.monotonic() + ttl
+        self._negative.move_to_end(key)
+        while len(self._negative) > self.cache_size:
+            self._negative.popitem(last=False)
+
+    async def get_price(self, db: Session, token_address: str, chain: str, price_date: date) -> float:
+        """단일 (토큰, 체인, 날짜) 가격 조회"""
+        key = (token_address.lower(), chain, price_date)
+        prices = await self.get_prices(db, [key])
+        return prices[key]
+
+    async def get_prices(self, db: Session, keys: Iterable[PriceKey]) -> Dict[PriceKey, float]:
+        """여러 (토큰, 체인, 날짜) 가격을 한 번에 조회 (가격이 없으면 0.0)"""
+        wanted = {(address.lower(), chain, day) for address, chain, day in keys}
+        result: Dict[PriceKey, float] = {}
+
+        # 1. 메모리 캐시 (가격 없음 기록 포함)
+        missing = []
+        negative = 0
+        for key in wanted:
+            price = self._cache_get(key)
+            if price is not None:
+                result[key] = price
+            elif self._negative_fresh(key):
+                result[key] = 0.0
+                negative += 1
+            else:
+                missing.append(key)
+        CACHE_LOOKUPS.labels(cache="price", result="memory").inc(len(result) - negative)
+
+        # 2. 다른 요청이 이미 조회 중인 키는 그 결과를 기다림
+        waiting = {key: self._inflight[key] for key in missing if key in self._inflight}
+        missing = [key for key in missing if key not in waiting]
+        CACHE_LOOKUPS.labels(cache="price", result="shared").inc(len(waiting))
+
+        # 3. DB 캐시
+        if missing:
+            rows = db.query(TokenPriceModel).filter(
+                tuple_(
+                    TokenPriceModel.token_address,
+                    TokenPriceModel.chain,
+                    TokenPriceModel.price_date
+                ).in_(missing)
+            ).all()
+            now = datetime.now(timezone.utc)
+            found = 0
+            for row in rows:
+                key = (row.token_address, row.chain, row.price_date)
+                if row.price is not None:
+                    result[key] = float(row.price)
+                    self._cache_put(key, result[key])
+                    found += 1
+                    continue
+                # 가격 없음 기록: 아직 유효하면 남은 시간만큼 메모리에도 기록, 만료됐으면 다시 조회
+                remaining = self.negative_ttl - (now - row.created_at).total_seconds()
+                if remaining > 0:
+                    result[key] = 0.0
+                    self._negative_put(key, remaining)
+                    negative += 1
+            CACHE_LOOKUPS.labels(cache="price", result="db").inc(found)
+            missing = [key for key in missing if key not in result]
+        CACHE_LOOKUPS.labels(cache="price", result="negative").inc(negative)
+        CACHE_LOOKUPS.labels(cache="price", result="miss").inc(len(missing))
+
+        # 4. 제공자 조회 (토큰별 날짜 범위를 묶어서 한 번씩)
+        if missing:
+            groups: Dict[Tuple[str, str], List[date]] = {}
+            for address, chain, day in missing:
+                groups.setdefault((address, chain), []).append(day)
+
+            loop = asyncio.get_running_loop()
+            for key in missing:
+                self._inflight[key] = loop.create_future()
+
+            prices = {}
+            try:
+                fetched = await asyncio.gather(*[
+                    self._fetch_token_range(address, chain, days)
+                    for (address, chain), days in groups.items()
+                ])
+                failed = set()
+                for group, token_prices in zip(groups, fetched):
+                    if token_prices is None:
+                        failed.add(group)
+                    else:
+                        prices.update(token_prices)
+                # 제공자에 가격이 없는 키는 negative_ttl, 조회에 실패한 키는 잠깐 동안 다시 조회하지 않음
+                for key in missing:
+                    if key not in prices:
+                        failed_fetch = key[:2] in failed
+                        self._negative_put(key, FAILED_FETCH_RETRY_SECONDS if failed_fetch else self.negative_ttl)
+            finally:
+                for key in missing:
+                    result[key] = prices.get(key, 0.0)
+                    self._inflight.pop(key).set_result(result[key])
+
+        for key, future in waiting.items():
+            result[key] = await future
+
+        return result
+
+    async def _fetch_token_range(
+        self,
+        token_address: str,
+        chain: str,
+        days: List[date]
+    ) -> Optional[Dict[PriceKey, float]]:
+        """제공자에서 days 를 포함하는 기간 가격을 받아 DB/메모리 캐시에 저장
+
+        요청한 날짜 중 제공자 응답에 없는 날짜는 NULL 가격 행(가격 없음 기록)으로 저장한다.
+        조회 자체가 실패하면 아무것도 저장하지 않고 None 을 반환한다.
+        """
+        start, end = min(days), max(days)
+        try:
+            series = await self.provider.fetch_range(token_address, chain, start, end)
+        except Exception as e:
+            logger.warning(f"Price fetch failed for {token_address} on {chain} ({start}~{end}): {e}")
+            return None
+
+        prices = {(token_address, chain, day): price for day, price in series.items()}
+        for key, price in prices.items():
+            self._cache_put(key, price)
+
+        rows = {day: Decimal(str(price)) for (_, _, day), price in prices.items()}
+        rows.update({day: None for day in days if day not in series})
+        if rows:
+            # 호출 측 트랜잭션과 무관하게 가격 캐시만 별도 세션으로 저장
+            price_db = SessionLocal()
+            try:
+                statement = insert(TokenPriceModel).values([
+                    {
+                        "token_address": token_address,
+                        "chain": chain,
+                        "price_date": day,
+                        "price": price,
+                        "source": self.provider.name
+                    }
+                    for day, price in rows.items()
+                ])
+                # 저장된 가격은 그대로 두고, 가격 없음 기록만 새 가격으로 바꾸거나 확인 시간을 갱신
+                price_db.execute(statement.on_conflict_do_update(
+                    index_elements=["token_address", "chain", "price_date"],
+                    set_={
+                        "price": statement.excluded.price,
+                        "source": statement.excluded.source,
+                        "created_at": func.now()
+                    },
+                    where=TokenPriceModel.price.is_(None)
+                ))
+                price_db.commit()
+            except Exception as e:
+                price_db.rollback()
+                logger.warning(f"Failed to persist prices for {token_address} on {chain}: {e}")
+            finally:
+                price_db.close()
+
+        return prices
+
+
+def to_price_date(timestamp: float) -> date:
+    """unix timestamp 를 UTC 기준 가격 날짜로 변환"""
+    return datetime.utcfromtimestamp(timestamp).date()
+
+
+_price_service: Optional[PriceService] = None
+
+
+def create_price_provider() -> PriceProvider:
+    """설정값에 맞는 가격 제공자 생성"""
+    if settings.price_provider == "fixture":
+        return FixturePriceProvider(settings.price_fixture_path)
+    return CovalentPriceProvider(settings.covalent_api_key, settings.covalent_base_url)
+
+
+def get_price_service() -> PriceService:
+    """프로세스 단위 가격 서비스 (FastAPI 의존성으로도 사용)"""
+    global _price_service
+    if _price_service is None:
+        _price_service = PriceService(
+            create_price_provider(), settings.price_cache_size, settings.price_negative_ttl
+        )
+    return _price_service
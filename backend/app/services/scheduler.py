@@ -0,0 +1,324 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Union
+from app.config import settings
+from app.services.metrics import (
+    SCHEDULER_JOB_LAST_SUCCESS, SCHEDULER_JOB_LEADER, SCHEDULER_JOB_OVERLAPS, SCHEDULER_JOB_SECONDS
+)
+import anyio
+import asyncio
+import inspect
+import logging
+import random
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# advisory lock 네임스페이스 (pg_try_advisory_lock(int, int) 의 첫 번째 키, 다른 용도의 락과 겹치지 않게)
+LOCK_NAMESPACE = 0x43475331  # "CGS1"
+
+JobFunc = Callable[[], Union[None, Awaitable[None]]]
+
+
+class CronSchedule:
+    """5필드 cron 표현식 (분 시 일 월 요일, UTC 기준)
+
+    각 필드는 "*", "*/15", "5", "1-5", "0-30/10", "1,15" 형식을 받는다.
+    요일은 0(또는 7)이 일요일이고, 일과 요일이 모두 지정되면 둘 중 하나만 맞아도 실행한다 (cron 과 동일).
+    """
+
+    _FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        self.expression = expression
+        parsed = [self._parse(field, low, high) for field, (low, high) in zip(fields, self._FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self.days_restricted = fields[2] != "*"
+        self.weekdays_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> FrozenSet[int]:
+        values = set()
+        for part in field.split(","):
+            base, _, step = part.partition("/")
+            if base == "*":
+                start, end = low, high
+            elif "-" in base:
+                start, end = (int(value) for value in base.split("-", 1))
+            else:
+                start = end = int(base)
+            step_value = int(step) if step else 1
+            if not (low <= start <= end <= high) or step_value < 1:
+                raise ValueError(f"Invalid cron field: {field!r}")
+            values.update(range(start, end + 1, step_value))
+        return frozenset(values)
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.isoweekday() % 7) in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day or weekday
+        return day and weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """moment 이후 처음으로 일치하는 시각 (분 단위)"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+class Job:
+    """주기 작업 1개 (interval 초마다 또는 cron 시각마다 실행, 실행 시각에 0~jitter 초 무작위 지연 추가)"""
+
+    def __init__(
+        self,
+        name: str,
+        func: JobFunc,
+        interval: Optional[float] = None,
+        cron: Optional[str] = None,
+        jitter: float = 0.0
+    ):
+        if (interval is None) == (cron is None):
+            raise ValueError(f"Job {name} needs exactly one of interval or cron")
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Job {name} interval must be positive")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.cron = CronSchedule(cron) if cron else None
+        self.jitter = jitter
+        self.lock_key = zlib.crc32(name.encode()) & 0x7FFFFFFF
+        self.leader = False
+        self.next_run: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.last_started: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.runs = 0
+        self.overlaps = 0
+
+    def schedule_next(self, now: float, first: bool = False):
+        """다음 실행 시각 (unix time) 계산
+
+        interval 작업은 리더가 된 직후 0~jitter 초 안에 한 번 실행해서, 워커가 자주 재시작돼도 실행이 밀리지 않게 한다.
+        """
+        delay = random.uniform(0, self.jitter) if self.jitter else 0.0
+        if self.cron is not None:
+            moment = datetime.fromtimestamp(now, timezone.utc)
+            self.next_run = self.cron.next_after(moment).timestamp() + delay
+        elif first:
+            self.next_run = now + delay
+        else:
+            self.next_run = now + self.interval + delay
+
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "schedule": self.cron.expression if self.cron else f"every {self.interval:g}s",
+            "leader": self.leader,
+            "running": self.task is not None and not self.task.done(),
+            "next_run": datetime.fromtimestamp(self.next_run, timezone.utc).isoformat() if self.leader and self.next_run else None,
+            "last_started": datetime.fromtimestamp(self.last_started, timezone.utc).isoformat() if self.last_started else None,
+            "last_duration_seconds": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "last_error": self.last_error,
+            "runs": self.runs,
+            "overlaps": self.overlaps
+        }
+
+
+class Scheduler:
+    """워커 프로세스마다 하나씩 실행되는 주기 작업 스케줄러
+
+    작업마다 Postgres advisory lock 을 잡은 워커 하나만 리더가 되어 실행한다.
+    - 락은 스케줄러 전용 연결 1개의 세션 락이라, 리더 워커가 죽거나 연결이 끊기면 Postgres 가 바로 풀어준다.
+      다른 워커는 election_interval 마다 락을 시도하므로 그 안에 리더가 넘어간다.
+    - 연결이 끊긴 것을 알게 되면 모든 작업의 리더를 내려놓고 다시 연결해서 선출에 참여한다.
+    - 이전 실행이 끝나지 않았는데 다음 실행 시각이 되면 겹쳐 실행하지 않고 건너뛴다 (overlap 으로 기록).
+    - 작업 함수는 async 함수면 이벤트 루프에서, 일반 함수면 스레드풀에서 실행한다.
+    """
+
+    def __init__(self, election_interval: float = 10.0, tick: float = 1.0, database_url: Optional[str] = None):
+        self.election_interval = election_interval
+        self.tick = tick
+        self.database_url = database_url or settings.database_url
+        self.jobs: Dict[str, Job] = {}
+        self._engine: Optional[Engine] = None
+        self._connection: Optional[Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._next_election = 0.0
+
+    def add_job(
+        self,
+        name: str,
+        func: JobFunc,
+        interval: Optional[float] = None,
+        cron: Optional[str] = None,
+        jitter: float = 0.0
+    ) -> Job:
+        """작업 등록 (start 전에 호출)"""
+        if name in self.jobs:
+            raise ValueError(f"Job already registered: {name}")
+        job = Job(name, func, interval, cron, jitter)
+        self.jobs[name] = job
+        return job
+
+    @property
+    def engine(self) -> Engine:
+        # 워커 프로세스에서 처음 사용할 때 생성 (preload 한 마스터 프로세스의 연결을 물려받지 않도록)
+        if self._engine is None:
+            self._engine = create_engine(
+                self.database_url,
+                pool_size=1,
+                max_overflow=0,
+                pool_pre_ping=False,
+                isolation_level="AUTOCOMMIT",
+                connect_args={"connect_timeout": 5}
+            )
+        return self._engine
+
+    def _elect(self) -> List[str]:
+        """리더가 아닌 작업의 락을 시도하고, 새로 리더가 된 작업 이름을 반환 (스레드에서 실행)"""
+        try:
+            if self._connection is None:
+                self._connection = self.engine.connect()
+            else:
+                # 연결이 살아 있으면 이미 잡은 세션 락도 유지되고 있음
+                self._connection.execute(text("SELECT 1"))
+            acquired = []
+            for job in self.jobs.values():
+                if job.leader:
+                    continue
+                locked = self._connection.execute(
+                    text("SELECT pg_try_advisory_lock(:namespace, :key)"),
+                    {"namespace": LOCK_NAMESPACE, "key": job.lock_key}
+                ).scalar()
+                if locked:
+                    acquired.append(job.name)
+            return acquired
+        except Exception:
+            self._drop_connection()
+            raise
+
+    def _drop_connection(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.invalidate()
+                connection.close()
+            except Exception:
+                pass
+
+    def _resign_all(self):
+        for job in self.jobs.values():
+            if job.leader:
+                job.leader = False
+                SCHEDULER_JOB_LEADER.labels(job=job.name).dec()
+                logger.info(f"Released leadership of scheduled job {job.name}")
+
+    async def elect(self):
+        """락 선출 1회 (리더가 된 작업은 다음 실행 시각을 새로 계산)"""
+        try:
+            acquired = await anyio.to_thread.run_sync(self._elect)
+        except Exception as e:
+            logger.warning(f"Scheduler election failed: {e!r}")
+            self._resign_all()
+            return
+        now = time.time()
+        for name in acquired:
+            job = self.jobs[name]
+            job.leader = True
+            job.schedule_next(now, first=True)
+            SCHEDULER_JOB_LEADER.labels(job=name).inc()
+            logger.info(f"Became leader of scheduled job {name}")
+
+    async def _execute(self, job: Job):
+        started = time.perf_counter()
+        job.last_started = time.time()
+        status = "ok"
+        try:
+            if inspect.iscoroutinefunction(job.func):
+                await job.func()
+            else:
+                await anyio.to_thread.run_sync(job.func)
+            job.last_error = None
+            SCHEDULER_JOB_LAST_SUCCESS.labels(job=job.name).set(time.time())
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            status = "error"
+            job.last_error = f"{type(e).__name__}: {e}"
+            logger.error(f"Scheduled job {job.name} failed: {e!r}")
+        finally:
+            job.last_duration = time.perf_counter() - started
+            job.runs += 1
+            SCHEDULER_JOB_SECONDS.labels(job=job.name, status=status).observe(job.last_duration)
+
+    def run_due(self, now: float):
+        """실행 시각이 된 작업 시작 (리더인 작업만)"""
+        for job in self.jobs.values():
+            if not job.leader or job.next_run is None or now < job.next_run:
+                continue
+            if job.task is not None and not job.task.done():
+                job.overlaps += 1
+                SCHEDULER_JOB_OVERLAPS.labels(job=job.name).inc()
+                logger.warning(
+                    f"Scheduled job {job.name} still running after {now - job.last_started:.1f}s, skipping this run"
+                )
+            else:
+                job.task = asyncio.create_task(self._execute(job))
+            job.schedule_next(now)
+
+    async def _run(self):
+        while True:
+            if time.monotonic() >= self._next_election:
+                await self.elect()
+                self._next_election = time.monotonic() + self.election_interval
+            self.run_due(time.time())
+            await asyncio.sleep(self.tick)
+
+    def start(self):
+        """백그라운드 스케줄링 시작 (등록된 작업이 없으면 연결도 만들지 않음)"""
+        if self._task is None and self.jobs:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """스케줄링 중지: 실행 중인 작업을 취소하고 락 연결을 닫아 리더를 바로 넘긴다"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        running = [job.task for job in self.jobs.values() if job.task is not None and not job.task.done()]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        self._resign_all()
+        await anyio.to_thread.run_sync(self._drop_connection)
+
+    def snapshot(self) -> List[dict]:
+        return [job.snapshot() for job in self.jobs.values()]
+
+
+# 워커 프로세스당 하나의 스케줄러 (작업은 app.services.jobs 에서 등록)
+scheduler = Scheduler(election_interval=settings.scheduler_election_interval)
@@ -0,0 +1,241 @@
+from sqlalchemy import case, func, select, union
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from app.config import settings
+from app.models.user import UserModel
+from app.models.wallet_info import WalletInfoModel
+from app.services.metrics import CACHE_LOOKUPS, SEARCH_QUERY_SECONDS
+import re
+import time
+
+SEARCH_KINDS = ("users", "tickers")
+
+# 트라이그램 인덱스는 3글자 이상이어야 후보를 줄일 수 있음 (더 짧으면 접두사 검색만)
+TRIGRAM_MIN_LENGTH = 3
+
+HEX_DIGITS = frozenset("0123456789abcdef")
+
+# pg_trgm 이 단어로 보는 문자 (영숫자)
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+SearchKey = Tuple[str, str, int, int]
+
+
+def normalize_query(query: str) -> str:
+    """검색어 정규화 (앞뒤/연속 공백 정리, 소문자)"""
+    return " ".join(query.split()).lower()
+
+
+def escape_like(value: str) -> str:
+    """LIKE 패턴의 와일드카드 문자 이스케이프 (escape 문자는 백슬래시)"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def address_fragment(query: str) -> Tuple[Optional[str], bool]:
+    """검색어가 지갑 주소 일부이면 (0x 를 뗀 소문자 hex, 0x 로 시작했는지), 아니면 (None, False)"""
+    prefixed = query.startswith("0x")
+    fragment = query[2:] if prefixed else query
+    if not TRIGRAM_MIN_LENGTH <= len(fragment) <= 40 or not set(fragment) <= HEX_DIGITS:
+        return None, False
+    return fragment, prefixed
+
+
+def search_users(db: Session, query: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+    """사용자명 접두사/부분 일치와 지갑 주소 부분 일치로 사용자 검색
+
+    종류별로 인덱스를 타는 후보 조회를 최대 search_max_results 개씩만 읽고,
+    합친 후보만 점수순으로 정렬하므로 사용자 수와 관계없이 정렬 비용이 일정하다.
+    점수: 사용자명 정확히 일치 3, 접두사 일치 1, 주소 접두사 일치 1 + 트라이그램 유사도(0~1)
+    """
+    users = UserModel.__table__
+    username = func.lower(users.c.username)
+    username_c = username.collate("C")
+    address_hex = func.encode(users.c.wallet_address, "hex")
+    pattern = escape_like(query)
+    max_results = settings.search_max_results
+
+    # 접두사 일치: C 정렬 B-tree 를 순서대로 읽으므로 정확히 일치하는 이름이 먼저 나옴
+    candidates = [
+        select(users.c.id).where(username_c.like(f"{pattern}%", escape="\\")).order_by(username_c).limit(max_results)
+    ]
+    if len(query) >= TRIGRAM_MIN_LENGTH:
+        candidates.append(
+            select(users.c.id).where(username.like(f"%{pattern}%", escape="\\")).limit(max_results)
+        )
+    score = (
+        case((username == query, 3.0), else_=0.0)
+        + case((username.like(f"{pattern}%", escape="\\"), 1.0), else_=0.0)
+    )
+    similarity = func.similarity(func.coalesce(username, ""), query)
+
+    fragment, prefixed = address_fragment(query)
+    if fragment:
+        candidates.append(
+            select(users.c.id).where(
+                address_hex.like(f"{fragment}%" if prefixed else f"%{fragment}%")
+            ).limit(max_results)
+        )
+        score = score + case((address_hex.like(f"{fragment}%"), 1.0), else_=0.0)
+        similarity = func.greatest(similarity, func.similarity(address_hex, fragment))
+
+    matched = union(*candidates).subquery()
+    score = (score + similarity).label("score")
+    rows = db.execute(
+        select(
+            users.c.id, users.c.uuid, users.c.wallet_address, users.c.username,
+            users.c.total_loss, users.c.total_gain, score
+        ).join(matched, matched.c.id == users.c.id).order_by(score.desc(), users.c.id).offset(offset).limit(limit)
+    )
+    return [
+        {
+            "user_id": row.id,
+            "user_uuid": str(row.uuid),
+            "wallet_address": row.wallet_address,
+            "username": row.username,
+            "total_loss": float(row.total_loss or 0),
+            "total_gain": float(row.total_gain or 0),
+            "score": round(float(row.score), 4)
+        }
+        for row in rows
+    ]
+
+
+def trigrams(value: str) -> Set[str]:
+    """pg_trgm 과 같은 방식의 트라이그램 (단어마다 앞에 공백 2개, 뒤에 1개를 붙여서 3글자씩)"""
+    result: Set[str] = set()
+    for word in WORD_PATTERN.findall(value.lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(a: str, b: str) -> float:
+    """pg_trgm similarity() 와 같은 값 (공유 트라이그램 수 / 합집합 크기)"""
+    left, right = trigrams(a), trigrams(b)
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+def load_tickers(db: Session) -> List[str]:
+    """wallet_info 의 서로 다른 티커 목록
+
+    행이 아니라 티커 값만 ticker B-tree 인덱스로 건너뛰며 읽으므로
+    인기 티커를 가진 지갑이 수백만 개여도 티커 종류 수만큼만 인덱스를 탐색한다.
+    """
+    wallet_info = WalletInfoModel.__table__
+    tickers = select(func.min(wallet_info.c.ticker).label("ticker")).cte("tickers", recursive=True)
+    next_ticker = select(func.min(wallet_info.c.ticker)).where(
+        wallet_info.c.ticker > tickers.c.ticker
+    ).scalar_subquery()
+    tickers = tickers.union_all(select(next_ticker).where(tickers.c.ticker.isnot(None)))
+    return [row[0] for row in db.execute(select(tickers.c.ticker).where(tickers.c.ticker.isnot(None)))]
+
+
+class TickerVocabulary:
+    """티커 목록 메모리 캐시 (워커 프로세스별, ttl 초마다 다시 읽음)
+
+    티커 종류는 사용자 수와 관계없이 적으므로 목록 전체를 메모리에 두고 부분 일치/정렬을 파이썬에서 한다.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._tickers: List[str] = []
+        self._expires = 0.0
+
+    def get(self, db: Session) -> List[str]:
+        if self._expires < time.monotonic():
+            self._tickers = load_tickers(db)
+            self._expires = time.monotonic() + self.ttl
+        return self._tickers
+
+
+ticker_vocabulary = TickerVocabulary(ttl=settings.search_cache_ttl)
+
+
+def search_tickers(db: Session, query: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+    """지갑 정보에 있는 티커 중 검색어를 포함하는 티커 검색 (대소문자 무시)
+
+    점수: 정확히 일치 3, 접두사 일치 1 + 트라이그램 유사도(0~1)
+    """
+    query = query.upper()
+    results = []
+    for ticker in ticker_vocabulary.get(db):
+        name = ticker.upper()
+        if query not in name:
+            continue
+        score = (3.0 if name == query else 0.0) + (1.0 if name.startswith(query) else 0.0) + similarity(name, query)
+        results.append({"ticker": ticker, "score": round(score, 4)})
+    results.sort(key=lambda result: (-result["score"], result["ticker"]))
+    return results[offset:offset + limit]
+
+
+SEARCHERS = {
+    "users": search_users,
+    "tickers": search_tickers
+}
+
+
+class SearchCache:
+    """짧은 검색어 결과 LRU 캐시 (워커 프로세스별)
+
+    1~max_query_length 글자 접두사는 자주 검색되고 후보가 많아서 조회 비용이 가장 크므로 이런 검색어만 캐시한다.
+    항목은 ttl 초 뒤 만료되므로 새 사용자/티커는 최대 ttl 초 늦게 보인다.
+    """
+
+    def __init__(self, size: int, ttl: float, max_query_length: int):
+        self.size = size
+        self.ttl = ttl
+        self.max_query_length = max_query_length
+        self._entries: "OrderedDict[SearchKey, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+
+    def cacheable(self, query: str) -> bool:
+        return self.size > 0 and len(query) <= self.max_query_length
+
+    def get(self, key: SearchKey) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, results = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return results
+
+    def put(self, key: SearchKey, results: List[Dict[str, Any]]):
+        self._entries[key] = (time.monotonic() + self.ttl, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+
+search_cache = SearchCache(
+    size=settings.search_cache_size,
+    ttl=settings.search_cache_ttl,
+    max_query_length=settings.search_cache_max_query_length
+)
+
+
+def search(db: Session, query: str, kinds: Sequence[str], limit: int, offset: int) -> Dict[str, List[Dict[str, Any]]]:
+    """종류별 검색 결과 (짧은 검색어는 캐시에서 먼저 찾음)"""
+    query = normalize_query(query)
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for kind in kinds:
+        key = (kind, query, limit, offset)
+        cacheable = search_cache.cacheable(query)
+        if cacheable:
+            cached = search_cache.get(key)
+            CACHE_LOOKUPS.labels(cache="search", result="memory" if cached is not None else "miss").inc()
+            if cached is not None:
+                results[kind] = cached
+                continue
+
+        started = time.perf_counter()
+        results[kind] = SEARCHERS[kind](db, query, limit, offset)
+        SEARCH_QUERY_SECONDS.labels(kind=kind).observe(time.perf_counter() - started)
+        if cacheable:
+            search_cache.put(key, results[kind])
+    return results
@@ -0,0 +1,60 @@
+from sqlalchemy import Float, Numeric, cast, select
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+from pydantic import BaseModel
+from app.models.money import SCALE, Fixed8, money_units
+from typing import Any, Dict, Iterable, Optional, Sequence, Type, Union, get_args, get_origin
+import orjson
+
+
+def _is_float(annotation) -> bool:
+    """float 또는 Optional[float] 필드인지 확인"""
+    if annotation is float:
+        return True
+    if get_origin(annotation) is Union:
+        return any(arg is float for arg in get_args(annotation))
+    return False
+
+
+class RowEncoder:
+    """응답 모델 1개에 대한 사전 컴파일된 DB 행 -> JSON 인코더
+
+    생성 시 응답 모델의 필드 목록으로 SELECT 컬럼을 한 번만 구성해 두고, 요청마다
+    DB 결과 행을 Pydantic 객체 없이 바로 JSON 바이트로 변환한다.
+    - float 필드에 매핑된 Numeric 컬럼은 SQL 에서 double precision 으로 변환 (float(Decimal) 과 같은 값)
+    - 고정소수점(BIGINT) 금액 컬럼은 SQL 에서 정수 / 1e8 로 변환 (2^53 단위 이하에서는 float(Decimal) 과 같은 값)
+    - UUID, datetime 은 orjson 이 직접 직렬화 (str(uuid), isoformat() 과 같은 형식)
+    """
+
+    def __init__(
+        self,
+        response_model: Type[BaseModel],
+        orm_model: Any,
+        columns: Optional[Dict[str, ColumnElement]] = None
+    ):
+        columns = columns or {}
+        self.response_model = response_model
+        self.keys = tuple(response_model.model_fields)
+        self.columns = []
+        for name, field in response_model.model_fields.items():
+            column = columns.get(name)
+            if column is None:
+                column = getattr(orm_model, name)
+            if _is_float(field.annotation) and isinstance(column.type, Fixed8):
+                column = cast(money_units(column), Float) / SCALE
+            elif _is_float(field.annotation) and isinstance(column.type, Numeric) and not isinstance(column.type, Float):
+                column = cast(column, Float)
+            self.columns.append(column.label(name))
+
+    def select(self) -> Select:
+        """응답 모델 필드 순서대로 컬럼을 고른 SELECT 문"""
+        return select(*self.columns)
+
+    def encode(self, rows: Iterable[Sequence]) -> bytes:
+        """DB 결과 행 목록을 JSON 배열 바이트로 직렬화"""
+        keys = self.keys
+        return orjson.dumps([dict(zip(keys, row)) for row in rows])
+
+    def encode_one(self, row: Sequence) -> bytes:
+        """DB 결과 행 1개를 JSON 객체 바이트로 직렬화"""
+        return orjson.dumps(dict(zip(self.keys, row)))
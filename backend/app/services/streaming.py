@@ -0,0 +1,55 @@
+from sqlalchemy.sql import Select
+from typing import Iterator
+from datetime import date, datetime
+from decimal import Decimal
+from app.database import engine
+import csv
+import io
+import json
+
+# 스트리밍 응답 형식별 Content-Type
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    """json.dumps 가 직접 처리하지 못하는 DB 값 변환"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_rows(statement: Select, output_format: str = "ndjson", chunk_size: int = 1000) -> Iterator[bytes]:
+    """쿼리 결과를 NDJSON/CSV 바이트 청크로 스트리밍
+
+    서버 측 커서에서 chunk_size 행씩 받아 바로 직렬화하므로 결과 크기와 무관하게 메모리가 일정하다.
+    동기 제너레이터이므로 StreamingResponse 가 스레드풀에서 순회하며, 클라이언트가 읽은 만큼만
+    다음 청크를 가져온다 (백프레셔). 요청 세션과 별도의 커넥션을 사용하고, 순회가 끝나거나
+    중단되면 커서와 커넥션을 닫는다.
+    """
+    if output_format not in STREAM_MEDIA_TYPES:
+        raise ValueError(f"Unknown stream format: {output_format}")
+
+    with engine.connect() as connection:
+        result = connection.execution_options(yield_per=chunk_size).execute(statement)
+        columns = list(result.keys())
+
+        if output_format == "csv":
+            # 헤더는 첫 행을 기다리지 않고 바로 전송
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(columns)
+            yield buffer.getvalue().encode()
+
+        for rows in result.partitions():
+            buffer = io.StringIO()
+            if output_format == "csv":
+                csv.writer(buffer).writerows(rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue().encode()
@@ -0,0 +1,244 @@
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.database import SessionLocal
+from app.models.token import TokenModel, Token
+from app.services.http_client import RateLimitedClient, get_rpc_client
+from app.services.metrics import CACHE_LOOKUPS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 네이티브 코인 (ETH, MON 등) 을 나타내는 가상 컨트랙트 주소
+NATIVE_TOKEN_ADDRESS = "0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee"
+
+# 체인별 네이티브 코인 (심볼, 이름)
+NATIVE_TOKENS = {
+    "eth-mainnet": ("ETH", "Ether"),
+    "monad-testnet": ("MON", "Monad"),
+}
+
+# ERC20 메타데이터 함수 셀렉터
+ERC20_SELECTORS = {
+    "symbol": "0x95d89b41",
+    "name": "0x06fdde03",
+    "decimals": "0x313ce567",
+}
+
+# (symbol, name, decimals) - 트랜잭션 제공자가 함께 내려주는 메타데이터
+TokenHint = Tuple[Optional[str], Optional[str], Optional[int]]
+
+
+def _decode_string(result: Optional[str]) -> Optional[str]:
+    """eth_call 반환값을 문자열로 디코딩 (ABI string 또는 MKR 같은 bytes32 형식)"""
+    if not result or result == "0x":
+        return None
+    data = bytes.fromhex(result[2:])
+    try:
+        if len(data) >= 64:
+            offset = int.from_bytes(data[:32], "big")
+            length = int.from_bytes(data[offset:offset + 32], "big")
+            value = data[offset + 32:offset + 32 + length]
+        else:
+            value = data[:32].rstrip(b"\x00")
+        return value.decode("utf-8", errors="ignore").strip("\x00").strip() or None
+    except (ValueError, IndexError):
+        return None
+
+
+def _decode_uint(result: Optional[str]) -> Optional[int]:
+    """eth_call 반환값을 정수로 디코딩"""
+    if not result or result == "0x":
+        return None
+    try:
+        value = int(result, 16)
+    except ValueError:
+        return None
+    return value if value <= 255 else None
+
+
+class TokenRegistry:
+    """(체인, 컨트랙트 주소) 기준 토큰 메타데이터 레지스트리
+
+    조회 순서: 메모리 캐시 -> Postgres(tokens) -> 체인 RPC(ERC20 symbol/name/decimals).
+    체인에서 읽은 값은 tokens 테이블에 저장되어 프로세스 재시작 후에도 재사용된다.
+    토큰 메타데이터는 바뀌지 않으므로 메모리 캐시는 만료 없이 유지한다.
+    """
+
+    def __init__(
+        self,
+        rpc_urls: Optional[Dict[str, str]] = None,
+        rpc_batch_size: int = 50,
+        client: Optional[RateLimitedClient] = None
+    ):
+        self.rpc_urls = rpc_urls or {}
+        self.rpc_batch_size = rpc_batch_size
+        self.client = client
+        self._cache: Dict[Tuple[str, str], Token] = {}
+
+    async def resolve_many(
+        self,
+        db: Session,
+        chain: str,
+        addresses: Iterable[str],
+        hints: Optional[Dict[str, TokenHint]] = None
+    ) -> Dict[str, Token]:
+        """여러 토큰을 한 번에 조회 (주소 소문자 -> Token)
+
+        DB 조회는 한 번의 IN 쿼리, 체인 조회는 JSON-RPC 배치 요청으로 처리한다.
+        hints 는 RPC 를 쓸 수 없거나 실패한 토큰의 대체값으로만 사용한다.
+        """
+        wanted = {address.lower() for address in addresses if address}
+        hints = {address.lower(): hint for address, hint in (hints or {}).items()}
+        resolved: Dict[str, Token] = {}
+
+        # 1) 메모리 캐시
+        missing = []
+        for address in wanted:
+            token = self._cache.get((chain, address))
+            if token is not None:
+                resolved[address] = token
+            else:
+                missing.append(address)
+        CACHE_LOOKUPS.labels(cache="token", result="memory").inc(len(resolved))
+        if not missing:
+            return resolved
+
+        # 2) Postgres
+        for record in db.query(TokenModel).filter(
+            tuple_(TokenModel.chain, TokenModel.address).in_([(chain, address) for address in missing])
+        ).all():
+            token = self._cache[(chain, record.address)] = Token.model_validate(record)
+            resolved[record.address] = token
+        found = len(missing)
+        missing = [address for address in missing if address not in resolved]
+        CACHE_LOOKUPS.labels(cache="token", result="db").inc(found - len(missing))
+        CACHE_LOOKUPS.labels(cache="token", result="miss").inc(len(missing))
+        if not missing:
+            return resolved
+
+        # 3) 체인 조회 (실패 시 제공자 메타데이터 사용)
+        fetched: Dict[str, Tuple[str, Optional[str], int, str]] = {}
+        native = NATIVE_TOKENS.get(chain)
+        if NATIVE_TOKEN_ADDRESS in missing:
+            symbol, name, _ = hints.get(NATIVE_TOKEN_ADDRESS) or (None, None, None)
+            fetched[NATIVE_TOKEN_ADDRESS] = (
+                native[0] if native else symbol or "ETH",
+                native[1] if native else name,
+                18,
+                "native"
+            )
+
+        contracts = [address for address in missing if address != NATIVE_TOKEN_ADDRESS]
+        if contracts and self.rpc_urls.get(chain):
+            try:
+                fetched.update(await self._read_chain(chain, contracts))
+            except Exception as e:
+                logger.warning(f"Token metadata RPC failed on {chain}: {e}")
+
+        for address in contracts:
+            if address in fetched:
+                continue
+            symbol, name, decimals = hints.get(address) or (None, None, None)
+            if symbol and decimals is not None:
+                fetched[address] = (symbol, name, int(decimals), "covalent")
+
+        if fetched:
+            for token in self._persist(chain, fetched):
+                self._cache[(chain, token.address)] = token
+                resolved[token.address] = token
+
+        # 어디서도 못 찾은 토큰은 기본값으로 돌려주되 저장하지 않음 (다음 조회 때 다시 시도)
+        for address in missing:
+            if address not in resolved:
+                resolved[address] = Token(
+                    chain=chain, address=address, symbol="UNKNOWN", decimals=18, source="default"
+                )
+        return resolved
+
+    async def resolve(self, db: Session, chain: str, address: str) -> Token:
+        """토큰 1개 조회"""
+        return (await self.resolve_many(db, chain, [address]))[address.lower()]
+
+    async def _read_chain(self, chain: str, addresses: List[str]) -> Dict[str, Tuple[str, Optional[str], int, str]]:
+        """ERC20 symbol/name/decimals 를 JSON-RPC 배치 eth_call 로 조회"""
+        client = self.client or get_rpc_client()
+        url = self.rpc_urls[chain]
+        fields = list(ERC20_SELECTORS.items())
+        fetched = {}
+
+        for start in range(0, len(addresses), self.rpc_batch_size):
+            chunk = addresses[start:start + self.rpc_batch_size]
+            payload = [
+                {
+                    "jsonrpc": "2.0",
+                    "id": i * len(fields) + j,
+                    "method": "eth_call",
+                    "params": [{"to": address, "data": selector}, "latest"]
+                }
+                for i, address in enumerate(chunk)
+                for j, (_, selector) in enumerate(fields)
+            ]
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
+            results = {item.get("id"): item.get("result") for item in response.json()}
+
+            for i, address in enumerate(chunk):
+                symbol = _decode_string(results.get(i * len(fields)))
+                name = _decode_string(results.get(i * len(fields) + 1))
+                decimals = _decode_uint(results.get(i * len(fields) + 2))
+                if symbol and decimals is not None:
+                    fetched[address] = (symbol[:20], name[:100] if name else None, decimals, "rpc")
+        return fetched
+
+    def _persist(self, chain: str, fetched: Dict[str, Tuple[str, Optional[str], int, str]]) -> List[Token]:
+        """조회한 메타데이터를 tokens 에 저장하고 id 가 포함된 Token 반환
+
+        호출 측 트랜잭션과 분리하기 위해 별도 세션을 사용한다.
+        """
+        session = SessionLocal()
+        try:
+            session.execute(
+                insert(TokenModel).values([
+                    {
+                        "chain": chain,
+                        "address": address,
+                        "symbol": symbol,
+                        "name": name,
+                        "decimals": decimals,
+                        "source": source
+                    }
+                    for address, (symbol, name, decimals, source) in fetched.items()
+                ]).on_conflict_do_nothing(index_elements=["chain", "address"])
+            )
+            session.commit()
+            records = session.query(TokenModel).filter(
+                TokenModel.chain == chain,
+                TokenModel.address.in_(list(fetched))
+            ).all()
+            return [Token.model_validate(record) for record in records]
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Failed to persist token metadata on {chain}: {e}")
+            return [
+                Token(chain=chain, address=address, symbol=symbol, name=name, decimals=decimals, source=source)
+                for address, (symbol, name, decimals, source) in fetched.items()
+            ]
+        finally:
+            session.close()
+
+
+_token_registry: Optional[TokenRegistry] = None
+
+
+def get_token_registry() -> TokenRegistry:
+    """프로세스 단위 토큰 레지스트리 (FastAPI 의존성으로도 사용)"""
+    global _token_registry
+    if _token_registry is None:
+        rpc_urls = dict(settings.token_rpc_urls)
+        if settings.monad_rpc_url:
+            rpc_urls.setdefault("monad-testnet", settings.monad_rpc_url)
+        _token_registry = TokenRegistry(rpc_urls, settings.token_rpc_batch_size)
+    return _token_registry
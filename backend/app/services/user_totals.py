@@ -0,0 +1,181 @@
+"""
+users.total_loss / total_gain 증분 유지
+
+- total_loss = 사용자의 wallet_info.loss_amount 합계
+- total_gain = 사용자의 wallet_info.gain_amount 합계 (티커별 손익이 양수인 금액)
+
+ORM 으로 wallet_info 를 추가/수정/삭제하면 mapper 이벤트가 같은 flush(= 같은 트랜잭션) 안에서
+users 행에 변경분만 더한다. ORM 을 거치지 않는 일괄 upsert 는 apply_totals_delta 를 직접 호출한다.
+변경분은 1e-8 단위 정수로 계산하므로 Numeric/BIGINT 저장 방식 모두 반올림 오차가 쌓이지 않는다.
+동시 수정 등으로 생길 수 있는 차이는 verify_user_totals 가 주기적으로 찾아서 고친다.
+"""
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+from typing import Iterable, List, Optional, Tuple
+from app.database import SessionLocal, engine
+from app.models.money import decimal_to_units, money_units, units_to_decimal
+from app.models.user import UserModel
+from app.models.wallet_info import WalletInfoModel
+from app.services.metrics import USER_TOTALS_REPAIRED
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+TRACKED_COLUMNS = ("loss_amount", "gain_amount")
+
+
+def _units(value) -> int:
+    return decimal_to_units(value) if value is not None else 0
+
+
+def apply_totals_delta(connection: Connection, user_id: int, loss_units: int, gain_units: int):
+    """사용자 합계에 변경분(1e-8 단위) 더하기 (호출한 연결의 트랜잭션 안에서 실행)"""
+    if not loss_units and not gain_units:
+        return
+    users = UserModel.__table__
+    connection.execute(
+        update(users).where(users.c.id == user_id).values(
+            total_loss=func.coalesce(users.c.total_loss, 0) + units_to_decimal(loss_units),
+            total_gain=func.coalesce(users.c.total_gain, 0) + units_to_decimal(gain_units)
+        )
+    )
+
+
+def contribution_units(rows: Iterable[Tuple[object, object]]) -> Tuple[int, int]:
+    """(loss_amount, gain_amount) 목록의 합계 (1e-8 단위)"""
+    loss = gain = 0
+    for loss_amount, gain_amount in rows:
+        loss += _units(loss_amount)
+        gain += _units(gain_amount)
+    return loss, gain
+
+
+def _after_insert(mapper, connection: Connection, target: WalletInfoModel):
+    state = inspect(target)
+    values = [state.attrs[name].loaded_value for name in TRACKED_COLUMNS]
+    loss, gain = (_units(None if value is NO_VALUE else value) for value in values)
+    apply_totals_delta(connection, target.user_id, loss, gain)
+
+
+def _after_update(mapper, connection: Connection, target: WalletInfoModel):
+    state = inspect(target)
+    deltas = []
+    for name in TRACKED_COLUMNS:
+        history = state.attrs[name].history
+        if not history.added:
+            deltas.append(0)
+            continue
+        # active_history=True 이므로 값이 바뀌었으면 이전 값이 항상 deleted 에 있음
+        old = history.deleted[0] if history.deleted else None
+        deltas.append(_units(history.added[0]) - _units(old))
+    apply_totals_delta(connection, target.user_id, *deltas)
+
+
+def _after_delete(mapper, connection: Connection, target: WalletInfoModel):
+    state = inspect(target)
+    values = [state.attrs[name].loaded_value for name in TRACKED_COLUMNS]
+    if NO_VALUE in values:
+        # 만료된 객체를 삭제한 경우 이전 값을 알 수 없으므로 해당 사용자만 다시 합산
+        recompute_user_totals(connection, [target.user_id])
+        return
+    loss, gain = contribution_units([values])
+    apply_totals_delta(connection, target.user_id, -loss, -gain)
+
+
+event.listen(WalletInfoModel, "after_insert", _after_insert)
+event.listen(WalletInfoModel, "after_update", _after_update)
+event.listen(WalletInfoModel, "after_delete", _after_delete)
+
+
+def recompute_user_totals(connection: Connection, user_ids: Optional[List[int]] = None) -> int:
+    """wallet_info 에서 사용자 합계를 다시 계산해서 덮어쓰기 (user_ids 가 없으면 전체), 갱신한 행 수 반환"""
+    users = UserModel.__table__
+    wallet_info = WalletInfoModel.__table__
+
+    def total(column):
+        return select(func.coalesce(func.sum(column), 0)).where(
+            wallet_info.c.user_id == users.c.id
+        ).scalar_subquery()
+
+    statement = update(users).values(
+        total_loss=total(wallet_info.c.loss_amount),
+        total_gain=total(wallet_info.c.gain_amount)
+    )
+    if user_ids is not None:
+        if not user_ids:
+            return 0
+        statement = statement.where(users.c.id.in_(user_ids))
+    return connection.execute(statement).rowcount
+
+
+def verify_user_totals(db: Session, after_id: int = 0, limit: int = 500) -> Tuple[int, int, List[int]]:
+    """사용자 id 순으로 after_id 다음 limit 명의 합계를 wallet_info 와 비교하고, 다른 사용자는 다시 계산
+
+    정수(1e-8 단위)로 비교한다. (마지막으로 확인한 id, 확인한 사용자 수, 고친 사용자 id 목록) 을 반환하고
+    마지막 사용자까지 확인했으면 마지막 id 로 0 을 돌려준다 (다음 호출은 처음부터).
+    """
+    users = UserModel.__table__
+    wallet_info = WalletInfoModel.__table__
+
+    ids = [row[0] for row in db.execute(
+        select(users.c.id).where(users.c.id > after_id).order_by(users.c.id).limit(limit)
+    )]
+    if not ids:
+        return 0, 0, []
+
+    expected = select(
+        wallet_info.c.user_id,
+        func.sum(money_units(wallet_info.c.loss_amount)).label("loss"),
+        func.sum(money_units(wallet_info.c.gain_amount)).label("gain")
+    ).where(wallet_info.c.user_id.in_(ids)).group_by(wallet_info.c.user_id).subquery()
+
+    drifted = [row[0] for row in db.execute(
+        select(users.c.id).select_from(
+            users.outerjoin(expected, expected.c.user_id == users.c.id)
+        ).where(
+            users.c.id.in_(ids),
+            (func.coalesce(money_units(users.c.total_loss), 0) != func.coalesce(expected.c.loss, 0))
+            | (func.coalesce(money_units(users.c.total_gain), 0) != func.coalesce(expected.c.gain, 0))
+        )
+    )]
+
+    if drifted:
+        recompute_user_totals(db.connection(), drifted)
+        USER_TOTALS_REPAIRED.inc(len(drifted))
+        logger.warning(f"Repaired total_loss/total_gain drift for {len(drifted)} users: {drifted[:20]}")
+    db.commit()
+
+    last_id = ids[-1] if len(ids) == limit else 0
+    return last_id, len(ids), drifted
+
+
+class TotalsVerifier:
+    """주기 작업용: 실행할 때마다 다음 구간의 사용자를 확인하고, 끝까지 가면 처음부터 다시 확인"""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.after_id = 0
+
+    def __call__(self):
+        db = SessionLocal()
+        try:
+            self.after_id, checked, drifted = verify_user_totals(db, self.after_id, self.batch_size)
+            logger.debug(f"Verified totals of {checked} users, {len(drifted)} repaired")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    # 사용 예 (gain_amount 컬럼 추가 또는 대량 적재 후 한 번 실행): python -m app.services.user_totals
+    parser = argparse.ArgumentParser(description="users.total_loss / total_gain 을 wallet_info 에서 다시 계산")
+    parser.parse_args()
+    with engine.begin() as connection:
+        updated = recompute_user_totals(connection)
+    print(f"Recomputed totals for {updated} users")
@@ -0,0 +1,315 @@
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.config import settings
+from app.database import SessionLocal
+from app.models.address import normalize_wallet_address
+from app.models.money import MAX_BIGINT_UNITS, MAX_UNITS, decimal_to_units
+from app.models.user import UserModel
+from app.models.wallet_info import WalletInfoModel
+from app.services.events import publish_event
+from app.services.metrics import (
+    WRITE_BEHIND_COALESCED, WRITE_BEHIND_DROPPED, WRITE_BEHIND_FLUSH_ROWS, WRITE_BEHIND_FLUSH_SECONDS,
+    WRITE_BEHIND_FLUSHES, WRITE_BEHIND_PENDING
+)
+from app.services.user_totals import apply_totals_delta, contribution_units
+import anyio
+import asyncio
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# upsert 로 덮어쓰는 컬럼 (티커 통계와 그로부터 계산한 손실/수익)
+UPSERT_COLUMNS = (
+    "avg_buyprice", "avg_sellprice", "current_price", "total_buyprice",
+    "total_sellprice", "loss_rate", "loss_amount", "gain_amount"
+)
+
+MONEY_COLUMNS = tuple(column for column in UPSERT_COLUMNS if column != "loss_rate")
+TICKER_MAX_LENGTH = WalletInfoModel.__table__.c.ticker.type.length
+
+Key = Tuple[str, str]
+
+
+def validate_wallet_info_row(ticker: str, value: Dict[str, Any]):
+    """저장할 수 없는 값이면 ValueError (티커 길이, 금액 컬럼 범위)
+
+    고정소수점 모드의 BIGINT 는 Numeric(20, 8) 보다 범위가 좁으므로 설정에 맞는 한도로 검사한다.
+    """
+    if not ticker or len(ticker) > TICKER_MAX_LENGTH:
+        raise ValueError(f"Ticker must be 1-{TICKER_MAX_LENGTH} characters: {ticker!r}")
+    limit = MAX_BIGINT_UNITS if settings.money_fixed_point else MAX_UNITS
+    for column in MONEY_COLUMNS:
+        if abs(decimal_to_units(value[column])) > limit:
+            raise ValueError(f"{column} out of range for {ticker}: {value[column]}")
+
+
+def is_transient_error(error: Exception) -> bool:
+    """연결/풀/교착 같은 일시적인 DB 오류인지 (값이나 제약 조건 오류는 다시 시도해도 실패)"""
+    return isinstance(error, (OperationalError, PoolTimeoutError)) or getattr(error, "connection_invalidated", False)
+
+
+def ensure_users(db: Session, wallet_addresses: List[str]) -> Dict[str, Tuple[int, uuid.UUID]]:
+    """지갑 주소별 (user id, uuid) 조회, 없는 사용자는 한 번에 생성"""
+    def lookup() -> Dict[str, Tuple[int, uuid.UUID]]:
+        return {
+            row.wallet_address: (row.id, row.uuid)
+            for row in db.query(UserModel.id, UserModel.uuid, UserModel.wallet_address).filter(
+                UserModel.wallet_address.in_(wallet_addresses)
+            )
+        }
+
+    users = lookup()
+    missing = [address for address in wallet_addresses if address not in users]
+    if missing:
+        db.execute(insert(UserModel).values([
+            {"wallet_address": address, "uuid": uuid.uuid4()} for address in missing
+        ]).on_conflict_do_nothing(index_elements=["wallet_address"]))
+        users = lookup()
+    return users
+
+
+def upsert_wallet_info_rows(db: Session, rows: Dict[Key, Dict[str, Any]]) -> Dict[str, Tuple[int, uuid.UUID]]:
+    """(지갑 주소, 티커) 별 통계를 하나의 INSERT ... ON CONFLICT 문으로 저장하고 지갑별 (user id, uuid) 반환 (커밋은 호출한 쪽에서)
+
+    덮어쓰는 기존 행을 먼저 잠그고 읽어서 사용자 합계(total_loss/total_gain)에 변경분만 반영한다.
+    키 순서대로 잠가서 동시에 실행되는 upsert 끼리 교착 상태가 생기지 않게 한다.
+    """
+    keys = sorted(rows)
+    users = ensure_users(db, sorted({wallet_address for wallet_address, _ in keys}))
+
+    previous = db.query(
+        WalletInfoModel.user_id, WalletInfoModel.loss_amount, WalletInfoModel.gain_amount
+    ).filter(
+        tuple_(WalletInfoModel.wallet_address, WalletInfoModel.ticker).in_(keys),
+        WalletInfoModel.token_id.is_(None)
+    ).order_by(WalletInfoModel.wallet_address, WalletInfoModel.ticker).with_for_update().all()
+
+    statement = insert(WalletInfoModel).values([
+        {
+            "uuid": uuid.uuid4(),
+            "user_id": users[wallet_address][0],
+            "user_uuid": users[wallet_address][1],
+            "wallet_address": wallet_address,
+            "ticker": ticker,
+            **rows[(wallet_address, ticker)]
+        }
+        for wallet_address, ticker in keys
+    ])
+    db.execute(statement.on_conflict_do_update(
+        index_elements=["wallet_address", "ticker"],
+        index_where=WalletInfoModel.token_id.is_(None),
+        set_={column: statement.excluded[column] for column in UPSERT_COLUMNS} | {"updated_at": func.now()}
+    ))
+
+    # ORM 을 거치지 않은 upsert 이므로 사용자 합계는 직접 갱신 (같은 트랜잭션)
+    deltas: Dict[int, List[int]] = {}
+    for (wallet_address, _), value in rows.items():
+        loss, gain = contribution_units([(value["loss_amount"], value["gain_amount"])])
+        delta = deltas.setdefault(users[wallet_address][0], [0, 0])
+        delta[0] += loss
+        delta[1] += gain
+    for user_id, loss_amount, gain_amount in previous:
+        loss, gain = contribution_units([(loss_amount, gain_amount)])
+        delta = deltas.setdefault(user_id, [0, 0])
+        delta[0] -= loss
+        delta[1] -= gain
+    connection = db.connection()
+    for user_id, (loss, gain) in sorted(deltas.items()):
+        apply_totals_delta(connection, user_id, loss, gain)
+    return users
+
+
+class WalletInfoBuffer:
+    """wallet_info 쓰기 지연(write-behind) 버퍼 (워커 프로세스당 하나)
+
+    같은 (지갑, 티커) 의 갱신은 메모리에서 마지막 값으로 합쳐 두었다가
+    flush_interval 마다 또는 max_rows 개가 쌓이면 하나의 upsert 트랜잭션으로 저장한다.
+    - 한도: 대기 중인 키가 max_pending 에 도달하면 submit 이 False 를 반환하고 호출한 쪽은 바로 저장한다.
+      프로세스가 비정상 종료되면 잃을 수 있는 갱신은 최대 max_pending 개, flush_interval 동안의 값이다.
+      (정상 종료 시에는 stop 에서 남은 값을 모두 저장)
+    - 검증: submit 은 컬럼에 들어가지 않는 값(긴 티커, 범위를 넘는 금액)을 ValueError 로 거부한다.
+    - 저장 실패: 연결 오류 같은 일시적인 실패면 값을 버퍼로 되돌려 다음 주기에 다시 시도한다 (그 사이 들어온 새 값이 우선).
+      그 외의 실패는 지갑별, 다시 행별로 나눠 저장하고 혼자서도 실패하는 행만 로그를 남기고 버린다
+      (한 행 때문에 나머지 저장이 계속 막히지 않도록).
+    - 즉시 반영: 같은 지갑을 직접 쓰는 경로(민팅 등)는 먼저 flush_wallet 을 호출해서
+      버퍼에 남은 예전 값이 나중에 새 값을 덮어쓰지 않게 한다 (그 지갑을 저장하는 중이면 끝날 때까지 기다림).
+    워커마다 버퍼가 따로 있으므로, 같은 키를 여러 워커가 받으면 마지막으로 저장한 워커의 값이 남는다.
+    """
+
+    def __init__(self, flush_interval: float, max_rows: int, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self.pending: "OrderedDict[Key, Dict[str, Any]]" = OrderedDict()
+        # 버퍼에서 꺼내 저장 중인 지갑 (pending 에는 없지만 아직 커밋되지 않음)
+        self.flushing: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def submit(self, wallet_address: str, values: List[Dict[str, Any]]) -> bool:
+        """티커별 값을 버퍼에 넣기 (한도를 넘으면 넣지 않고 False, 호출한 쪽에서 바로 저장)
+
+        저장할 수 없는 값이 하나라도 있으면 아무것도 넣지 않고 ValueError.
+        """
+        for value in values:
+            validate_wallet_info_row(value["ticker"], value)
+        keys = [(wallet_address, value["ticker"]) for value in values]
+        new_keys = sum(1 for key in keys if key not in self.pending)
+        if len(self.pending) + new_keys > self.max_pending:
+            return False
+
+        for key, value in zip(keys, values):
+            if key in self.pending:
+                WRITE_BEHIND_COALESCED.inc()
+            self.pending[key] = {column: value[column] for column in UPSERT_COLUMNS}
+        WRITE_BEHIND_PENDING.set(len(self.pending))
+        if len(self.pending) >= self.max_rows and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def _write(self, rows: Dict[Key, Dict[str, Any]]):
+        db = SessionLocal()
+        try:
+            upsert_wallet_info_rows(db, rows)
+            for wallet_address in sorted({wallet_address for wallet_address, _ in rows}):
+                publish_event(db, "leaderboard", wallet_address, {"wallet_address": wallet_address})
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _write_isolating(self, rows: Dict[Key, Dict[str, Any]], dropped: List[Key]):
+        """rows 를 저장하고, 실패하면 지갑별 -> 행별로 나눠 다시 저장 (혼자서도 실패하는 행은 dropped 에 넣고 버림)
+
+        일시적인 DB 오류는 나눠도 소용없으므로 그대로 예외를 올린다.
+        """
+        try:
+            self._write(rows)
+            return
+        except Exception as e:
+            if is_transient_error(e):
+                raise
+            error = e
+
+        if len(rows) == 1:
+            key = next(iter(rows))
+            dropped.append(key)
+            WRITE_BEHIND_DROPPED.inc()
+            logger.error(f"Dropped buffered wallet_info row {key[0]} {key[1]!r}: {error!r}")
+            return
+
+        wallets = sorted({wallet_address for wallet_address, _ in rows})
+        if len(wallets) > 1:
+            logger.warning(f"Write-behind flush of {len(rows)} wallet_info rows failed, retrying per wallet: {error!r}")
+            groups = [{key: value for key, value in rows.items() if key[0] == wallet_address} for wallet_address in wallets]
+        else:
+            groups = [{key: value} for key, value in rows.items()]
+        for group in groups:
+            self._write_isolating(group, dropped)
+
+    async def flush(self):
+        """대기 중인 값을 모두 저장 (동시에 한 번만 실행)"""
+        async with self.lock:
+            await self._flush_locked()
+
+    async def _flush_locked(self):
+        # self.lock 을 잡은 상태에서만 호출
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, OrderedDict()
+        WRITE_BEHIND_PENDING.set(0)
+        self.flushing = {wallet_address for wallet_address, _ in rows}
+        dropped: List[Key] = []
+        started = time.perf_counter()
+        try:
+            await anyio.to_thread.run_sync(self._write_isolating, rows, dropped)
+        except Exception as e:
+            WRITE_BEHIND_FLUSHES.labels(status="error").inc()
+            # 저장하지 못한 값을 되돌림 (그 사이 들어온 같은 키의 새 값이 우선, 이미 버린 행은 제외)
+            # 나눠 저장하던 중이면 일부는 이미 커밋됐지만 같은 값의 upsert 라 다시 저장해도 결과가 같음
+            for key, value in rows.items():
+                if key not in dropped:
+                    self.pending.setdefault(key, value)
+            WRITE_BEHIND_PENDING.set(len(self.pending))
+            logger.error(f"Write-behind flush of {len(rows)} wallet_info rows failed: {e!r}")
+            raise
+        finally:
+            self.flushing = set()
+        WRITE_BEHIND_FLUSHES.labels(status="partial" if dropped else "ok").inc()
+        WRITE_BEHIND_FLUSH_ROWS.observe(len(rows))
+        WRITE_BEHIND_FLUSH_SECONDS.observe(time.perf_counter() - started)
+
+    def _holds(self, wallet_address: str) -> bool:
+        return any(key[0] == wallet_address for key in self.pending)
+
+    async def flush_wallet(self, wallet_address: str):
+        """이 지갑의 값이 버퍼에 있거나 저장 중이면 저장이 끝날 때까지 기다림 (직접 쓰기 전에 호출, 실패하면 예외)"""
+        if not self.pending and not self.flushing:
+            return
+        try:
+            wallet_address = normalize_wallet_address(wallet_address)
+        except ValueError:
+            return
+        if not self._holds(wallet_address) and wallet_address not in self.flushing:
+            return
+        # 진행 중인 저장이 끝나기를 기다린 뒤, 실패해서 되돌려졌거나 그 사이 새로 들어온 값이 있으면 저장
+        async with self.lock:
+            if self._holds(wallet_address):
+                await self._flush_locked()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # 다음 주기에 다시 시도 (실패 로그는 flush 에서 남김)
+                await asyncio.sleep(self.flush_interval)
+
+    def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기 저장을 멈추고 남은 값을 모두 저장"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.error(f"Dropped {len(self.pending)} buffered wallet_info rows on shutdown")
+
+
+# 워커 프로세스당 하나의 버퍼 (WALLET_WRITE_BEHIND_ENABLED 일 때만 사용)
+wallet_info_buffer = WalletInfoBuffer(
+    flush_interval=settings.wallet_write_behind_flush_ms / 1000,
+    max_rows=settings.wallet_write_behind_max_rows,
+    max_pending=settings.wallet_write_behind_max_pending
+)
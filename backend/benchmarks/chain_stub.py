@@ -0,0 +1,125 @@
+"""
+Crypto Graves - 벤치마크용 체인 JSON-RPC 스텁
+공용 테스트넷 대신 벤치마크 프로세스 안에서 뜨는 최소 JSON-RPC 서버입니다.
+헬스 체크(eth_blockNumber), 토큰 메타데이터 조회(ERC20 eth_call), 트랜잭션 전송/영수증 조회에
+고정된 응답을 돌려주며, --chain-latency-ms 로 RPC 지연을 흉내낼 수 있습니다.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from app.services.token_registry import ERC20_SELECTORS
+import hashlib
+import itertools
+import json
+import threading
+import time
+
+
+def _encode_string(value: str) -> str:
+    """ABI string 반환값 인코딩"""
+    data = value.encode()
+    padded = data + b"\x00" * (-len(data) % 32)
+    return "0x" + (32).to_bytes(32, "big").hex() + len(data).to_bytes(32, "big").hex() + padded.hex()
+
+
+def _encode_uint(value: int) -> str:
+    return "0x" + value.to_bytes(32, "big").hex()
+
+
+class ChainStub:
+    """스레드에서 실행되는 JSON-RPC 스텁 서버 (단일/배치 요청 지원)"""
+
+    def __init__(self, chain_id: int = 10143, latency_ms: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.chain_id = chain_id
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self._started = time.monotonic()
+        self._nonce = itertools.count()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def block_number(self) -> int:
+        # 1초에 블록 1개
+        return 1_000_000 + int(time.monotonic() - self._started)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request.get("method")
+        params = request.get("params") or []
+        self.calls += 1
+
+        if method == "eth_chainId":
+            result: Any = hex(self.chain_id)
+        elif method == "eth_blockNumber":
+            result = hex(self.block_number())
+        elif method == "eth_call":
+            data = (params[0] or {}).get("data", "") if params else ""
+            if data.startswith(ERC20_SELECTORS["symbol"]):
+                result = _encode_string("STUB")
+            elif data.startswith(ERC20_SELECTORS["name"]):
+                result = _encode_string("Stub Token")
+            elif data.startswith(ERC20_SELECTORS["decimals"]):
+                result = _encode_uint(18)
+            else:
+                result = "0x"
+        elif method in ("eth_gasPrice", "eth_maxPriorityFeePerGas"):
+            result = hex(1_000_000_000)
+        elif method == "eth_estimateGas":
+            result = hex(200_000)
+        elif method == "eth_getTransactionCount":
+            result = hex(next(self._nonce))
+        elif method == "eth_getBalance":
+            result = hex(10 ** 20)
+        elif method == "eth_sendRawTransaction":
+            result = "0x" + hashlib.sha256(str(params).encode()).hexdigest()
+        elif method == "eth_getTransactionReceipt":
+            result = {
+                "transactionHash": params[0] if params else "0x" + "0" * 64,
+                "blockNumber": hex(self.block_number()),
+                "status": "0x1",
+                "gasUsed": hex(150_000),
+                "logs": []
+            }
+        else:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": "Method not found"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if isinstance(body, list):
+                    payload = [stub.handle(item) for item in body]
+                else:
+                    payload = stub.handle(body or {})
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "ChainStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Crypto Graves - HTTP 부하 벤치마크
+로컬 Postgres 를 쓰는 API 서버(uvicorn)를 띄우고, 체인은 프로세스 안의 JSON-RPC 스텁으로 대신한 뒤
+/user, /chk_wallet_info, /mint/* 에 읽기/쓰기 혼합 부하를 고정 동시성으로 걸어
+처리량과 p50/p95/p99 지연 시간을 JSON 으로 저장합니다.
+
+사용법 (backend 디렉터리에서, .env 또는 환경 변수로 DB 설정 필요):
+    python -m benchmarks.load --workloads read mixed --concurrency 1 8 32 --duration 10
+    python -m benchmarks.load --output before.json
+    python -m benchmarks.load --output after.json --compare before.json
+
+벤치마크용 사용자/지갑 정보는 serialization 벤치마크와 같은 지갑 주소 접두사를 쓰며 끝나면 삭제합니다.
+"""
+
+from sqlalchemy import text
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import settings
+from app.database import engine, init_db
+from app.models.money import money_scale
+from benchmarks.chain_stub import ChainStub
+from benchmarks.serialization import BENCH_WALLET_PREFIX, cleanup_rows
+import app.models
+import argparse
+import asyncio
+import httpx
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+TICKERS = ["BENCHA", "BENCHB", "BENCHC", "BENCHD"]
+
+# (method, path, params/json, endpoint label)
+Request = Tuple[str, str, dict, str]
+
+
+class Workload:
+    """벤치마크 요청 생성기 (시드 지갑 목록에서 난수로 요청을 만듦)"""
+
+    def __init__(self, wallets: List[str], rng: random.Random, worker: int):
+        self.wallets = wallets
+        self.rng = rng
+        self.worker = worker
+        self.created = 0
+
+    def _prices(self) -> dict:
+        buy = self.rng.uniform(1, 1000)
+        return {
+            "avg_buyprice": f"{buy:.8f}",
+            "avg_sellprice": f"{buy * self.rng.uniform(0.2, 1.5):.8f}",
+            "current_price": f"{buy * self.rng.uniform(0.1, 2.0):.8f}",
+            "total_buyprice": f"{buy * 10:.8f}",
+            "total_sellprice": f"{buy * self.rng.uniform(1, 15):.8f}",
+        }
+
+    def _new_wallet(self) -> str:
+        # 워커별로 겹치지 않는 새 지갑 주소 (시드 지갑은 1, 새 지갑은 2 로 시작)
+        self.created += 1
+        return f"{BENCH_WALLET_PREFIX}2{self.worker:05x}{self.created:030x}"
+
+    def user_get(self) -> Request:
+        return ("GET", "/user/", {"params": {"wallet_address": self.rng.choice(self.wallets)}}, "GET /user")
+
+    def wallet_info_by_wallet(self) -> Request:
+        params = {"wallet_address": self.rng.choice(self.wallets), "limit": 50}
+        return ("GET", "/chk_wallet_info/", {"params": params}, "GET /chk_wallet_info?wallet_address")
+
+    def wallet_info_page(self) -> Request:
+        params = {"limit": 50, "offset": self.rng.randrange(0, 1000)}
+        return ("GET", "/chk_wallet_info/", {"params": params}, "GET /chk_wallet_info?offset")
+
+    def user_create(self) -> Request:
+        return ("POST", "/user/", {"json": {"wallet_address": self._new_wallet()}}, "POST /user")
+
+    def wallet_info_create(self) -> Request:
+        body = {"wallet_address": self.rng.choice(self.wallets), "ticker": self.rng.choice(TICKERS), **self._prices()}
+        return ("POST", "/chk_wallet_info/", {"json": body}, "POST /chk_wallet_info")
+
+    def mint_nft(self) -> Request:
+        body = {"wallet_address": self.rng.choice(self.wallets), "ticker": self.rng.choice(TICKERS), **self._prices()}
+        return ("POST", "/mint/nft", {"json": body}, "POST /mint/nft")
+
+    def mint_token(self) -> Request:
+        ticker = self.rng.choice(TICKERS)
+        body = {
+            "wallet_address": self.rng.choice(self.wallets),
+            "ticker": ticker,
+            "token_name": f"{ticker} Grave",
+            "token_symbol": ticker[:5],
+            "total_supply": 1_000_000,
+            **self._prices()
+        }
+        return ("POST", "/mint/token", {"json": body}, "POST /mint/token")
+
+
+# 워크로드별 요청 비율
+WORKLOADS: Dict[str, List[Tuple[int, Callable[[Workload], Request]]]] = {
+    "read": [
+        (40, Workload.user_get),
+        (40, Workload.wallet_info_by_wallet),
+        (20, Workload.wallet_info_page),
+    ],
+    "write": [
+        (30, Workload.user_create),
+        (70, Workload.wallet_info_create),
+    ],
+    "mint": [
+        (50, Workload.mint_nft),
+        (50, Workload.mint_token),
+    ],
+    "mixed": [
+        (25, Workload.user_get),
+        (25, Workload.wallet_info_by_wallet),
+        (10, Workload.wallet_info_page),
+        (5, Workload.user_create),
+        (15, Workload.wallet_info_create),
+        (10, Workload.mint_nft),
+        (10, Workload.mint_token),
+    ],
+}
+
+
+def seed_wallets(count: int) -> List[str]:
+    """시드 지갑 count 개와 지갑별 wallet_info 를 SQL 로 한 번에 생성"""
+    wallets = [f"{BENCH_WALLET_PREFIX}1{i:035x}" for i in range(count)]
+    raw = [bytes.fromhex(wallet[2:]) for wallet in wallets]
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO users (uuid, wallet_address) SELECT gen_random_uuid(), unnest(CAST(:wallets AS bytea[]))"),
+            {"wallets": raw}
+        )
+        connection.execute(text(
+            "INSERT INTO wallet_info (uuid, user_id, user_uuid, wallet_address, ticker, avg_buyprice, "
+            "avg_sellprice, current_price, total_buyprice, total_sellprice, loss_rate, loss_amount) "
+            "SELECT gen_random_uuid(), u.id, u.uuid, u.wallet_address, t.ticker, 100 * s.scale, 50 * s.scale, "
+            "40 * s.scale, 1000 * s.scale, 500 * s.scale, 50, 500 * s.scale "
+            "FROM users u CROSS JOIN unnest(CAST(:tickers AS text[])) AS t(ticker) CROSS JOIN (SELECT CAST(:scale AS bigint) AS scale) s "
+            "WHERE u.wallet_address = ANY(:wallets)"
+        ), {"tickers": TICKERS[:2], "wallets": raw, "scale": money_scale()})
+    return wallets
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """정렬된 값의 nearest-rank 백분위수"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+def summarize(samples: List[Tuple[str, int, float]], elapsed: float) -> dict:
+    """(endpoint, status, latency_ms) 목록 -> 처리량/지연 시간 요약"""
+    latencies = sorted(latency for _, _, latency in samples)
+    errors = sum(1 for _, status, _ in samples if status == 0 or status >= 400)
+    status_counts: Dict[str, int] = {}
+    by_endpoint: Dict[str, List[Tuple[int, float]]] = {}
+    for endpoint, status, latency in samples:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+        by_endpoint.setdefault(endpoint, []).append((status, latency))
+
+    endpoints = {}
+    for endpoint, items in sorted(by_endpoint.items()):
+        ordered = sorted(latency for _, latency in items)
+        endpoints[endpoint] = {
+            "requests": len(items),
+            "errors": sum(1 for status, _ in items if status == 0 or status >= 400),
+            "p50_ms": round(percentile(ordered, 0.50), 3),
+            "p95_ms": round(percentile(ordered, 0.95), 3),
+            "p99_ms": round(percentile(ordered, 0.99), 3),
+        }
+
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        },
+        "status_counts": status_counts,
+        "endpoints": endpoints,
+    }
+
+
+async def run_level(
+    base_url: str,
+    workload: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    wallets: List[str],
+    seed: int
+) -> dict:
+    """고정 동시성으로 warmup 후 duration 동안 요청을 보내고 결과 요약"""
+    mix = WORKLOADS[workload]
+    weights = [weight for weight, _ in mix]
+    operations = [operation for _, operation in mix]
+    samples: List[Tuple[str, int, float]] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        started = time.perf_counter()
+        measure_from = started + warmup
+        stop_at = measure_from + duration
+
+        async def worker(index: int):
+            rng = random.Random(f"{seed}-{workload}-{concurrency}-{index}")
+            generator = Workload(wallets, rng, index + concurrency * 1000)
+            while True:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    return
+                operation = rng.choices(operations, weights)[0]
+                method, path, kwargs, endpoint = operation(generator)
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = 0
+                finished = time.perf_counter()
+                if now >= measure_from:
+                    samples.append((endpoint, status, (finished - now) * 1000))
+
+        await asyncio.gather(*[worker(index) for index in range(concurrency)])
+        elapsed = time.perf_counter() - measure_from
+
+    return {"workload": workload, "concurrency": concurrency, **summarize(samples, elapsed)}
+
+
+def start_server(port: int, workers: int, chain_url: str, admission: bool) -> subprocess.Popen:
+    """API 서버를 별도 프로세스로 시작 (부하 생성기와 CPU 를 나눠 쓰지 않도록)"""
+    env = dict(os.environ)
+    env.update({
+        "MONAD_RPC_URL": chain_url,
+        "ADMISSION_ENABLED": "true" if admission else "false",
+        "LOG_LEVEL": "warning",
+    })
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        env=env
+    )
+
+
+def wait_until_live(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health/live", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become live within {timeout}s")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result: dict):
+    latency = result["latency_ms"]
+    print(
+        f"  {result['workload']:<6} c={result['concurrency']:<4} "
+        f"{result['throughput_rps']:9.1f} req/s   "
+        f"p50 {latency['p50']:8.2f}  p95 {latency['p95']:8.2f}  p99 {latency['p99']:8.2f} ms   "
+        f"errors {result['errors']}/{result['requests']}"
+    )
+
+
+def compare(results: List[dict], baseline_path: str):
+    """같은 (워크로드, 동시성) 결과끼리 기준 파일과 비교 출력"""
+    with open(baseline_path) as f:
+        baseline = {(item["workload"], item["concurrency"]): item for item in json.load(f)["results"]}
+
+    print(f"compared with {baseline_path}")
+    for result in results:
+        before = baseline.get((result["workload"], result["concurrency"]))
+        if before is None:
+            continue
+
+        def change(new: float, old: float) -> str:
+            return f"{(new - old) / old * 100:+6.1f}%" if old else "   n/a"
+
+        print(
+            f"  {result['workload']:<6} c={result['concurrency']:<4} "
+            f"throughput {change(result['throughput_rps'], before['throughput_rps'])}   "
+            f"p50 {change(result['latency_ms']['p50'], before['latency_ms']['p50'])}   "
+            f"p99 {change(result['latency_ms']['p99'], before['latency_ms']['p99'])}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP 부하 벤치마크")
+    parser.add_argument("--workloads", nargs="+", default=["read", "write", "mint", "mixed"], choices=sorted(WORKLOADS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32], help="동시 요청 수 (단계별)")
+    parser.add_argument("--duration", type=float, default=10.0, help="단계별 측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="단계별 워밍업 시간 (초, 측정에서 제외)")
+    parser.add_argument("--wallets", type=int, default=200, help="시드 지갑 수")
+    parser.add_argument("--seed", type=int, default=42, help="요청 생성 난수 시드")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (지정하면 서버/체인 스텁을 띄우지 않음)")
+    parser.add_argument("--chain-latency-ms", type=float, default=0.0, help="체인 스텁 응답 지연")
+    parser.add_argument("--admission", action="store_true", help="수락 제어(속도 제한)를 켠 채로 측정")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<시각>-<커밋>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    init_db()
+    cleanup_rows()
+    wallets = seed_wallets(args.wallets)
+
+    stub: Optional[ChainStub] = None
+    server: Optional[subprocess.Popen] = None
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            stub = ChainStub(chain_id=settings.monad_chain_id, latency_ms=args.chain_latency_ms).start()
+            server = start_server(args.port, args.workers, stub.url, args.admission)
+            base_url = f"http://127.0.0.1:{args.port}"
+        wait_until_live(base_url)
+
+        results = []
+        for workload in args.workloads:
+            for concurrency in args.concurrency:
+                result = asyncio.run(run_level(
+                    f"{base_url}{settings.api_v1_str}", workload, concurrency,
+                    args.duration, args.warmup, wallets, args.seed
+                ))
+                print_result(result)
+                results.append(result)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if stub is not None:
+            stub.stop()
+        cleanup_rows()
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "db_pool_size": settings.db_pool_size,
+            "db_max_overflow": settings.db_max_overflow,
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}-{commit or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Crypto Graves - 응답 직렬화 마이크로벤치마크
+GET /chk_wallet_info 의 기존 응답 경로와 빠른 응답 모드(fast=true)를 10k 행 기준으로 비교합니다.
+
+사용법 (backend 디렉터리에서, .env 또는 환경 변수로 DB 설정 필요):
+    python -m benchmarks.serialization --rows 10000 --repeat 20
+
+wallet_info 행이 부족하면 벤치마크용 행을 임시로 추가하고 끝나면 삭제합니다.
+"""
+
+from sqlalchemy import text
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from typing import Callable, List
+from app.main import app
+from app.database import SessionLocal, engine, init_db
+from app.models.user import UserModel
+from app.models.wallet_info import WalletInfoModel
+from app.models.money import money_scale
+from app.api.v1.endpoints.wallet_info import WalletInfoResponse, WALLET_INFO_ENCODER
+import argparse
+import statistics
+import time
+import uuid
+
+# 벤치마크용 임시 행 표시 (지갑 주소 접두사, DB 에는 20바이트로 저장되므로 바이트 접두사로 비교)
+BENCH_WALLET_PREFIX = "0xbe4c"
+BENCH_WALLET_BYTES = bytes.fromhex(BENCH_WALLET_PREFIX[2:])
+
+
+def seed_rows(rows: int) -> int:
+    """wallet_info 가 rows 개보다 적으면 임시 행을 추가하고, 추가한 행 수를 반환"""
+    with engine.begin() as connection:
+        existing = connection.execute(text("SELECT count(*) FROM wallet_info")).scalar()
+        missing = rows - existing
+        if missing <= 0:
+            return 0
+
+        user_uuid = uuid.uuid4()
+        user_id = connection.execute(
+            text("INSERT INTO users (uuid, wallet_address) VALUES (:uuid, :wallet) RETURNING id"),
+            {"uuid": user_uuid, "wallet": BENCH_WALLET_BYTES + bytes(18)}
+        ).scalar()
+        connection.execute(text(
+            "INSERT INTO wallet_info (uuid, user_id, user_uuid, wallet_address, ticker, avg_buyprice, "
+            "avg_sellprice, current_price, total_buyprice, total_sellprice, loss_rate, loss_amount) "
+            "SELECT gen_random_uuid(), :user_id, :user_uuid, "
+            "decode(:prefix || lpad(to_hex(g), 36, '0'), 'hex'), 'BENCH', g * 0.12345678 * :scale, g * 0.2 * :scale, "
+            "g * 0.3 * :scale, g * 1.5 * :scale, g * 0.75 * :scale, (g % 100) * 0.5, g * 0.01 * :scale "
+            "FROM generate_series(1, :missing) g"
+        ), {
+            "user_id": user_id, "user_uuid": user_uuid, "prefix": BENCH_WALLET_PREFIX[2:],
+            "missing": missing, "scale": money_scale()
+        })
+    return missing
+
+
+def cleanup_rows():
+    """벤치마크용 임시 행 삭제"""
+    with engine.begin() as connection:
+        params = {"prefix": BENCH_WALLET_BYTES, "length": len(BENCH_WALLET_BYTES)}
+        connection.execute(text("DELETE FROM wallet_info WHERE substr(wallet_address, 1, :length) = :prefix"), params)
+        connection.execute(text("DELETE FROM users WHERE substr(wallet_address, 1, :length) = :prefix"), params)
+
+
+def measure(fn: Callable, repeat: int) -> List[float]:
+    """fn 을 repeat 번 실행한 소요 시간 (ms), 첫 1회는 워밍업으로 제외"""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name: str, timings: List[float]) -> float:
+    timings = sorted(timings)
+    median = statistics.median(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"  {name:<28} median {median:8.2f} ms   p95 {p95:8.2f} ms")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description="wallet_info 목록 응답 직렬화 벤치마크")
+    parser.add_argument("--rows", type=int, default=10000, help="응답 행 수")
+    parser.add_argument("--repeat", type=int, default=20, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    init_db()
+    seeded = seed_rows(args.rows)
+    try:
+        db = SessionLocal()
+        adapter = TypeAdapter(List[WalletInfoResponse])
+
+        # 1) 직렬화 단계만 비교 (같은 행 수, DB 조회 결과는 미리 받아둠)
+        records = db.query(WalletInfoModel).limit(args.rows).all()
+        rows = db.execute(WALLET_INFO_ENCODER.select().limit(args.rows)).all()
+
+        def legacy_encode():
+            # 기존 경로: 행마다 응답 모델 생성 -> FastAPI 응답 모델 검증 -> JSON 인코딩
+            items = [
+                WalletInfoResponse(
+                    wallet_address=record.wallet_address,
+                    ticker=record.ticker,
+                    avg_buyprice=float(record.avg_buyprice),
+                    avg_sellprice=float(record.avg_sellprice),
+                    current_price=float(record.current_price),
+                    total_buyprice=float(record.total_buyprice),
+                    total_sellprice=float(record.total_sellprice),
+                    loss_rate=float(record.loss_rate),
+                    loss_amount=float(record.loss_amount),
+                    user_id=record.user_id,
+                    user_uuid=str(record.user_uuid),
+                    created_at=record.created_at.isoformat() if record.created_at else ""
+                )
+                for record in records
+            ]
+            return adapter.dump_json(adapter.validate_python(items))
+
+        def fast_encode():
+            return WALLET_INFO_ENCODER.encode(rows)
+
+        print(f"serialization only ({len(rows)} rows)")
+        legacy = report("legacy (pydantic + json)", measure(legacy_encode, args.repeat))
+        fast = report("fast (RowEncoder + orjson)", measure(fast_encode, args.repeat))
+        print(f"  speedup x{legacy / fast:.1f}")
+
+        # 2) 요청 전체 비교 (DB 조회 포함)
+        with TestClient(app) as client:
+            url = "/api/v1/chk_wallet_info/"
+
+            def legacy_request():
+                response = client.get(url, params={"limit": args.rows, "fast": "false"})
+                assert response.status_code == 200
+
+            def fast_request():
+                response = client.get(url, params={"limit": args.rows, "fast": "true"})
+                assert response.status_code == 200
+
+            print(f"end-to-end GET {url}?limit={args.rows}")
+            legacy = report("legacy", measure(legacy_request, args.repeat))
+            fast = report("fast=true", measure(fast_request, args.repeat))
+            print(f"  speedup x{legacy / fast:.1f}")
+        db.close()
+    finally:
+        if seeded:
+            cleanup_rows()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Crypto Graves - 대용량 합성 데이터 생성기
+users / wallet_info / losses / nfts / trades 에 현실적인 분포의 데이터를 COPY 로 대량 적재합니다.
+인덱스 선택이나 랭킹 쿼리 비용을 운영 규모에서 확인하기 위한 용도입니다.
+
+사용법 (backend 디렉터리에서, .env 또는 환경 변수로 DB 설정 필요):
+    python -m benchmarks.synthetic --users 1000000 --workers 8 --seed 42
+    python -m benchmarks.synthetic --users 5000000 --tickers-per-user 4 --truncate
+
+- 사용자 chunk_size 명 단위로 나누어 여러 프로세스가 병렬로 생성/적재하며, chunk 마다 한 트랜잭션입니다.
+- 각 chunk 의 난수는 (seed, chunk 번호) 로만 결정되므로 워커 수와 관계없이 같은 데이터가 만들어집니다.
+- id 를 직접 지정해 적재하고 (자식 행이 부모 id 를 바로 참조), 끝나면 시퀀스를 최대 id 로 맞춥니다.
+- nfts / trades 는 init.sql 로 만든 DB 에만 있으므로 테이블이 없으면 건너뜁니다.
+"""
+
+from sqlalchemy import inspect, text
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.config import settings
+from app.database import engine, init_db
+import app.models
+import argparse
+import bisect
+import io
+import itertools
+import json
+import multiprocessing
+import random
+import time
+import uuid
+
+# 주요 티커 (시가총액/거래량 순서로 선택 확률이 높음, 기준 가격 USD)
+MAJOR_TICKERS: List[Tuple[str, str, float]] = [
+    ("BTC", "Bitcoin", 60000.0), ("ETH", "Ethereum", 3000.0), ("SOL", "Solana", 150.0),
+    ("MON", "Monad", 1.0), ("DOGE", "Dogecoin", 0.12), ("PEPE", "Pepe", 0.00001),
+    ("SHIB", "Shiba Inu", 0.00002), ("XRP", "XRP", 0.5), ("BNB", "BNB", 550.0),
+    ("ADA", "Cardano", 0.4), ("AVAX", "Avalanche", 30.0), ("LINK", "Chainlink", 14.0),
+    ("ARB", "Arbitrum", 0.8), ("OP", "Optimism", 1.8), ("WIF", "dogwifhat", 2.0),
+    ("BONK", "Bonk", 0.00002), ("SUI", "Sui", 1.0), ("APT", "Aptos", 7.0),
+    ("TIA", "Celestia", 6.0), ("SEI", "Sei", 0.4), ("INJ", "Injective", 20.0),
+    ("UNI", "Uniswap", 8.0), ("AAVE", "Aave", 100.0), ("LDO", "Lido DAO", 1.5),
+    ("FLOKI", "Floki", 0.0001), ("TRUMP", "Official Trump", 10.0), ("MEME", "Memecoin", 0.01),
+    ("JUP", "Jupiter", 0.8), ("PYTH", "Pyth Network", 0.3), ("ENA", "Ethena", 0.4),
+]
+# 나머지 확률로 선택되는 긴 꼬리 밈코인 티커 수
+TAIL_TICKERS = 5000
+TAIL_PROBABILITY = 0.25
+
+LOSS_STATUSES = (("verified", 0.6), ("pending", 0.3), ("rejected", 0.1))
+TRADE_STATUSES = (("listed", 0.5), ("sold", 0.4), ("cancelled", 0.1))
+MAX_LOSSES_PER_USER = 3
+
+NFT_CONTRACT = "0xcce694cd2e6939f04b3efcb55bdacc607adb0a14"
+ADDRESS_SPACE = 2 ** 160
+ADDRESS_MULTIPLIER = 0x9E3779B97F4A7C15F39CC0605CEDC8341082276B  # 홀수 -> 주소 변환이 전단사
+
+COLUMNS = {
+    "users": (
+        "id", "uuid", "wallet_address", "username", "role", "total_loss", "total_gain",
+        "is_active", "created_at", "updated_at"
+    ),
+    "wallet_info": (
+        "uuid", "user_id", "user_uuid", "wallet_address", "ticker", "avg_buyprice", "avg_sellprice",
+        "current_price", "total_buyprice", "total_sellprice", "loss_rate", "loss_amount", "gain_amount",
+        "created_at", "updated_at"
+    ),
+    "losses": (
+        "id", "uuid", "user_id", "user_uuid", "asset_name", "asset_ticker", "loss_amount",
+        "loss_amount_mon", "transaction_hash", "transaction_data", "signature", "status",
+        "verified_at", "nft_token_id", "nft_contract_address", "created_at", "updated_at"
+    ),
+    "nfts": (
+        "id", "uuid", "loss_id", "loss_uuid", "token_id", "contract_address", "metadata_uri",
+        "image_url", "name", "description", "attributes", "created_at"
+    ),
+    "trades": (
+        "id", "uuid", "seller_id", "seller_uuid", "buyer_id", "buyer_uuid", "nft_id", "nft_uuid",
+        "price", "status", "transaction_hash", "created_at", "updated_at"
+    ),
+}
+# 적재 순서 (부모 테이블 먼저)
+TABLES = ("users", "wallet_info", "losses", "nfts", "trades")
+
+
+def build_ticker_table() -> Tuple[List[Tuple[str, str, float]], List[float]]:
+    """(티커, 이름, 기준 가격) 목록과 누적 선택 확률 (주요 티커는 Zipf 분포, 나머지는 긴 꼬리)"""
+    rng = random.Random("tickers")
+    tail = [
+        (f"M{i:04d}{rng.choice('XYZQW')}", f"Meme Coin {i}", 10 ** rng.uniform(-6, 0))
+        for i in range(TAIL_TICKERS)
+    ]
+    zipf = [1 / rank for rank in range(1, len(MAJOR_TICKERS) + 1)]
+    major_weight = (1 - TAIL_PROBABILITY) / sum(zipf)
+    weights = [w * major_weight for w in zipf] + [TAIL_PROBABILITY / TAIL_TICKERS] * TAIL_TICKERS
+    return MAJOR_TICKERS + tail, list(itertools.accumulate(weights))
+
+
+def wallet_address(user_id: int, seed: int) -> str:
+    """사용자 id -> 겹치지 않는 지갑 주소 (시드별 전단사 변환)"""
+    mask = random.Random(f"address-{seed}").getrandbits(160)
+    return "0x" + format(((user_id ^ mask) * ADDRESS_MULTIPLIER) % ADDRESS_SPACE, "040x")
+
+
+def _weighted(rng: random.Random, choices: Sequence[Tuple[str, float]]) -> str:
+    value = rng.random()
+    for choice, weight in choices:
+        value -= weight
+        if value < 0:
+            return choice
+    return choices[-1][0]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _hex(rng: random.Random, nbytes: int) -> str:
+    return "0x" + format(rng.getrandbits(nbytes * 8), f"0{nbytes * 2}x")
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.isoformat()
+
+
+def _fixed8(units: int) -> str:
+    """1e-8 단위 정수 -> 금액 컬럼 COPY 값 (합계가 행 값의 합과 정확히 같도록 정수로 누적)
+
+    고정소수점 모드에서는 정수 그대로, 아니면 소수점 8자리 문자열.
+    """
+    if settings.money_fixed_point:
+        return str(units)
+    sign = "-" if units < 0 else ""
+    units = abs(units)
+    return f"{sign}{units // 100_000_000}.{units % 100_000_000:08d}"
+
+
+def _money(value: float) -> str:
+    """wallet_info 금액 컬럼 COPY 값"""
+    return _fixed8(round(value * 100_000_000))
+
+
+def _copy_value(value) -> str:
+    """COPY text 형식 값 (생성하는 값에는 탭/개행/역슬래시가 없으므로 NULL 만 변환)"""
+    return "\\N" if value is None else str(value)
+
+
+class ChunkGenerator:
+    """사용자 chunk 1개 분량의 모든 테이블 행 생성"""
+
+    def __init__(self, args: dict, chunk: int):
+        self.args = args
+        self.chunk = chunk
+        self.rng = random.Random(f"{args['seed']}-{chunk}")
+        self.tickers, self.cum_weights = TICKER_TABLE
+        self.end = datetime.fromisoformat(args["end_date"]).replace(tzinfo=timezone.utc)
+        self.rows: Dict[str, List[str]] = {table: [] for table in TABLES}
+
+    def _add(self, table: str, values: Sequence):
+        self.rows[table].append("\t".join(map(_copy_value, values)))
+
+    def _pick_tickers(self, count: int) -> List[Tuple[str, str, float]]:
+        picked: Dict[str, Tuple[str, str, float]] = {}
+        while len(picked) < count:
+            ticker = self.tickers[bisect.bisect(self.cum_weights, self.rng.random() * self.cum_weights[-1])]
+            picked[ticker[0]] = ticker
+        return list(picked.values())
+
+    def _moment(self, after: Optional[datetime] = None) -> datetime:
+        start = after or self.end - timedelta(days=self.args["days"])
+        return start + timedelta(seconds=self.rng.random() * (self.end - start).total_seconds())
+
+    def _position(self, base_price: float) -> Tuple[float, float, float, float, float, float, float, float]:
+        """티커 1개 통계 (pnl.loss_from_totals 와 같은 방식으로 손실 계산)
+
+        대부분은 손실 (손실률 분포는 0~100% 사이에서 중간값이 큰 베타 분포), 일부는 이익.
+        """
+        rng = self.rng
+        avg_buy = base_price * rng.lognormvariate(0, 0.5)
+        if rng.random() < 0.8:
+            current = avg_buy * (1 - rng.betavariate(2, 2.5))
+        else:
+            current = avg_buy * (1 + rng.expovariate(2))
+        avg_sell = avg_buy * rng.lognormvariate(-0.1, 0.3)
+        total_buy = rng.lognormvariate(6, 1.5)  # USD, 중간값 약 400
+        sold_ratio = rng.random() * 0.7 if rng.random() < 0.6 else 0.0
+        bought_qty = total_buy / avg_buy
+        sold_qty = bought_qty * sold_ratio
+        total_sell = sold_qty * avg_sell
+        pnl = total_sell + (bought_qty - sold_qty) * current - total_buy
+        loss_amount = max(-pnl, 0.0)
+        loss_rate = loss_amount / total_buy * 100
+        return avg_buy, avg_sell, current, total_buy, total_sell, loss_rate, loss_amount, pnl
+
+    def generate(self) -> Dict[str, List[str]]:
+        args = self.args
+        rng = self.rng
+        chunk_size = args["chunk_size"]
+        first = self.chunk * chunk_size
+        count = min(chunk_size, args["users"] - first)
+        seller_pool: List[Tuple[int, str]] = []
+
+        for offset in range(first, first + count):
+            user_id = args["first_user_id"] + offset
+            user_uuid = _uuid(rng)
+            address = wallet_address(user_id, args["seed"])
+            address_bytea = "\\\\x" + address[2:]  # COPY text 형식의 BYTEA 값 (역슬래시 이스케이프)
+            created = self._moment()
+
+            # 지갑 정보 (보유 티커 수는 평균 tickers_per_user 인 기하 분포)
+            total_loss = total_gain = 0
+            holdings = min(1 + int(rng.expovariate(1 / max(args["tickers_per_user"] - 1, 0.01))), 40)
+            for ticker, _, base_price in self._pick_tickers(holdings):
+                avg_buy, avg_sell, current, total_buy, total_sell, loss_rate, loss_amount, pnl = self._position(base_price)
+                loss_units = round(loss_amount * 100_000_000)
+                gain_units = round(max(pnl, 0.0) * 100_000_000)
+                total_loss += loss_units
+                total_gain += gain_units
+                updated = self._moment(created)
+                self._add("wallet_info", (
+                    _uuid(rng), user_id, user_uuid, address_bytea, ticker,
+                    _money(avg_buy), _money(avg_sell), _money(current),
+                    _money(total_buy), _money(total_sell), f"{loss_rate:.2f}", _fixed8(loss_units),
+                    _fixed8(gain_units), _timestamp(created), _timestamp(updated)
+                ))
+
+            self._add("users", (
+                user_id, user_uuid, address_bytea,
+                f"grave{user_id}" if rng.random() < 0.3 else None,
+                "user", _fixed8(total_loss), _fixed8(total_gain), "t",
+                _timestamp(created), _timestamp(created)
+            ))
+
+            # 손실 인증 / NFT / 거래
+            if rng.random() >= args["loss_ratio"]:
+                continue
+            for j, (ticker, name, _) in enumerate(self._pick_tickers(rng.randint(1, MAX_LOSSES_PER_USER))):
+                loss_id = args["first_loss_id"] + offset * MAX_LOSSES_PER_USER + j
+                loss_uuid = _uuid(rng)
+                loss_amount = rng.lognormvariate(5, 1.5)
+                status = _weighted(rng, LOSS_STATUSES)
+                created_loss = self._moment(created)
+                tx_hash = _hex(rng, 32)
+                payload = {
+                    "chain": "monad-testnet",
+                    "block_number": rng.randint(1_000_000, 40_000_000),
+                    "from": address,
+                    "to": _hex(rng, 20),
+                    "token": {"ticker": ticker, "name": name},
+                    "amount": round(rng.lognormvariate(3, 2), 8),
+                    "gas_used": rng.randint(21_000, 400_000),
+                    "logs": [{"index": k, "topic": _hex(rng, 32)} for k in range(rng.randint(0, 3))],
+                }
+                has_nft = status == "verified" and rng.random() < args["nft_ratio"]
+                self._add("losses", (
+                    loss_id, loss_uuid, user_id, user_uuid, name, ticker,
+                    f"{loss_amount:.8f}", f"{loss_amount / 1.5:.8f}", tx_hash,
+                    json.dumps(payload, separators=(",", ":")), _hex(rng, 65), status,
+                    _timestamp(self._moment(created_loss)) if status == "verified" else None,
+                    loss_id if has_nft else None, NFT_CONTRACT if has_nft else None,
+                    _timestamp(created_loss), _timestamp(created_loss)
+                ))
+                if not has_nft:
+                    continue
+
+                nft_uuid = _uuid(rng)
+                minted = self._moment(created_loss)
+                attributes = [
+                    {"trait_type": "Ticker", "value": ticker},
+                    {"trait_type": "Loss Amount", "value": round(loss_amount, 2)},
+                    {"trait_type": "Grave", "value": rng.choice(["Stone", "Wood", "Gold", "Diamond"])},
+                ]
+                self._add("nfts", (
+                    loss_id, nft_uuid, loss_id, loss_uuid, loss_id, NFT_CONTRACT,
+                    f"https://cryptograves.com/nft/{loss_id}.json",
+                    f"https://cryptograves.com/nft/{loss_id}.png",
+                    f"Crypto Grave #{loss_id}", f"{ticker} loss of {loss_amount:.2f}",
+                    json.dumps(attributes, separators=(",", ":")), _timestamp(minted)
+                ))
+
+                if rng.random() >= args["trade_ratio"]:
+                    continue
+                trade_status = _weighted(rng, TRADE_STATUSES)
+                buyer = rng.choice(seller_pool) if trade_status == "sold" and seller_pool else None
+                listed = self._moment(minted)
+                self._add("trades", (
+                    loss_id, _uuid(rng), user_id, user_uuid,
+                    buyer[0] if buyer else None, buyer[1] if buyer else None,
+                    loss_id, nft_uuid, f"{rng.lognormvariate(2, 1):.8f}", trade_status,
+                    _hex(rng, 32) if buyer else None, _timestamp(listed), _timestamp(self._moment(listed))
+                ))
+            seller_pool.append((user_id, user_uuid))
+
+        return self.rows
+
+
+TICKER_TABLE = build_ticker_table()
+
+
+def _init_worker():
+    # fork 로 물려받은 부모의 연결을 닫지 않고 버림 (부모 연결을 자식이 건드리지 않도록)
+    engine.dispose(close=False)
+
+
+def load_chunk(job: Tuple[dict, int]) -> Dict[str, int]:
+    """chunk 1개를 생성해 한 트랜잭션으로 COPY, 테이블별 행 수 반환"""
+    args, chunk = job
+    rows = ChunkGenerator(args, chunk).generate()
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for table in args["tables"]:
+            if not rows[table]:
+                continue
+            buffer = io.StringIO("\n".join(rows[table]) + "\n")
+            cursor.copy_expert(f"COPY {table} ({', '.join(COLUMNS[table])}) FROM STDIN", buffer)
+        connection.commit()
+    finally:
+        connection.close()
+    return {table: len(rows[table]) for table in args["tables"]}
+
+
+def drop_secondary_indexes(connection, tables: Sequence[str]) -> List[str]:
+    """적재 속도를 위해 대상 테이블의 unique 가 아닌 보조 인덱스를 지우고 재생성용 정의를 반환
+
+    PK, unique 인덱스(외래키/upsert 가 의존)는 그대로 둔다.
+    """
+    rows = connection.execute(text(
+        "SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) "
+        "FROM pg_index i JOIN pg_class t ON t.oid = i.indrelid "
+        "WHERE t.relname = ANY(:tables) AND t.relnamespace = 'public'::regnamespace "
+        "AND NOT i.indisunique AND NOT i.indisprimary"
+    ), {"tables": list(tables)}).all()
+    for name, _ in rows:
+        connection.execute(text(f"DROP INDEX {name}"))
+    return [definition for _, definition in rows]
+
+
+def create_index(definition: str):
+    with engine.connect() as connection:
+        connection.execute(text("SET maintenance_work_mem = '256MB'"))
+        connection.execute(text(definition))
+        connection.commit()
+
+
+def next_id(connection, table: str) -> int:
+    return connection.execute(text(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")).scalar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대용량 합성 데이터 생성 (COPY, 병렬)")
+    parser.add_argument("--users", type=int, default=100000, help="생성할 사용자 수")
+    parser.add_argument("--tickers-per-user", type=float, default=3.0, help="사용자당 평균 wallet_info 행 수")
+    parser.add_argument("--loss-ratio", type=float, default=0.4, help="손실 인증(losses)을 가진 사용자 비율")
+    parser.add_argument("--nft-ratio", type=float, default=0.8, help="검증된 손실 중 NFT 가 발행된 비율")
+    parser.add_argument("--trade-ratio", type=float, default=0.5, help="NFT 중 거래소에 등록된 비율")
+    parser.add_argument("--days", type=int, default=365, help="생성 시각 분포 기간 (일)")
+    parser.add_argument("--end-date", default="2025-06-30", help="생성 시각 분포의 마지막 날짜 (재현성을 위해 고정)")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="트랜잭션/작업 단위 사용자 수")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="병렬 프로세스 수")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--truncate", action="store_true", help="적재 전에 대상 테이블을 비움 (기존 데이터 삭제)")
+    parser.add_argument("--defer-indexes", action="store_true", help="보조 인덱스를 지우고 적재한 뒤 병렬로 재생성")
+    args = parser.parse_args()
+
+    init_db()
+    existing = set(inspect(engine).get_table_names())
+    tables = [table for table in TABLES if table in existing]
+    for table in TABLES:
+        if table not in existing:
+            print(f"skip {table}: table does not exist (create it with init.sql)")
+
+    with engine.begin() as connection:
+        if args.truncate:
+            connection.execute(text(f"TRUNCATE {', '.join(reversed(tables))} RESTART IDENTITY CASCADE"))
+        first_user_id = next_id(connection, "users")
+        # losses/nfts/trades 는 같은 id 를 공유하므로 세 테이블 중 가장 큰 id 다음부터
+        first_loss_id = max(next_id(connection, table) for table in ("losses", "nfts", "trades") if table in tables)
+        deferred = drop_secondary_indexes(connection, tables) if args.defer_indexes else []
+
+    job_args = {
+        "users": args.users,
+        "tickers_per_user": args.tickers_per_user,
+        "loss_ratio": args.loss_ratio,
+        "nft_ratio": args.nft_ratio,
+        "trade_ratio": args.trade_ratio,
+        "days": args.days,
+        "end_date": args.end_date,
+        "chunk_size": args.chunk_size,
+        "seed": args.seed,
+        "first_user_id": first_user_id,
+        "first_loss_id": first_loss_id,
+        "tables": tables,
+    }
+    chunks = (args.users + args.chunk_size - 1) // args.chunk_size
+    totals = {table: 0 for table in tables}
+    started = time.perf_counter()
+
+    with multiprocessing.Pool(args.workers, initializer=_init_worker) as pool:
+        for done, counts in enumerate(pool.imap_unordered(load_chunk, [(job_args, chunk) for chunk in range(chunks)]), 1):
+            for table, count in counts.items():
+                totals[table] += count
+            elapsed = time.perf_counter() - started
+            loaded = sum(totals.values())
+            print(f"  chunk {done}/{chunks}  {loaded:,} rows  {loaded / elapsed:,.0f} rows/s", flush=True)
+
+        if deferred:
+            index_started = time.perf_counter()
+            pool.map(create_index, deferred, chunksize=1)
+            print(f"  recreated {len(deferred)} indexes in {time.perf_counter() - index_started:.1f}s")
+
+    # 직접 지정한 id 이후부터 시퀀스가 이어지도록 맞추고 통계 갱신
+    with engine.begin() as connection:
+        for table in tables:
+            if table != "wallet_info":
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), GREATEST((SELECT MAX(id) FROM {table}), 1))"
+                ))
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for table in tables:
+            connection.execute(text(f"ANALYZE {table}"))
+
+    elapsed = time.perf_counter() - started
+    for table, count in totals.items():
+        print(f"  {table:<12} {count:>14,} rows")
+    print(f"loaded {sum(totals.values()):,} rows in {elapsed:.1f}s ({sum(totals.values()) / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
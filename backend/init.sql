@@ -3,6 +3,7 @@
 -- Create extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- Create enum types
 CREATE TYPE loss_status AS ENUM ('pending', 'verified', 'rejected');
@@ -13,7 +14,7 @@ CREATE TYPE trade_status AS ENUM ('listed', 'sold', 'cancelled');
 CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
     uuid UUID DEFAULT uuid_generate_v4() UNIQUE NOT NULL,
-    wallet_address VARCHAR(42) UNIQUE NOT NULL,
+    wallet_address BYTEA UNIQUE NOT NULL CHECK (octet_length(wallet_address) = 20), -- 20바이트 지갑 주소 (표시는 체크섬 표기)
     username VARCHAR(100),
     email VARCHAR(255),
     role user_role DEFAULT 'user',
@@ -26,18 +27,38 @@ CREATE TABLE IF NOT EXISTS users (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Create tokens table (체인/컨트랙트 주소별 토큰 메타데이터 레지스트리)
+CREATE TABLE IF NOT EXISTS tokens (
+    id SERIAL PRIMARY KEY,
+    chain VARCHAR(50) NOT NULL,
+    address VARCHAR(42) NOT NULL, -- 소문자 컨트랙트 주소
+    symbol VARCHAR(20) NOT NULL,
+    name VARCHAR(100),
+    decimals SMALLINT NOT NULL,
+    source VARCHAR(20) NOT NULL, -- rpc / covalent / native
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_tokens_chain_address UNIQUE(chain, address)
+);
+
 -- Create wallet_info table (단순화된 구조)
 CREATE TABLE IF NOT EXISTS wallet_info (
     id SERIAL PRIMARY KEY,
     uuid UUID DEFAULT uuid_generate_v4() UNIQUE NOT NULL,
     user_id INTEGER NOT NULL,
     user_uuid UUID NOT NULL,
-    wallet_address VARCHAR(42) NOT NULL,
+    wallet_address BYTEA NOT NULL CHECK (octet_length(wallet_address) = 20), -- 20바이트 지갑 주소
     loss_rate DECIMAL(5, 2) NOT NULL, -- 손실률 (퍼센트, 소수점 2자리)
-    ticker VARCHAR(10) NOT NULL, -- 자산 티커
+    ticker VARCHAR(20) NOT NULL, -- 자산 티커 (토큰 레지스트리 심볼과 같은 최대 20자)
+    token_id INTEGER REFERENCES tokens(id), -- 토큰 레지스트리 ID (같은 심볼의 다른 토큰 구분)
+    avg_buyprice DECIMAL(20, 8) NOT NULL DEFAULT 0, -- 평균 매수가
+    avg_sellprice DECIMAL(20, 8) NOT NULL DEFAULT 0, -- 평균 매도가
+    current_price DECIMAL(20, 8) NOT NULL DEFAULT 0, -- 현재가
+    total_buyprice DECIMAL(20, 8) NOT NULL DEFAULT 0, -- 총 매수금액
+    total_sellprice DECIMAL(20, 8) NOT NULL DEFAULT 0, -- 총 매도금액
+    loss_amount DECIMAL(20, 8) NOT NULL DEFAULT 0, -- 손실 금액 (MON 기준)
+    gain_amount DECIMAL(20, 8) NOT NULL DEFAULT 0, -- 수익 금액 (MON 기준, 손익이 양수일 때)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(wallet_address, ticker) -- 같은 지갑 주소와 티커 조합은 유일해야 함
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Create losses table
@@ -113,14 +134,86 @@ CREATE TABLE IF NOT EXISTS trades (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Create token_prices table (토큰 일별 가격 캐시)
+CREATE TABLE IF NOT EXISTS token_prices (
+    id SERIAL PRIMARY KEY,
+    token_address VARCHAR(42) NOT NULL, -- 소문자 컨트랙트 주소
+    chain VARCHAR(50) NOT NULL,
+    price_date DATE NOT NULL,
+    price DECIMAL(38, 18), -- NULL 이면 제공자에 가격 없음 (created_at 부터 PRICE_NEGATIVE_TTL 동안 재조회 안 함)
+    source VARCHAR(50),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_token_prices_token_chain_date UNIQUE(token_address, chain, price_date)
+);
+
+-- Create transfers table (지갑별 네이티브/ERC20 전송 내역)
+CREATE TABLE IF NOT EXISTS transfers (
+    id BIGSERIAL PRIMARY KEY,
+    wallet_address BYTEA NOT NULL CHECK (octet_length(wallet_address) = 20), -- 20바이트 지갑 주소
+    chain VARCHAR(50) NOT NULL,
+    block_number BIGINT NOT NULL,
+    block_signed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    tx_hash VARCHAR(66) NOT NULL,
+    log_index INTEGER NOT NULL, -- 네이티브 전송은 -1
+    token_address VARCHAR(42) NOT NULL,
+    ticker VARCHAR(20) NOT NULL,
+    decimals SMALLINT NOT NULL,
+    direction SMALLINT NOT NULL, -- +1 입금(매수) / -1 출금(매도)
+    amount DECIMAL(38, 18) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_transfers_wallet_tx_log UNIQUE(wallet_address, chain, tx_hash, log_index)
+);
+
+-- Create wallet_sync_state table (지갑별 수집 체크포인트)
+CREATE TABLE IF NOT EXISTS wallet_sync_state (
+    wallet_address BYTEA NOT NULL CHECK (octet_length(wallet_address) = 20), -- 20바이트 지갑 주소
+    chain VARCHAR(50) NOT NULL,
+    last_block BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (wallet_address, chain)
+);
+
+-- Create pnl_positions table (지갑/티커별 누적 손익 집계)
+CREATE TABLE IF NOT EXISTS pnl_positions (
+    id SERIAL PRIMARY KEY,
+    wallet_address BYTEA NOT NULL CHECK (octet_length(wallet_address) = 20), -- 20바이트 지갑 주소
+    chain VARCHAR(50) NOT NULL,
+    ticker VARCHAR(20) NOT NULL,
+    token_address VARCHAR(42) NOT NULL, -- 소문자 컨트랙트 주소
+    token_id INTEGER REFERENCES tokens(id),
+    bought_qty DOUBLE PRECISION NOT NULL DEFAULT 0,
+    bought_cost DOUBLE PRECISION NOT NULL DEFAULT 0,
+    sold_qty DOUBLE PRECISION NOT NULL DEFAULT 0,
+    sold_proceeds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    balance DOUBLE PRECISION NOT NULL DEFAULT 0,
+    last_price DOUBLE PRECISION NOT NULL DEFAULT 0,
+    avg_cost_basis DOUBLE PRECISION NOT NULL DEFAULT 0,
+    avg_realized_pnl DOUBLE PRECISION NOT NULL DEFAULT 0,
+    fifo_lots JSONB NOT NULL DEFAULT '[]', -- 남은 매수 lot [[수량, 가격], ...]
+    fifo_cost_basis DOUBLE PRECISION NOT NULL DEFAULT 0,
+    fifo_realized_pnl DOUBLE PRECISION NOT NULL DEFAULT 0,
+    last_block BIGINT NOT NULL DEFAULT 0,
+    last_trade_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_pnl_positions_wallet_chain_token UNIQUE(wallet_address, chain, token_address)
+);
+
 -- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_users_wallet_address ON users(wallet_address);
 CREATE INDEX IF NOT EXISTS idx_users_uuid ON users(uuid);
+-- 검색용: 사용자명/지갑 주소(hex) 부분 일치는 pg_trgm GIN, 사용자명 접두사는 C 정렬 B-tree
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm ON users USING gin (lower(username) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_wallet_address_trgm ON users USING gin (encode(wallet_address, 'hex') gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_username_prefix ON users (lower(username) COLLATE "C");
 CREATE INDEX IF NOT EXISTS idx_wallet_info_user_id ON wallet_info(user_id);
 CREATE INDEX IF NOT EXISTS idx_wallet_info_user_uuid ON wallet_info(user_uuid);
 CREATE INDEX IF NOT EXISTS idx_wallet_info_wallet_address ON wallet_info(wallet_address);
 CREATE INDEX IF NOT EXISTS idx_wallet_info_ticker ON wallet_info(ticker);
 CREATE INDEX IF NOT EXISTS idx_wallet_info_uuid ON wallet_info(uuid);
+CREATE INDEX IF NOT EXISTS idx_wallet_info_token_id ON wallet_info(token_id);
+-- 레지스트리에 등록된 토큰은 token_id 로, 수동 입력 행은 티커로 지갑 내 유일성 보장
+CREATE UNIQUE INDEX IF NOT EXISTS uq_wallet_info_wallet_token ON wallet_info(wallet_address, token_id) WHERE token_id IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_wallet_info_wallet_ticker ON wallet_info(wallet_address, ticker) WHERE token_id IS NULL;
 CREATE INDEX IF NOT EXISTS idx_losses_user_id ON losses(user_id);
 CREATE INDEX IF NOT EXISTS idx_losses_user_uuid ON losses(user_uuid);
 CREATE INDEX IF NOT EXISTS idx_losses_status ON losses(status);
@@ -139,6 +232,9 @@ CREATE INDEX IF NOT EXISTS idx_trades_buyer_uuid ON trades(buyer_uuid);
 CREATE INDEX IF NOT EXISTS idx_trades_nft_id ON trades(nft_id);
 CREATE INDEX IF NOT EXISTS idx_trades_nft_uuid ON trades(nft_uuid);
 CREATE INDEX IF NOT EXISTS idx_trades_uuid ON trades(uuid);
+CREATE INDEX IF NOT EXISTS idx_transfers_wallet_chain_block ON transfers(wallet_address, chain, block_number);
+CREATE INDEX IF NOT EXISTS idx_pnl_positions_wallet_address ON pnl_positions(wallet_address);
+CREATE INDEX IF NOT EXISTS idx_pnl_positions_token_id ON pnl_positions(token_id);
 
 -- Create updated_at trigger function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -162,7 +258,54 @@ CREATE TRIGGER update_losses_updated_at BEFORE UPDATE ON losses
 CREATE TRIGGER update_trades_updated_at BEFORE UPDATE ON trades
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+CREATE TRIGGER update_pnl_positions_updated_at BEFORE UPDATE ON pnl_positions
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE TRIGGER update_wallet_sync_state_updated_at BEFORE UPDATE ON wallet_sync_state
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- 레지스트리 심볼(최대 20자)이 그대로 들어가도록 기존 wallet_info 티커 길이 확장
+-- ALTER TABLE wallet_info ALTER COLUMN ticker TYPE VARCHAR(20);
+
+-- 기존 VARCHAR(42) 지갑 주소를 BYTEA 로 옮기는 경우 (대소문자만 다른 중복 사용자/지갑 정보를 먼저 합쳐야 함)
+-- ALTER TABLE users ALTER COLUMN wallet_address TYPE BYTEA USING decode(substr(lower(wallet_address), 3), 'hex');
+-- ALTER TABLE wallet_info ALTER COLUMN wallet_address TYPE BYTEA USING decode(substr(lower(wallet_address), 3), 'hex');
+-- ALTER TABLE users ADD CONSTRAINT ck_users_wallet_address_length CHECK (octet_length(wallet_address) = 20);
+-- ALTER TABLE wallet_info ADD CONSTRAINT ck_wallet_info_wallet_address_length CHECK (octet_length(wallet_address) = 20);
+-- ALTER TABLE transfers ALTER COLUMN wallet_address TYPE BYTEA USING decode(substr(lower(wallet_address), 3), 'hex');
+-- ALTER TABLE wallet_sync_state ALTER COLUMN wallet_address TYPE BYTEA USING decode(substr(lower(wallet_address), 3), 'hex');
+-- ALTER TABLE pnl_positions ALTER COLUMN wallet_address TYPE BYTEA USING decode(substr(lower(wallet_address), 3), 'hex');
+-- ALTER TABLE transfers ADD CONSTRAINT ck_transfers_wallet_address_length CHECK (octet_length(wallet_address) = 20);
+-- ALTER TABLE wallet_sync_state ADD CONSTRAINT ck_wallet_sync_state_wallet_address_length CHECK (octet_length(wallet_address) = 20);
+-- ALTER TABLE pnl_positions ADD CONSTRAINT ck_pnl_positions_wallet_address_length CHECK (octet_length(wallet_address) = 20);
+-- DROP INDEX IF EXISTS idx_users_wallet_address;
+
+-- 가격 없음 기록(NULL 가격)을 저장하려면 NOT NULL 제거
+-- ALTER TABLE token_prices ALTER COLUMN price DROP NOT NULL;
+
+-- 사용자 합계 증분 유지용 수익 금액 컬럼 (추가한 뒤 python -m app.services.user_totals 로 users 합계를 한 번 다시 계산)
+-- ALTER TABLE wallet_info ADD COLUMN IF NOT EXISTS gain_amount DECIMAL(20, 8) NOT NULL DEFAULT 0;
+
+-- 기존 DB 에 검색 인덱스 추가 (사용 중인 테이블을 잠그지 않도록 CONCURRENTLY, 트랜잭션 밖에서 하나씩 실행)
+-- CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+-- CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_username_trgm ON users USING gin (lower(username) gin_trgm_ops);
+-- CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_wallet_address_trgm ON users USING gin (encode(wallet_address, 'hex') gin_trgm_ops);
+-- CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_username_prefix ON users (lower(username) COLLATE "C");
+
+-- 고정소수점 모드(MONEY_FIXED_POINT=true)로 바꾸는 경우 금액 컬럼을 1e-8 단위 BIGINT 로 변환
+-- ALTER TABLE users
+--     ALTER COLUMN total_loss TYPE BIGINT USING round(total_loss * 100000000),
+--     ALTER COLUMN total_gain TYPE BIGINT USING round(total_gain * 100000000);
+-- ALTER TABLE wallet_info
+--     ALTER COLUMN avg_buyprice TYPE BIGINT USING round(avg_buyprice * 100000000),
+--     ALTER COLUMN avg_sellprice TYPE BIGINT USING round(avg_sellprice * 100000000),
+--     ALTER COLUMN current_price TYPE BIGINT USING round(current_price * 100000000),
+--     ALTER COLUMN total_buyprice TYPE BIGINT USING round(total_buyprice * 100000000),
+--     ALTER COLUMN total_sellprice TYPE BIGINT USING round(total_sellprice * 100000000),
+--     ALTER COLUMN loss_amount TYPE BIGINT USING round(loss_amount * 100000000),
+--     ALTER COLUMN gain_amount TYPE BIGINT USING round(gain_amount * 100000000);
+
 -- Insert default admin user (optional)
 -- INSERT INTO users (wallet_address, username, role) 
--- VALUES ('0x0000000000000000000000000000000000000000', 'admin', 'admin')
+-- VALUES (decode('0000000000000000000000000000000000000000', 'hex'), 'admin', 'admin')
 -- ON CONFLICT (wallet_address) DO NOTHING; 
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+공용 테스트 설정
+
+- .env 가 없는 환경(CI 등)에서도 app.config 를 불러올 수 있도록 필수 설정에 기본값을 넣는다 (DB 를 쓰지 않는 테스트용).
+- DB 가 필요한 테스트는 database_url 픽스처를 사용하고, DATABASE_URL 이 없으면 그 테스트만 건너뛴다.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+REQUIRED_SETTINGS = {
+    "POSTGRES_DB": "crypto_graves",
+    "POSTGRES_USER": "crypto_user",
+    "POSTGRES_PASSWORD": "crypto_password",
+    "POSTGRES_PORT": "5432",
+    "API_V1_STR": "/api/v1",
+    "PROJECT_NAME": "Crypto Graves API",
+    "SERVER_HOST": "0.0.0.0",
+    "SERVER_PORT": "8000",
+    "UPLOAD_DIR": "./uploads",
+    "MAX_FILE_SIZE": "10485760",
+    "DEBUG": "false",
+    "LOG_LEVEL": "info",
+}
+
+# 설정 모듈과 같이 현재 디렉터리의 .env 를 기준으로 판단 (.env 가 있으면 그 값을 덮어쓰지 않음)
+if not Path(".env").exists():
+    for name, value in REQUIRED_SETTINGS.items():
+        os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def anyio_backend():
+    # 서비스 코드는 asyncio.create_task/get_running_loop 를 사용하므로 asyncio 에서만 실행
+    return "asyncio"
+
+
+@pytest.fixture
+def database_url() -> str:
+    """실제 Postgres 연결 주소 (DATABASE_URL 이 없으면 이 픽스처를 쓰는 테스트는 건너뜀)"""
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        pytest.skip("DATABASE_URL is not set")
+    return url
@@ -0,0 +1,93 @@
+"""
+누적 손익 집계 테스트 (app.services.aggregates)
+
+pnl_positions 테이블에 저장하고 다시 읽어야 하므로 DATABASE_URL 이 없으면 DB 를 쓰는 테스트는 건너뛴다.
+"""
+
+import uuid
+
+import pytest
+
+from app.models.pnl_position import PnLPositionModel
+from app.services.aggregates import PositionState
+
+CHAIN = "eth-mainnet"
+
+
+@pytest.fixture
+def position(database_url):
+    """새 지갑의 집계 행 id (끝나면 삭제)"""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    record = PnLPositionModel(
+        wallet_address="0x" + uuid.uuid4().hex + "0" * 8,
+        chain=CHAIN,
+        token_address="0x" + "ab" * 20,
+        ticker="TEST"
+    )
+    db.add(record)
+    db.commit()
+    position_id = record.id
+    db.close()
+
+    yield position_id
+
+    db = SessionLocal()
+    try:
+        db.query(PnLPositionModel).filter(PnLPositionModel.id == position_id).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def apply_and_reload(position_id: int, *events):
+    """저장된 집계를 읽어 이벤트를 반영하고 커밋한 뒤 새 세션으로 다시 읽음"""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        state = PositionState(db.get(PnLPositionModel, position_id))
+        for direction, amount, price in events:
+            state.apply(direction, amount, price)
+        state.flush()
+        db.commit()
+    finally:
+        db.close()
+
+    db = SessionLocal()
+    try:
+        return db.get(PnLPositionModel, position_id)
+    finally:
+        db.close()
+
+
+def test_partial_sell_persists_reduced_lot(position):
+    """lot 을 일부만 소진한 매도도 줄어든 수량이 저장되어 다음 집계의 원가가 맞음"""
+    record = apply_and_reload(position, (1, 10.0, 1.0))
+    assert record.fifo_lots == [[10.0, 1.0]]
+
+    record = apply_and_reload(position, (-1, 4.0, 2.0))
+    assert record.fifo_lots == [[6.0, 1.0]]
+    assert record.fifo_cost_basis == pytest.approx(6.0)
+    assert record.fifo_realized_pnl == pytest.approx(4.0)
+
+    # 다음 매도는 남은 6 개만큼만 첫 lot 에서 소진하고 나머지는 다음 lot 에서 소진
+    apply_and_reload(position, (1, 5.0, 3.0))
+    record = apply_and_reload(position, (-1, 8.0, 4.0))
+    assert record.fifo_lots == [[3.0, 3.0]]
+    assert record.fifo_cost_basis == pytest.approx(9.0)
+    assert record.fifo_realized_pnl == pytest.approx(4.0 + 6 * 3.0 + 2 * 1.0)
+
+
+def test_apply_does_not_mutate_loaded_lots():
+    """집계 상태는 ORM 에서 읽은 lot 목록을 제자리에서 바꾸지 않음"""
+    lots = [[10.0, 1.0], [5.0, 2.0]]
+    record = PnLPositionModel(balance=15.0, avg_cost_basis=20.0, fifo_cost_basis=20.0, fifo_lots=lots)
+    state = PositionState(record)
+    state.apply(-1, 12.0, 3.0)
+
+    assert lots == [[10.0, 1.0], [5.0, 2.0]]
+    assert list(state.fifo_lots) == [[3.0, 2.0]]
+    state.flush()
+    assert record.fifo_lots == [[3.0, 2.0]]
@@ -0,0 +1,186 @@
+"""
+트랜잭션 수집 테스트 (app.services.ingestion)
+
+transfers/wallet_sync_state 테이블이 필요하므로 DATABASE_URL 이 없으면 DB 를 쓰는 테스트는 건너뛴다.
+"""
+
+import asyncio
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.models.address import normalize_wallet_address
+from app.models.token import Token
+from app.services.ingestion import MockTransactionProvider, ingest_wallet, lock_sync_state, normalize_transaction
+from app.services.token_registry import NATIVE_TOKEN_ADDRESS, TokenRegistry
+
+CHAIN = "eth-mainnet"
+COUNTERPARTY = "0x28c6c06298d514db089934071355e5743bf21d60"
+WALLET = "0x742d35cc6634c0532925a3b8d4c9db96c4b4d8b6"
+TOKEN = "0x" + "cd" * 20
+
+
+def native_transfer(wallet: str, block: int) -> dict:
+    """지갑으로 들어오는 네이티브 코인 전송 1건 (Covalent 형식)"""
+    return {
+        "block_height": block,
+        "block_signed_at": "2024-01-02T12:00:00Z",
+        "tx_hash": "0x" + uuid.uuid4().hex * 2,
+        "from_address": COUNTERPARTY,
+        "to_address": wallet,
+        "value": "1000000000000000000",
+        "gas_metadata": {"contract_ticker_symbol": "ETH", "contract_decimals": 18},
+        "log_events": []
+    }
+
+
+def token_transfer(wallet: str, value: str, decimals=None, symbol="TKN") -> dict:
+    """지갑으로 들어오는 ERC20 Transfer 이벤트 1건만 있는 트랜잭션"""
+    return {
+        "block_height": 100,
+        "block_signed_at": "2024-01-02T12:00:00Z",
+        "tx_hash": "0x" + "ab" * 32,
+        "from_address": COUNTERPARTY,
+        "to_address": TOKEN,
+        "value": "0",
+        "log_events": [{
+            "sender_address": TOKEN,
+            "sender_contract_ticker_symbol": symbol,
+            "sender_contract_decimals": decimals,
+            "log_offset": 3,
+            "decoded": {
+                "name": "Transfer",
+                "params": [
+                    {"name": "from", "value": COUNTERPARTY},
+                    {"name": "to", "value": wallet},
+                    {"name": "value", "value": value}
+                ]
+            }
+        }]
+    }
+
+
+def registry_token(decimals: int, source: str = "rpc") -> Token:
+    return Token(chain=CHAIN, address=TOKEN, symbol="ZERO", decimals=decimals, source=source)
+
+
+def test_zero_decimals_from_registry_are_used_as_is():
+    """레지스트리의 decimals 0 은 유효한 값 (18 로 바꾸지 않음)"""
+    rows = normalize_transaction(token_transfer(WALLET, "42", decimals=18), WALLET, CHAIN, {TOKEN: registry_token(0)})
+    assert len(rows) == 1
+    assert rows[0][7:] == ("ZERO", 0, 1, Decimal(42))
+
+
+def test_zero_decimals_from_provider_are_used_as_is():
+    rows = normalize_transaction(token_transfer(WALLET, "42", decimals=0), WALLET, CHAIN)
+    assert rows[0][7:] == ("TKN", 0, 1, Decimal(42))
+
+
+@pytest.mark.parametrize("tokens", [None, {TOKEN: registry_token(18, source="default")}])
+def test_transfer_with_unknown_decimals_is_skipped(tokens):
+    """레지스트리가 찾지 못했고(default) 제공자도 decimals 를 주지 않으면 1e18 로 나누지 않고 건너뜀"""
+    rows = normalize_transaction(token_transfer(WALLET, "42", decimals=None), WALLET, CHAIN, tokens)
+    assert rows == []
+
+
+def test_native_transfer_uses_registry_decimals():
+    tx = native_transfer(WALLET, 100)
+    tx["gas_metadata"] = {}
+    native = Token(chain=CHAIN, address=NATIVE_TOKEN_ADDRESS, symbol="ETH", decimals=18, source="native")
+    rows = normalize_transaction(tx, WALLET, CHAIN, {NATIVE_TOKEN_ADDRESS: native})
+    assert rows[0][7:] == ("ETH", 18, 1, Decimal(1))
+    # 레지스트리 없이 제공자 decimals 도 없으면 건너뜀
+    assert normalize_transaction(tx, WALLET, CHAIN) == []
+
+
+class SlowTransactionProvider(MockTransactionProvider):
+    """페이지마다 이벤트 루프에 양보하는 제공자 (수집이 겹치도록)"""
+
+    async def iter_pages(self, wallet_address, chain, after_block=0):
+        async for page in super().iter_pages(wallet_address, chain, after_block):
+            await asyncio.sleep(0.05)
+            yield page
+
+
+@pytest.fixture
+def wallet(database_url):
+    """테스트마다 새 지갑 주소 (끝나면 전송/체크포인트 삭제)"""
+    from app.database import SessionLocal
+    from app.models.transfer import TransferModel, WalletSyncStateModel
+
+    address = "0x" + uuid.uuid4().hex + "0" * 8
+    yield address
+    db = SessionLocal()
+    try:
+        db.query(TransferModel).filter(TransferModel.wallet_address == address).delete()
+        db.query(WalletSyncStateModel).filter(WalletSyncStateModel.wallet_address == address).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def sessions(database_url):
+    """테스트에서 만든 세션을 끝나면 모두 닫음"""
+    from app.database import SessionLocal
+
+    opened = []
+
+    def factory():
+        session = SessionLocal()
+        opened.append(session)
+        return session
+
+    yield factory
+    for session in opened:
+        session.rollback()
+        session.close()
+
+
+def provider_for(wallet: str, blocks) -> SlowTransactionProvider:
+    return SlowTransactionProvider(
+        transactions={wallet: [native_transfer(wallet, block) for block in blocks]},
+        page_size=1
+    )
+
+
+@pytest.mark.anyio
+async def test_concurrent_ingests_in_one_worker(wallet, sessions):
+    """같은 워커에서 같은 지갑을 동시에 수집해도 이벤트 루프가 멈추지 않고 차례로 실행됨"""
+    provider = provider_for(wallet, [100, 101, 102])
+    registry = TokenRegistry()
+
+    results = await asyncio.wait_for(asyncio.gather(*[
+        ingest_wallet(sessions(), provider, wallet, CHAIN, token_registry=registry)
+        for _ in range(3)
+    ]), timeout=10)
+
+    # 첫 수집만 전송을 넣고, 나머지는 갱신된 체크포인트부터 이어서 수집
+    assert [result.transfers_inserted for result in results] == [3, 0, 0]
+    assert [result.from_block for result in results] == [0, 102, 102]
+    assert all(result.last_block == 102 for result in results)
+
+
+@pytest.mark.anyio
+async def test_waits_for_other_worker_without_blocking_loop(wallet, sessions):
+    """다른 워커가 체크포인트 행을 잠그고 있으면 이벤트 루프를 막지 않고 기다렸다가 이어서 수집"""
+    other = sessions()
+    await lock_sync_state(other, normalize_wallet_address(wallet), CHAIN)
+
+    provider = provider_for(wallet, [200, 201])
+    ingest = asyncio.create_task(
+        ingest_wallet(sessions(), provider, wallet, CHAIN, token_registry=TokenRegistry())
+    )
+
+    ticks = 0
+    for _ in range(20):
+        await asyncio.sleep(0.02)
+        ticks += 1
+    assert ticks == 20
+    assert not ingest.done()
+
+    other.commit()
+    result = await asyncio.wait_for(ingest, timeout=10)
+    assert result.transfers_inserted == 2
+    assert result.last_block == 201
@@ -0,0 +1,208 @@
+"""
+가격 서비스 테스트 (app.services.price)
+
+fixture 제공자로 메모리 LRU -> token_prices 테이블 -> 제공자 순서, 동시 조회 공유, 가격 없음 TTL 을 확인한다.
+token_prices 테이블이 필요하므로 DATABASE_URL 이 없으면 DB 를 쓰는 테스트는 건너뛴다.
+"""
+
+import asyncio
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services.price import FixturePriceProvider, PriceService
+
+CHAIN = "eth-mainnet"
+DAY = date(2024, 1, 1)
+
+
+def lookups(result: str) -> float:
+    return REGISTRY.get_sample_value("cache_lookups_total", {"cache": "price", "result": result}) or 0.0
+
+
+class GatedPriceProvider(FixturePriceProvider):
+    """release 될 때까지 응답을 미루는 fixture 제공자 (동시 조회 테스트용)"""
+
+    def __init__(self, data: dict):
+        super().__init__(data=data)
+        self.release = asyncio.Event()
+
+    async def fetch_range(self, token_address, chain, start, end):
+        await self.release.wait()
+        return await super().fetch_range(token_address, chain, start, end)
+
+
+class FailingPriceProvider(FixturePriceProvider):
+    """항상 실패하는 제공자"""
+
+    async def fetch_range(self, token_address, chain, start, end):
+        self.calls.append((token_address, chain, start, end))
+        raise RuntimeError("provider unavailable")
+
+
+@pytest.fixture
+def token(database_url):
+    """테스트마다 새 토큰 주소 (끝나면 그 주소의 token_prices 행 삭제)"""
+    from app.database import SessionLocal
+    from app.models.token_price import TokenPriceModel
+
+    address = "0x" + uuid.uuid4().hex + "0" * 8
+    yield address
+    db = SessionLocal()
+    try:
+        db.query(TokenPriceModel).filter(TokenPriceModel.token_address == address).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def db(database_url):
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def stored(db, token):
+    """token 의 저장된 가격 행 {날짜: 가격 또는 None}"""
+    from app.models.token_price import TokenPriceModel
+
+    db.expire_all()
+    return {
+        row.price_date: None if row.price is None else float(row.price)
+        for row in db.query(TokenPriceModel).filter(TokenPriceModel.token_address == token)
+    }
+
+
+def fixture_provider(token: str, prices: dict) -> FixturePriceProvider:
+    return FixturePriceProvider(data={CHAIN: {token: {day.isoformat(): price for day, price in prices.items()}}})
+
+
+@pytest.mark.anyio
+async def test_lookup_falls_through_memory_table_provider(db, token):
+    """처음에는 제공자, 같은 서비스는 메모리, 새 서비스(다른 워커)는 token_prices 테이블에서 조회"""
+    days = [DAY, DAY + timedelta(days=1), DAY + timedelta(days=2)]
+    provider = fixture_provider(token, {days[0]: 1.5, days[2]: 2.5})
+    keys = [(token.upper().replace("0X", "0x"), CHAIN, day) for day in days]
+
+    service = PriceService(provider)
+    prices = await service.get_prices(db, keys)
+    assert prices == {(token, CHAIN, days[0]): 1.5, (token, CHAIN, days[1]): 0.0, (token, CHAIN, days[2]): 2.5}
+    # 토큰별로 필요한 날짜 범위를 묶어 한 번만 조회
+    assert provider.calls == [(token, CHAIN, days[0], days[2])]
+    # 가격이 없는 날짜는 NULL 가격 행으로 저장
+    assert stored(db, token) == {days[0]: 1.5, days[1]: None, days[2]: 2.5}
+
+    memory = lookups("memory")
+    assert await service.get_prices(db, keys) == prices
+    assert lookups("memory") - memory == 2
+    assert len(provider.calls) == 1
+
+    db_hits, negative = lookups("db"), lookups("negative")
+    other = PriceService(provider)
+    assert await other.get_prices(db, keys) == prices
+    assert lookups("db") - db_hits == 2
+    assert lookups("negative") - negative == 1
+    assert len(provider.calls) == 1
+
+    # 테이블에서 읽은 값은 메모리에도 올라감
+    memory = lookups("memory")
+    assert await other.get_price(db, token, CHAIN, days[0]) == 1.5
+    assert lookups("memory") - memory == 1
+
+
+@pytest.mark.anyio
+async def test_lru_evicts_oldest_entry(db, token):
+    """메모리 캐시는 cache_size 개까지만 유지하고 밀려난 키는 테이블에서 다시 읽음"""
+    days = [DAY + timedelta(days=offset) for offset in range(3)]
+    provider = fixture_provider(token, {day: 1.0 + index for index, day in enumerate(days)})
+    service = PriceService(provider, cache_size=2)
+
+    await service.get_prices(db, [(token, CHAIN, day) for day in days])
+    assert list(service._cache) == [(token, CHAIN, days[1]), (token, CHAIN, days[2])]
+
+    db_hits = lookups("db")
+    assert await service.get_price(db, token, CHAIN, days[0]) == 1.0
+    assert lookups("db") - db_hits == 1
+    assert len(provider.calls) == 1
+
+
+@pytest.mark.anyio
+async def test_concurrent_lookups_share_inflight_fetch(db, token):
+    """같은 키를 동시에 조회하면 제공자는 한 번만 호출하고 나머지는 진행 중인 결과를 기다림"""
+    provider = GatedPriceProvider({CHAIN: {token: {DAY.isoformat(): 3.25}}})
+    service = PriceService(provider)
+    key = (token, CHAIN, DAY)
+
+    shared = lookups("shared")
+    first = asyncio.create_task(service.get_prices(db, [key]))
+    await asyncio.sleep(0)
+    assert key in service._inflight
+    others = [asyncio.create_task(service.get_price(db, token, CHAIN, DAY)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    provider.release.set()
+    assert await first == {key: 3.25}
+    assert await asyncio.gather(*others) == [3.25, 3.25, 3.25]
+    assert len(provider.calls) == 1
+    assert lookups("shared") - shared == 3
+    assert service._inflight == {}
+
+
+@pytest.mark.anyio
+async def test_negative_cache_ttl(db, token):
+    """가격 없음은 negative_ttl 동안 다시 조회하지 않고, 만료되면 다시 조회해서 새 가격으로 바꿈"""
+    provider = fixture_provider(token, {})
+    key = (token, CHAIN, DAY)
+
+    service = PriceService(provider, negative_ttl=3600.0)
+    assert await service.get_prices(db, [key]) == {key: 0.0}
+    assert await service.get_prices(db, [key]) == {key: 0.0}
+    assert len(provider.calls) == 1
+
+    # 다른 워커도 NULL 가격 행이 유효한 동안은 조회하지 않음
+    assert await PriceService(provider, negative_ttl=3600.0).get_prices(db, [key]) == {key: 0.0}
+    assert len(provider.calls) == 1
+
+    # 메모리 기록이 만료되고 NULL 가격 행도 오래됐으면 다시 조회
+    short = PriceService(provider, negative_ttl=0.05)
+    await asyncio.sleep(0.1)
+    assert await short.get_prices(db, [key]) == {key: 0.0}
+    assert len(provider.calls) == 2
+    await asyncio.sleep(0.1)
+    provider.data[CHAIN][token] = {DAY.isoformat(): 4.0}
+    assert await short.get_prices(db, [key]) == {key: 4.0}
+    assert len(provider.calls) == 3
+    # 가격 없음 기록이 새 가격으로 바뀜
+    assert stored(db, token) == {DAY: 4.0}
+
+
+@pytest.mark.anyio
+async def test_failed_fetch_is_not_persisted(db, token):
+    """제공자 조회 실패는 저장하지 않고 메모리에서만 잠깐 다시 조회하지 않음"""
+    provider = FailingPriceProvider(data={})
+    key = (token, CHAIN, DAY)
+
+    service = PriceService(provider, negative_ttl=3600.0)
+    assert await service.get_prices(db, [key]) == {key: 0.0}
+    assert await service.get_prices(db, [key]) == {key: 0.0}
+    assert len(provider.calls) == 1
+    assert stored(db, token) == {}
+
+    # 다른 워커는 저장된 기록이 없으므로 다시 조회
+    await PriceService(provider).get_prices(db, [key])
+    assert len(provider.calls) == 2
+
+
+@pytest.mark.anyio
+async def test_fixture_provider_filters_range():
+    """fixture 제공자는 주소 대소문자와 관계없이 [start, end] 기간 가격만 반환"""
+    provider = FixturePriceProvider(data={CHAIN: {"0xABCDEF": {"2024-01-01": 1, "2024-01-05": "2.5", "2024-02-01": 3}}})
+    prices = await provider.fetch_range("0xabcdef", CHAIN, date(2024, 1, 1), date(2024, 1, 31))
+    assert prices == {date(2024, 1, 1): 1.0, date(2024, 1, 5): 2.5}
+    assert await provider.fetch_range("0xabcdef", "other-chain", date(2024, 1, 1), date(2024, 1, 31)) == {}
+    assert provider.calls[0] == ("0xabcdef", CHAIN, date(2024, 1, 1), date(2024, 1, 31))
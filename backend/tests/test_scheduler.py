@@ -0,0 +1,281 @@
+"""
+주기 작업 스케줄러 테스트 (app.services.scheduler)
+
+advisory lock 선출/인계 테스트는 실제 Postgres 가 필요하므로 DATABASE_URL 이 없으면 그 테스트만 건너뛴다.
+실행: DATABASE_URL=postgresql://... python -m pytest tests/test_scheduler.py
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.services.scheduler import CronSchedule, Job, Scheduler
+
+
+@pytest.fixture
+async def make_scheduler():
+    """테스트가 끝나면 stop() 하고 엔진을 닫는 스케줄러 생성 함수 (database_url 이 없으면 연결하지 않는 테스트용)"""
+    schedulers = []
+
+    def factory(*job_names: str, database_url: str = "postgresql://unused/unused") -> Scheduler:
+        scheduler = Scheduler(election_interval=0.1, tick=0.01, database_url=database_url)
+        for name in job_names:
+            scheduler.add_job(name, lambda: None, interval=60.0)
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield factory
+
+    for scheduler in schedulers:
+        await scheduler.stop()
+        if scheduler._engine is not None:
+            scheduler._engine.dispose()
+
+
+def job_names(count: int):
+    # 다른 테스트/실행 중인 워커의 락과 겹치지 않도록 작업 이름마다 고유 접미사
+    suffix = uuid.uuid4().hex[:8]
+    return [f"test-job-{index}-{suffix}" for index in range(count)]
+
+
+def leaders(scheduler: Scheduler):
+    return {name for name, job in scheduler.jobs.items() if job.leader}
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+async def elect_until(scheduler: Scheduler, names, timeout: float = 5.0):
+    """리더가 넘어올 때까지 선출 반복 (종료된 백엔드의 락 해제는 비동기라 잠깐 걸릴 수 있음)"""
+    deadline = time.monotonic() + timeout
+    while leaders(scheduler) != set(names) and time.monotonic() < deadline:
+        await scheduler.elect()
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.anyio
+async def test_one_leader_per_job(make_scheduler, database_url):
+    """같은 작업을 등록한 두 스케줄러 중 작업마다 정확히 하나만 리더가 됨"""
+    names = job_names(3)
+    first = make_scheduler(*names, database_url=database_url)
+    second = make_scheduler(*names, database_url=database_url)
+
+    for _ in range(3):
+        await first.elect()
+        await second.elect()
+        for name in names:
+            assert first.jobs[name].leader + second.jobs[name].leader == 1
+
+    assert leaders(first) == set(names)
+    assert leaders(second) == set()
+    # 리더가 된 작업은 바로 다음 실행 시각이 잡힘
+    assert all(first.jobs[name].next_run is not None for name in names)
+
+
+@pytest.mark.anyio
+async def test_leaders_split_across_schedulers(make_scheduler, database_url):
+    """작업별로 락을 따로 잡으므로 먼저 등록한 스케줄러가 작업마다 달라도 각각 하나씩 리더가 됨"""
+    only_first, only_second, shared = job_names(3)
+    first = make_scheduler(only_first, shared, database_url=database_url)
+    second = make_scheduler(only_second, shared, database_url=database_url)
+
+    await second.elect()
+    await first.elect()
+
+    assert leaders(first) == {only_first}
+    assert leaders(second) == {only_second, shared}
+
+
+@pytest.mark.anyio
+async def test_handover_after_stop(make_scheduler, database_url):
+    """리더가 stop() 하면 락 연결이 닫혀 다음 선출에서 다른 스케줄러가 리더가 됨"""
+    names = job_names(2)
+    first = make_scheduler(*names, database_url=database_url)
+    second = make_scheduler(*names, database_url=database_url)
+    await first.elect()
+    await second.elect()
+    assert leaders(second) == set()
+
+    await first.stop()
+    assert leaders(first) == set()
+
+    await second.elect()
+    assert leaders(second) == set(names)
+
+
+@pytest.mark.anyio
+async def test_handover_after_connection_drop(make_scheduler, database_url):
+    """리더의 연결이 끊기면 Postgres 가 락을 풀어 다른 스케줄러가 리더가 되고, 끊긴 쪽은 리더를 내려놓음"""
+    names = job_names(2)
+    first = make_scheduler(*names, database_url=database_url)
+    second = make_scheduler(*names, database_url=database_url)
+    await first.elect()
+    await second.elect()
+    assert leaders(first) == set(names)
+
+    pid = first._connection.execute(text("SELECT pg_backend_pid()")).scalar()
+    # 스케줄러 엔진은 연결 1개짜리라 별도 엔진으로 리더의 백엔드를 종료
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid}).scalar()
+    finally:
+        engine.dispose()
+
+    await elect_until(second, names)
+    assert leaders(second) == set(names)
+
+    # 끊긴 연결로 선출하면 실패를 알아채고 모든 작업의 리더를 내려놓음
+    await first.elect()
+    assert leaders(first) == set()
+
+    # 다시 연결해서 선출에 참여하지만 락은 이미 넘어갔으므로 리더가 되지 못함
+    await first.elect()
+    assert first._connection is not None
+    assert leaders(first) == set()
+    assert leaders(second) == set(names)
+
+
+@pytest.mark.anyio
+async def test_run_due_skips_overlap(make_scheduler):
+    """이전 실행이 끝나지 않았으면 다음 실행은 겹쳐 실행하지 않고 overlap 으로 기록"""
+    scheduler = make_scheduler()
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_job():
+        calls.append(time.time())
+        await release.wait()
+
+    job = scheduler.add_job(job_names(1)[0], slow_job, interval=10.0)
+    job.leader = True
+    now = time.time()
+    job.schedule_next(now, first=True)
+
+    scheduler.run_due(now)
+    first_task = job.task
+    await asyncio.sleep(0)
+    assert len(calls) == 1
+    assert job.next_run == pytest.approx(now + 10.0)
+
+    # 다음 실행 시각 전이면 아무것도 하지 않음
+    scheduler.run_due(now + 5.0)
+    assert job.task is first_task and job.overlaps == 0
+
+    scheduler.run_due(now + 10.0)
+    await asyncio.sleep(0)
+    assert job.task is first_task
+    assert job.overlaps == 1
+    assert len(calls) == 1
+    assert job.next_run == pytest.approx(now + 20.0)
+
+    release.set()
+    await first_task
+    assert job.runs == 1
+
+    scheduler.run_due(now + 20.0)
+    await job.task
+    assert job.task is not first_task
+    assert len(calls) == 2
+    assert job.runs == 2
+    assert job.overlaps == 1
+
+
+@pytest.mark.anyio
+async def test_run_due_ignores_non_leader(make_scheduler):
+    """리더가 아닌 작업은 실행 시각이 지나도 실행하지 않음"""
+    scheduler = make_scheduler()
+    calls = []
+    job = scheduler.add_job(job_names(1)[0], lambda: calls.append(1), interval=1.0)
+    job.next_run = 0.0
+
+    scheduler.run_due(time.time())
+    assert job.task is None
+    assert calls == []
+
+
+@pytest.mark.parametrize(
+    "expression, moment, expected",
+    [
+        # 다음 분부터 찾음 (초는 버림)
+        ("*/15 * * * *", utc(2024, 10, 1, 10, 15, 30), utc(2024, 10, 1, 10, 30)),
+        # 시/일/월이 차례로 넘어감
+        ("0 0 * * *", utc(2024, 4, 30, 23, 59), utc(2024, 5, 1, 0, 0)),
+        ("30 12 1 * *", utc(2024, 12, 1, 12, 30), utc(2025, 1, 1, 12, 30)),
+        # 연도 넘김
+        ("0 0 1 1 *", utc(2024, 12, 31, 23, 59), utc(2025, 1, 1, 0, 0)),
+        # 31일이 없는 달은 건너뜀
+        ("30 12 31 * *", utc(2024, 1, 31, 12, 30), utc(2024, 3, 31, 12, 30)),
+        ("30 12 31 * *", utc(2024, 4, 15), utc(2024, 5, 31, 12, 30)),
+        # 2월 29일은 다음 윤년까지
+        ("0 0 29 2 *", utc(2025, 3, 1), utc(2028, 2, 29, 0, 0)),
+        # 지정한 달만 (12월 이후는 다음 해 3월)
+        ("0 6 * 3,6,9 *", utc(2024, 9, 30, 6, 0), utc(2025, 3, 1, 6, 0)),
+    ]
+)
+def test_cron_next_after_rollover(expression, moment, expected):
+    """cron 다음 실행 시각 (분/시/일/월/연도 넘김)"""
+    assert CronSchedule(expression).next_after(moment) == expected
+
+
+@pytest.mark.parametrize(
+    "expression, moment, expected",
+    [
+        # 일과 요일이 모두 지정되면 둘 중 하나만 맞아도 실행 (13일 또는 금요일)
+        ("0 9 13 * 5", utc(2024, 10, 10, 9, 0), utc(2024, 10, 11, 9, 0)),
+        ("0 9 13 * 5", utc(2024, 10, 11, 9, 0), utc(2024, 10, 13, 9, 0)),
+        ("0 9 13 * 5", utc(2024, 10, 13, 9, 0), utc(2024, 10, 18, 9, 0)),
+        # 일만 지정 (요일 *)
+        ("0 9 13 * *", utc(2024, 10, 10, 9, 0), utc(2024, 10, 13, 9, 0)),
+        # 요일만 지정 (일 *), 7 과 0 은 모두 일요일
+        ("0 9 * * 5", utc(2024, 10, 11, 9, 0), utc(2024, 10, 18, 9, 0)),
+        ("0 0 * * 7", utc(2024, 10, 7), utc(2024, 10, 13, 0, 0)),
+        ("0 0 * * 0", utc(2024, 10, 7), utc(2024, 10, 13, 0, 0)),
+        # 일 범위와 요일 범위의 합집합 (1~3일 또는 월~금)
+        ("0 0 1-3 * 1-5", utc(2024, 9, 27, 12, 0), utc(2024, 9, 30, 0, 0)),
+        ("0 0 1-3 * 1-5", utc(2024, 11, 29, 12, 0), utc(2024, 12, 1, 0, 0)),
+    ]
+)
+def test_cron_day_of_month_or_day_of_week(expression, moment, expected):
+    """cron 일/요일 조건 (둘 다 지정되면 OR)"""
+    assert CronSchedule(expression).next_after(moment) == expected
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "*/0 * * * *", "5-1 * * * *"])
+def test_cron_rejects_invalid_expression(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_cron_never_matching_expression():
+    """존재하지 않는 날짜(2월 30일)는 무한 반복하지 않고 ValueError"""
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 30 2 *").next_after(utc(2024, 1, 1))
+
+
+def test_interval_job_first_run_within_jitter():
+    """interval 작업은 리더가 된 직후 0~jitter 초 안에 첫 실행, 이후에는 interval + 0~jitter 초 간격"""
+    job = Job("interval", lambda: None, interval=30.0, jitter=5.0)
+    for _ in range(20):
+        job.schedule_next(1000.0, first=True)
+        assert 1000.0 <= job.next_run <= 1005.0
+        job.schedule_next(1000.0)
+        assert 1030.0 <= job.next_run <= 1035.0
+
+
+def test_cron_job_runs_at_next_match():
+    """cron 작업은 현재 시각 이후 처음 일치하는 시각에 실행 (jitter 없음)"""
+    job = Job("cron", lambda: None, cron="0 3 * * *")
+    job.schedule_next(utc(2024, 10, 1, 3, 0).timestamp())
+    assert job.next_run == utc(2024, 10, 2, 3, 0).timestamp()
+
+
+@pytest.mark.parametrize("options", [{}, {"interval": 10.0, "cron": "* * * * *"}, {"interval": 0.0}])
+def test_job_requires_one_positive_schedule(options):
+    with pytest.raises(ValueError):
+        Job("invalid", lambda: None, **options)
@@ -0,0 +1,231 @@
+"""
+wallet_info 쓰기 지연 버퍼 테스트 (app.services.write_behind)
+
+저장(_write)은 스레드에서 실행되는 동기 함수라 기록용 함수로 바꿔서 DB 없이 순서와 되돌림을 확인한다.
+실제 wallet_info 테이블에 저장하는 테스트는 DATABASE_URL 이 없으면 건너뛴다.
+"""
+
+import asyncio
+import threading
+import uuid
+from decimal import Decimal
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.exc import DataError, OperationalError
+
+from app.config import settings
+from app.models.address import normalize_wallet_address
+from app.services.write_behind import UPSERT_COLUMNS, WalletInfoBuffer
+
+WALLET = normalize_wallet_address("0x742d35cc6634c0532925a3b8d4c9db96c4b4d8b6")
+OTHER = normalize_wallet_address("0x28c6c06298d514db089934071355e5743bf21d60")
+
+
+def row(ticker: str, amount: str = "1") -> dict:
+    return {"ticker": ticker, "loss_rate": 0.0, **{
+        column: Decimal(amount) for column in UPSERT_COLUMNS if column != "loss_rate"
+    }}
+
+
+class RecordingBuffer(WalletInfoBuffer):
+    """저장 대신 기록만 하는 버퍼 (gate 가 닫혀 있으면 저장 중인 상태로 멈춤)"""
+
+    def __init__(self):
+        super().__init__(flush_interval=60.0, max_rows=1000, max_pending=1000)
+        self.written = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def _write(self, rows):
+        self.entered.set()
+        self.gate.wait(5)
+        self.written.append(dict(rows))
+
+
+class RejectingBuffer(RecordingBuffer):
+    """티커가 BAD 인 행이 섞인 저장은 값 오류, outage 가 켜져 있으면 연결 오류로 실패하는 버퍼"""
+
+    def __init__(self):
+        super().__init__()
+        self.attempts = []
+        self.outage = False
+
+    def _write(self, rows):
+        self.attempts.append(sorted(rows))
+        if self.outage:
+            raise OperationalError("INSERT", {}, Exception("server closed the connection unexpectedly"))
+        if any(ticker == "BAD" for _, ticker in rows):
+            raise DataError("INSERT", {}, Exception("invalid input value"))
+        super()._write(rows)
+
+
+def dropped() -> float:
+    return REGISTRY.get_sample_value("wallet_write_behind_dropped_total") or 0.0
+
+
+async def wait_until(condition, timeout: float = 5.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+@pytest.mark.anyio
+async def test_flush_wallet_waits_for_inflight_flush():
+    """다른 곳에서 시작한 저장에 이 지갑이 들어 있으면 pending 이 비어 있어도 커밋될 때까지 기다림"""
+    buffer = RecordingBuffer()
+    buffer.gate.clear()
+    assert buffer.submit(WALLET, [row("ETH")])
+
+    flush = asyncio.create_task(buffer.flush())
+    await wait_until(buffer.entered.is_set)
+    assert not buffer.pending
+    assert buffer.flushing == {WALLET}
+
+    waiter = asyncio.create_task(buffer.flush_wallet(WALLET.lower()))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    # 저장 중인 목록에 없는 지갑은 기다리지 않음
+    await asyncio.wait_for(buffer.flush_wallet(OTHER), timeout=1)
+
+    buffer.gate.set()
+    await asyncio.wait_for(asyncio.gather(flush, waiter), timeout=5)
+    assert [list(rows) for rows in buffer.written] == [[(WALLET, "ETH")]]
+    assert buffer.flushing == set()
+
+
+@pytest.mark.anyio
+async def test_flush_wallet_flushes_values_added_during_inflight_flush():
+    """저장 중에 같은 지갑의 새 값이 들어왔으면 진행 중인 저장이 끝난 뒤 이어서 저장"""
+    buffer = RecordingBuffer()
+    buffer.gate.clear()
+    buffer.submit(WALLET, [row("ETH", "1")])
+    flush = asyncio.create_task(buffer.flush())
+    await wait_until(buffer.entered.is_set)
+
+    buffer.submit(WALLET, [row("ETH", "2")])
+    waiter = asyncio.create_task(buffer.flush_wallet(WALLET))
+    await asyncio.sleep(0.05)
+    buffer.gate.set()
+    await asyncio.wait_for(asyncio.gather(flush, waiter), timeout=5)
+
+    assert [rows[(WALLET, "ETH")]["loss_amount"] for rows in buffer.written] == [Decimal(1), Decimal(2)]
+    assert not buffer.pending
+
+
+@pytest.mark.parametrize("ticker", ["", "T" * 21])
+def test_submit_rejects_ticker_that_does_not_fit(ticker):
+    buffer = RecordingBuffer()
+    with pytest.raises(ValueError):
+        buffer.submit(WALLET, [row("ETH"), row(ticker)])
+    # 하나라도 거부되면 아무것도 넣지 않음
+    assert not buffer.pending
+
+
+def test_submit_checks_fixed_point_range(monkeypatch):
+    """Numeric(20, 8) 에는 들어가지만 BIGINT 고정소수점 범위를 넘는 금액은 고정소수점 모드에서만 거부"""
+    value = row("ETH", "100000000000")
+    buffer = RecordingBuffer()
+    assert buffer.submit(WALLET, [value])
+
+    monkeypatch.setattr(settings, "money_fixed_point", True)
+    with pytest.raises(ValueError):
+        buffer.submit(OTHER, [value])
+    assert list(buffer.pending) == [(WALLET, "ETH")]
+
+
+@pytest.mark.anyio
+async def test_failing_row_is_dropped_and_others_are_saved():
+    """일부 행 때문에 저장이 실패하면 지갑별, 행별로 나눠 저장하고 혼자서도 실패하는 행만 버림"""
+    buffer = RejectingBuffer()
+    buffer.submit(WALLET, [row("ETH"), row("BTC")])
+    buffer.submit(OTHER, [row("ETH")])
+    # 검증을 거치지 않은 값 (예: 배포 중 스키마가 바뀐 경우)
+    buffer.pending[(WALLET, "BAD")] = buffer.pending[(WALLET, "ETH")]
+
+    before = dropped()
+    await buffer.flush()
+
+    assert len(buffer.attempts[0]) == 4
+    saved = sorted(key for rows in buffer.written for key in rows)
+    assert saved == sorted([(WALLET, "ETH"), (WALLET, "BTC"), (OTHER, "ETH")])
+    # 다른 지갑은 한 번에 저장되고, 실패한 지갑만 행별로 저장
+    assert [(OTHER, "ETH")] in buffer.attempts
+    assert [(WALLET, "BAD")] in buffer.attempts
+    assert dropped() - before == 1
+    assert not buffer.pending
+
+    # 버린 행은 다시 시도하지 않음
+    attempts = len(buffer.attempts)
+    await buffer.flush()
+    assert len(buffer.attempts) == attempts
+
+
+@pytest.mark.anyio
+async def test_transient_failure_keeps_rows_for_retry():
+    """연결 오류는 나눠 저장하지 않고 모든 값을 되돌려 다음 주기에 다시 시도"""
+    buffer = RejectingBuffer()
+    buffer.outage = True
+    buffer.submit(WALLET, [row("ETH")])
+    buffer.submit(OTHER, [row("ETH")])
+
+    before = dropped()
+    with pytest.raises(OperationalError):
+        await buffer.flush()
+    assert len(buffer.attempts) == 1
+    assert list(buffer.pending) == [(WALLET, "ETH"), (OTHER, "ETH")]
+    assert dropped() == before
+
+    buffer.outage = False
+    await buffer.flush()
+    assert not buffer.pending
+    assert len(buffer.written) == 1
+
+
+@pytest.fixture
+def wallets(database_url):
+    """테스트마다 새 지갑 주소 2개 (끝나면 wallet_info/users 행 삭제)"""
+    from app.database import SessionLocal
+    from app.models.user import UserModel
+    from app.models.wallet_info import WalletInfoModel
+
+    addresses = [normalize_wallet_address("0x" + uuid.uuid4().hex + "0" * 8) for _ in range(2)]
+    yield addresses
+    db = SessionLocal()
+    try:
+        db.query(WalletInfoModel).filter(WalletInfoModel.wallet_address.in_(addresses)).delete()
+        db.query(UserModel).filter(UserModel.wallet_address.in_(addresses)).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.mark.anyio
+async def test_database_rejected_row_does_not_block_flush(wallets):
+    """DB 가 거부하는 행(컬럼보다 긴 티커)만 버리고 나머지는 저장"""
+    from app.database import SessionLocal
+    from app.models.wallet_info import WalletInfoModel
+
+    first, second = wallets
+    buffer = WalletInfoBuffer(flush_interval=60.0, max_rows=1000, max_pending=1000)
+    buffer.submit(first, [row("ETH", "1.5")])
+    buffer.submit(second, [row("ETH", "2"), row("BTC", "3")])
+    buffer.pending[(second, "T" * 25)] = buffer.pending[(second, "BTC")]
+
+    before = dropped()
+    await buffer.flush()
+    assert dropped() - before == 1
+    assert not buffer.pending
+
+    db = SessionLocal()
+    try:
+        saved = {
+            (record.wallet_address, record.ticker): record.loss_amount
+            for record in db.query(WalletInfoModel).filter(WalletInfoModel.wallet_address.in_(wallets))
+        }
+    finally:
+        db.close()
+    assert saved == {(first, "ETH"): Decimal("1.5"), (second, "ETH"): Decimal(2), (second, "BTC"): Decimal(3)}